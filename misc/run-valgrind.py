@@ -19,6 +19,13 @@
 
 import os, sys, commands, subprocess, shutil, tempfile
 
+# Arguments after "--" are given to the compiled program.
+if "--" in sys.argv:
+    program_args = sys.argv[ sys.argv.index( "--" ) + 1 : ]
+    sys.argv = sys.argv[ : sys.argv.index( "--" ) ]
+else:
+    program_args = []
+
 input_file = sys.argv[1]
 nuitka_binary = os.environ.get( "NUITKA_BINARY", "nuitka" )
 
@@ -55,7 +62,7 @@ sys.stdout.flush()
 
 valgrind_options = "-q --tool=callgrind --callgrind-out-file=%s --zero-before=init__main__() --zero-before=init__main__" % log_file
 
-subprocess.check_call( [ "valgrind" ] + valgrind_options.split() + [ output_binary ] )
+subprocess.check_call( [ "valgrind" ] + valgrind_options.split() + [ output_binary ] + program_args )
 
 if "number" in sys.argv:
     for line in open( log_file ):
@@ -71,7 +78,7 @@ if "number" in sys.argv:
     log_mem = log_base + ".mem"
     valgrind_options = "-q --tool=massif --massif-out-file=%s" % log_mem
 
-    subprocess.check_call( [ "valgrind" ] + valgrind_options.split() + [ output_binary ] )
+    subprocess.check_call( [ "valgrind" ] + valgrind_options.split() + [ output_binary ] + program_args )
 
     max_mem = 0
 
@@ -0,0 +1,344 @@
+#!/usr/bin/env python
+#     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+#
+#     Part of "Nuitka", an optimizing Python compiler that is compatible and
+#     integrates with CPython, but also works on its own.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+
+""" Record instruction counts and memory usage of benchmarks per revision.
+
+The benchmark programs are compiled and run under valgrind with the help of
+"run-valgrind.py", which reports the callgrind ticks, the binary size, and the
+peak heap usage from massif. These are deterministic, unlike wall clock times,
+so small differences between two revisions can be trusted.
+
+The results are stored in a sqlite database, by default "perf-data/valgrind.db"
+in the current directory, keyed by revision, benchmark, Python version, and
+the value of NUITKA_EXTRA_OPTIONS.
+
+The pybench tests are recorded one by one with "--pybench-test", under names
+like "pybench/pybench.py -t PythonFunctionCalls". These are run by its driver,
+compiled with "--recurse-all", for one round and without calibration.
+
+Usage:
+
+    valgrind-history.py record [--revision REV] [--pybench-test TEST] [benchmark ...]
+    valgrind-history.py diff REV1 REV2 [--fail-above PERCENT]
+    valgrind-history.py list
+"""
+
+from __future__ import print_function
+
+import os, sys, subprocess, sqlite3, time, tempfile, shutil
+
+from optparse import OptionParser
+
+base_dir = os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), ".." )
+
+benchmarks_dir = os.path.join( base_dir, "tests", "benchmarks" )
+
+# The default benchmarks, relative to the benchmarks directory. The pybench
+# tests are not standalone programs, these are run by its driver, when given
+# with "--pybench-test".
+pybench_name = os.path.join( "pybench", "pybench.py" )
+
+default_benchmarks = [ "pystone.py" ] + [
+    os.path.join( "micro", filename )
+    for filename in
+    sorted( os.listdir( os.path.join( benchmarks_dir, "micro" ) ) )
+    if filename.endswith( ".py" )
+]
+
+parser = OptionParser(
+    usage = "%prog [options] record|diff|list [arguments]"
+)
+
+parser.add_option(
+    "--db",
+    action  = "store",
+    dest    = "db_filename",
+    default = os.path.join( "perf-data", "valgrind.db" ),
+    help    = """The sqlite database to use. Defaults to "perf-data/valgrind.db"."""
+)
+
+parser.add_option(
+    "--revision",
+    action  = "store",
+    dest    = "revision",
+    default = None,
+    help    = """\
+Name to record the results under. Defaults to the output of "git describe",
+with "-dirty" appended, if there are uncommitted changes."""
+)
+
+parser.add_option(
+    "--pybench-test",
+    action  = "append",
+    dest    = "pybench_tests",
+    default = [],
+    help    = """\
+For "record", a pybench test to record, e.g. "PythonFunctionCalls". Can be
+given multiple times."""
+)
+
+parser.add_option(
+    "--fail-above",
+    action  = "store",
+    type    = "float",
+    dest    = "fail_above",
+    default = None,
+    help    = """\
+For "diff", exit with 1, if the ticks of a benchmark increased by more than
+this percentage."""
+)
+
+def getRevision():
+    return subprocess.Popen(
+        [ "git", "describe", "--always", "--tags", "--dirty" ],
+        stdout = subprocess.PIPE,
+        cwd    = base_dir
+    ).communicate()[0].decode( "utf-8" ).strip()
+
+def getPythonVersion():
+    return "%d.%d" % sys.version_info[:2]
+
+def openDatabase( db_filename ):
+    db_dir = os.path.dirname( db_filename )
+
+    if db_dir and not os.path.exists( db_dir ):
+        os.makedirs( db_dir )
+
+    connection = sqlite3.connect( db_filename )
+
+    connection.execute(
+        """
+CREATE TABLE IF NOT EXISTS results (
+    revision TEXT NOT NULL,
+    benchmark TEXT NOT NULL,
+    python TEXT NOT NULL,
+    options TEXT NOT NULL,
+    recorded REAL NOT NULL,
+    ticks INTEGER,
+    size INTEGER,
+    mem_peak INTEGER,
+    PRIMARY KEY ( revision, benchmark, python, options )
+)"""
+    )
+
+    return connection
+
+def measureBenchmark( filename, extra_options, arguments ):
+    """ Run "run-valgrind.py" in number mode, and parse its output. """
+
+    env = dict( os.environ )
+    env[ "NUITKA_BINARY" ] = "%s %s" % (
+        sys.executable,
+        os.path.join( base_dir, "bin", "nuitka" )
+    )
+    env[ "NUITKA_EXTRA_OPTIONS" ] = extra_options
+
+    # The valgrind log files are created in the current directory.
+    work_dir = tempfile.mkdtemp( prefix = "nuitka-valgrind-" )
+
+    try:
+        output = subprocess.check_output(
+            [
+                sys.executable,
+                os.path.join( base_dir, "misc", "run-valgrind.py" ),
+                filename,
+                "number",
+                "--"
+            ] + arguments,
+            env = env,
+            cwd = work_dir
+        )
+    finally:
+        shutil.rmtree( work_dir )
+
+    result = {}
+
+    for line in output.decode( "utf-8" ).split( "\n" ):
+        if line.startswith( "TICKS=" ):
+            result[ "ticks" ] = int( line.split( "=" )[1] )
+        elif line.startswith( "SIZE=" ):
+            result[ "size" ] = int( line.split( "=" )[1] )
+        elif line.startswith( "MEM=" ):
+            result[ "mem_peak" ] = int( line.split( "=" )[1] )
+
+    return result
+
+def getRecordedBenchmarks( options, benchmarks ):
+    """ The benchmarks to record, with the name to record them under, the
+        extra options to compile with, and the arguments to run with.
+    """
+
+    result = []
+
+    if not benchmarks and not options.pybench_tests:
+        benchmarks = default_benchmarks
+
+    for benchmark in benchmarks:
+        result.append( ( benchmark, benchmark, "", [] ) )
+
+    for pybench_test in options.pybench_tests:
+        result.append(
+            (
+                "%s -t %s" % ( pybench_name, pybench_test ),
+                pybench_name,
+                "--recurse-all",
+                [ "-n", "1", "-C", "0", "-t", "^%s$" % pybench_test ]
+            )
+        )
+
+    return result
+
+def recordResults( options, benchmarks ):
+    revision = options.revision or getRevision()
+    extra_options = os.environ.get( "NUITKA_EXTRA_OPTIONS", "" )
+
+    connection = openDatabase( options.db_filename )
+
+    for benchmark, benchmark_filename, benchmark_options, arguments in \
+        getRecordedBenchmarks( options, benchmarks ):
+        filename = os.path.abspath( os.path.join( benchmarks_dir, benchmark_filename ) )
+
+        if not os.path.exists( filename ):
+            sys.exit( "Error, no benchmark '%s'." % benchmark )
+
+        print( "Measuring", benchmark, "for", revision, "..." )
+        sys.stdout.flush()
+
+        result = measureBenchmark(
+            filename,
+            ( extra_options + " " + benchmark_options ).strip(),
+            arguments
+        )
+
+        connection.execute(
+            "INSERT OR REPLACE INTO results VALUES ( ?, ?, ?, ?, ?, ?, ?, ? )",
+            (
+                revision,
+                benchmark,
+                getPythonVersion(),
+                extra_options,
+                time.time(),
+                result.get( "ticks" ),
+                result.get( "size" ),
+                result.get( "mem_peak" )
+            )
+        )
+
+        connection.commit()
+
+        print(
+            "TICKS=%s SIZE=%s MEM=%s" % (
+                result.get( "ticks" ),
+                result.get( "size" ),
+                result.get( "mem_peak" )
+            )
+        )
+
+def _formatChange( old, new ):
+    if old is None or new is None:
+        return "%14s %14s %8s" % ( old, new, "" )
+
+    return "%14d %14d %+7.2f%%" % (
+        old,
+        new,
+        ( new - old ) * 100.0 / old if old else 0.0
+    )
+
+def diffRevisions( options, revision1, revision2 ):
+    connection = openDatabase( options.db_filename )
+
+    rows = connection.execute(
+        """
+SELECT a.benchmark, a.python, a.options,
+       a.ticks, b.ticks, a.size, b.size, a.mem_peak, b.mem_peak
+FROM results a JOIN results b
+ON a.benchmark = b.benchmark AND a.python = b.python AND a.options = b.options
+WHERE a.revision = ? AND b.revision = ?
+ORDER BY a.benchmark, a.python, a.options""",
+        ( revision1, revision2 )
+    ).fetchall()
+
+    if not rows:
+        sys.exit( "Error, no common results for '%s' and '%s'." % ( revision1, revision2 ) )
+
+    print( "%-36s %-6s %39s %39s %39s" % ( "Benchmark", "Python", "Ticks", "Size", "Peak Memory" ) )
+
+    failed = False
+
+    for benchmark, python, extra_options, ticks1, ticks2, size1, size2, mem1, mem2 in rows:
+        if extra_options:
+            benchmark += " " + extra_options
+
+        print(
+            "%-36s %-6s %s %s %s" % (
+                benchmark,
+                python,
+                _formatChange( ticks1, ticks2 ),
+                _formatChange( size1, size2 ),
+                _formatChange( mem1, mem2 )
+            )
+        )
+
+        if options.fail_above is not None and ticks1 and ticks2 is not None:
+            if ( ticks2 - ticks1 ) * 100.0 / ticks1 > options.fail_above:
+                failed = True
+
+    if failed:
+        sys.exit( "Error, ticks increased by more than %.2f%%." % options.fail_above )
+
+def listRevisions( options ):
+    connection = openDatabase( options.db_filename )
+
+    rows = connection.execute(
+        """
+SELECT revision, COUNT(*), MAX( recorded ) FROM results
+GROUP BY revision ORDER BY MAX( recorded )"""
+    ).fetchall()
+
+    for revision, count, recorded in rows:
+        print(
+            "%-30s %3d benchmarks, %s" % (
+                revision,
+                count,
+                time.strftime( "%Y-%m-%d %H:%M", time.localtime( recorded ) )
+            )
+        )
+
+def main():
+    options, positional_args = parser.parse_args()
+
+    if not positional_args:
+        parser.error( "Need a command, 'record', 'diff', or 'list'." )
+
+    command = positional_args[0]
+
+    if command == "record":
+        recordResults( options, positional_args[1:] )
+    elif command == "diff":
+        if len( positional_args ) != 3:
+            parser.error( "The 'diff' command needs two revisions." )
+
+        diffRevisions( options, positional_args[1], positional_args[2] )
+    elif command == "list":
+        listRevisions( options )
+    else:
+        parser.error( "Unknown command '%s'." % command )
+
+if __name__ == "__main__":
+    main()
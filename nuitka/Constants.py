@@ -155,21 +155,35 @@ def isMutable( constant ):
         return False
     elif constant_type in ( dict, list, set ):
         return True
-    elif constant_type is tuple:
+    elif constant_type in ( tuple, frozenset ):
         for value in constant:
             if isMutable( value ):
                 return True
         else:
             return False
-    elif constant is Ellipsis:
-        # Note: Workaround for Ellipsis not being handled by the pickle module,
-        # pretend it would be mutable, then it doesn't get pickled as part of lists or
-        # tuples. This is a loss of efficiency, but usage of Ellipsis will be very
-        # limited normally anyway.
-        return True
+    elif constant_type is type or constant is Ellipsis:
+        return False
     else:
         assert False, constant_type
 
+def hasMutableElements( constant ):
+    """ Containers with mutable elements must not share them when copied. """
+
+    constant_type = type( constant )
+
+    if constant_type is dict:
+        elements = constant.values()
+    elif constant_type in ( list, tuple ):
+        elements = constant
+    else:
+        return False
+
+    for element in elements:
+        if isMutable( element ):
+            return True
+    else:
+        return False
+
 def isIterableConstant( constant ):
     return type( constant ) in ( str, unicode, list, tuple, set, frozenset, dict, range )
 
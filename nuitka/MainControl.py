@@ -34,9 +34,9 @@ from . import (
     Utils
 )
 
-from .build import SconsInterface
+from .build import SconsInterface, NinjaInterface, CompileCosts, ConstantsData
 
-from .codegen import CodeGeneration
+from .codegen import CodeGeneration, Reports
 
 from .optimizations import Optimization
 from .finalizations import Finalization
@@ -120,9 +120,18 @@ def getResultPath( main_module ):
     )
 
 def _cleanSourceDirectory( source_dir ):
+    # For the Ninja build, files are kept, and only written if changed, so the
+    # objects of unchanged ones need not be compiled again. Files no longer
+    # generated are removed afterwards.
+    if Options.isNinjaBuild():
+        if not Utils.isDir( source_dir ):
+            Utils.makePath( source_dir )
+
+        return
+
     if Utils.isDir( source_dir ):
         for path, _filename in Utils.listDir( source_dir ):
-            if Utils.getExtension( path ) in ( ".cpp", ".hpp", ".o", ".os" ):
+            if Utils.getExtension( path ) in ( ".cpp", ".hpp", ".bin", ".o", ".os" ):
                 Utils.deleteFile( path, True )
     else:
         Utils.makePath( source_dir )
@@ -134,6 +143,17 @@ def _cleanSourceDirectory( source_dir ):
             if Utils.getExtension( path ) in ( ".o", ".os" ):
                 Utils.deleteFile( path, True )
 
+def _removeStaleSourceFiles( source_dir ):
+    for path, filename in Utils.listDir( source_dir ):
+        # The constants data file for MSVC is created from the blob by the
+        # build, and is only rewritten if that changed.
+        if filename == ConstantsData.data_filename:
+            continue
+
+        if Utils.getExtension( path ) in ( ".cpp", ".hpp", ".bin" ) and \
+           path not in _written_filenames:
+            Utils.deleteFile( path, True )
+
 def _pickSourceFilenames( source_dir, modules ):
     collision_filenames = set()
     seen_filenames = set()
@@ -232,6 +252,14 @@ def makeSourceDirectory( main_module ):
             source_code  = source_code
         )
 
+        if Options.getCodegenReportFilename():
+            Reports.addModuleCode(
+                module_name = module.getFullName(),
+                filename    = cpp_filename,
+                source_code = source_code,
+                context     = module_context
+            )
+
         writeSourceCode(
             filename     = hpp_filename,
             source_code  = CodeGeneration.generateModuleDeclarationCode(
@@ -247,11 +275,36 @@ def makeSourceDirectory( main_module ):
         )
     )
 
-    writeSourceCode(
-        filename    = Utils.joinpath( source_dir, "__constants.cpp" ),
-        source_code = CodeGeneration.generateConstantsDefinitionCode(
-            context = global_context
+    constants_blob_filename = Utils.joinpath( source_dir, "__constants.bin" )
+
+    constants_codes = CodeGeneration.generateConstantsDefinitionCodes(
+        context                 = global_context,
+        constants_blob_filename = Utils.abspath( constants_blob_filename )
+    )
+
+    # Large amounts of constants are created in several files, so these can be
+    # compiled in parallel.
+    for count, source_code in enumerate( constants_codes ):
+        if count == 0:
+            filename = "__constants.cpp"
+        else:
+            filename = "__constants_%d.cpp" % count
+
+        writeSourceCode(
+            filename    = Utils.joinpath( source_dir, filename ),
+            source_code = source_code
         )
+
+        if Options.getCodegenReportFilename():
+            Reports.addFileCode(
+                filename    = Utils.joinpath( source_dir, filename ),
+                source_code = source_code
+            )
+
+    # Only complete after the constants code was generated.
+    writeBinaryData(
+        filename = constants_blob_filename,
+        data     = global_context.getConstantsBlob()
     )
 
     writeSourceCode(
@@ -272,6 +325,29 @@ def makeSourceDirectory( main_module ):
         source_code = "".join( module_hpp_include )
     )
 
+    if Options.isNinjaBuild():
+        _removeStaleSourceFiles( source_dir )
+
+def getPythonStaticLibrary():
+    """ The static library of the running Python, for single file binaries. """
+
+    if not sys.platform.startswith( "linux" ):
+        sys.exit( "Error, single file portable binaries are only supported on Linux." )
+
+    from distutils import sysconfig
+
+    result = Utils.joinpath(
+        sysconfig.get_config_var( "LIBPL" ),
+        sysconfig.get_config_var( "LIBRARY" )
+    )
+
+    if not Utils.isFile( result ):
+        sys.exit(
+            "Error, single file portable binaries need the static Python library '%s'." % result
+        )
+
+    return result
+
 def runScons( main_module, quiet ):
     python_version = "%d.%d" % ( sys.version_info[0], sys.version_info[1] )
 
@@ -314,19 +390,69 @@ def runScons( main_module, quiet ):
     if Options.isPortableMode():
         options[ "portable_mode" ] = "true"
 
+    if Options.isPortableSingleFile():
+        options[ "portable_single_file_mode" ] = "true"
+        options[ "python_static_library" ] = getPythonStaticLibrary()
+
+    if Options.shallTraceStartup():
+        options[ "startup_trace_mode" ] = "true"
+
+    if Options.shallProfileRuntime():
+        options[ "profile_mode" ] = "true"
+
+    if Options.shallCallTraceHooks():
+        options[ "trace_hooks_mode" ] = "true"
+
+    if Options.isSharedRuntime():
+        options[ "shared_runtime_mode" ] = "true"
+
+    if Options.isNinjaBuild():
+        return NinjaInterface.runNinja( options, quiet ), options
+
     return SconsInterface.runScons( options, quiet ), options
 
+# The files written for the current build, for the Ninja build, where old files
+# are not removed before.
+_written_filenames = set()
+
+def _isUnchangedFile( filename, data ):
+    # For the Ninja build, keep the time stamp of files with the same contents, so
+    # they are not compiled again.
+    if not Options.isNinjaBuild() or not Utils.isFile( filename ):
+        return False
+
+    with open( filename, "rb" ) as input_file:
+        return input_file.read() == data
+
+def writeBinaryData( filename, data ):
+    # Prevent accidental overwriting, see above.
+    assert filename not in _written_filenames, filename
+    assert Options.isNinjaBuild() or not Utils.isFile( filename ), filename
+
+    _written_filenames.add( filename )
+
+    if _isUnchangedFile( filename, data ):
+        return
+
+    with open( filename, "wb" ) as output_file:
+        output_file.write( data )
+
 def writeSourceCode( filename, source_code ):
     # Prevent accidental overwriting. When this happens the collision detection or
     # something else has failed.
-    assert not Utils.isFile( filename ), filename
+    assert filename not in _written_filenames, filename
+    assert Options.isNinjaBuild() or not Utils.isFile( filename ), filename
+
+    _written_filenames.add( filename )
 
     if Utils.python_version >= 300:
-        with open( filename, "wb" ) as output_file:
-            output_file.write( source_code.encode( "latin1" ) )
-    else:
-        with open( filename, "w" ) as output_file:
-            output_file.write( source_code )
+        source_code = source_code.encode( "latin1" )
+
+    if _isUnchangedFile( filename, source_code ):
+        return
+
+    with open( filename, "wb" if Utils.python_version >= 300 else "w" ) as output_file:
+        output_file.write( source_code )
 
 
 def callExec( args, clean_path, add_path ):
@@ -395,6 +521,25 @@ def executeModule( tree, clean_path ):
         args       = args
     )
 
+def _showCompilePrediction( source_dir ):
+    prediction = CompileCosts.loadCosts( source_dir ).get( "prediction" )
+
+    if prediction is None:
+        return
+
+    Tracing.printLine(
+        "Compiling all C++ files predicted to take %.1fs with %d jobs, %.1fs in total." % (
+            prediction[ "wall_clock" ],
+            prediction[ "jobs" ],
+            prediction[ "total" ]
+        )
+    )
+
+    Tracing.printLine( "Critical path:" )
+
+    for entry in prediction[ "critical_path" ]:
+        Tracing.printLine( "  %6.2fs %s" % ( entry[ "duration" ], entry[ "file" ] ) )
+
 def compileTree( main_module ):
     if not Options.shallOnlyExecGcc():
         # Now build the target language code for the whole tree.
@@ -414,4 +559,13 @@ def compileTree( main_module ):
         quiet        = not Options.isShowScons()
     )
 
+    if Options.isShowProgress():
+        _showCompilePrediction( getSourceDirectoryPath( main_module ) )
+
+    if result and Options.getCodegenReportFilename():
+        Reports.writeReport(
+            report_filename = Options.getCodegenReportFilename(),
+            source_dir      = getSourceDirectoryPath( main_module )
+        )
+
     return result, options
@@ -224,6 +224,33 @@ codegen_group.add_option(
     help    = """Disable all unnecessary optimizations on Python level. Defaults to off."""
 )
 
+codegen_group.add_option(
+    "--code-gen-split-lines",
+    action  = "store",
+    type    = "int",
+    dest    = "split_lines",
+    metavar = "N",
+    default = 500,
+    help    = """\
+Module and class bodies with more than N lines of C++ code are split into several
+C++ functions, which the C++ compiler handles a lot faster, as that code runs only
+once anyway. Use 0 to never split. Defaults to %default."""
+)
+
+codegen_group.add_option(
+    "--code-gen-stream-constants",
+    action  = "store",
+    type    = "int",
+    dest    = "stream_constants",
+    metavar = "N",
+    default = 32,
+    help    = """\
+Constant tuples, lists, and dictionaries with at least N elements are created from
+a stream of data at run time, instead of by C++ code element by element, which takes
+long to compile. Constants with mutable elements are always streamed. Defaults to
+%default."""
+)
+
 parser.add_option_group( codegen_group )
 
 outputdir_group = OptionGroup(
@@ -308,6 +335,41 @@ Traced execution output, output the line of code before executing it.
 Defaults to off."""
 )
 
+debug_group.add_option(
+    "--startup-trace",
+    action  = "store_true",
+    dest    = "startup_trace",
+    default = False,
+    help    = """\
+Compile in timing of the startup phases and module initializations, which is
+output if the environment variable NUITKA_STARTUP_TRACE is set at run time.
+Defaults to off."""
+)
+
+debug_group.add_option(
+    "--profile-runtime",
+    action  = "store_true",
+    dest    = "profile_runtime",
+    default = False,
+    help    = """\
+Compile in counting and timing of compiled functions and generators, which
+"cProfile" does not see. At exit, a file for the "pstats" module is written,
+named by the environment variable NUITKA_PROFILE_FILE, by default
+"nuitka-<pid>.prof". Defaults to off."""
+)
+
+debug_group.add_option(
+    "--python-trace-hooks",
+    action  = "store_true",
+    dest    = "trace_hooks",
+    default = False,
+    help    = """\
+Compile in calls of the functions set with "sys.setprofile" and "sys.settrace"
+for compiled frames, so profilers, coverage tools and debuggers see calls,
+returns, exceptions leaving frames, and lines of statements. Slows down every
+call even without such functions. Defaults to off."""
+)
+
 debug_group.add_option(
     "--c++-only",
     action  = "store_true",
@@ -381,6 +443,18 @@ tracing_group.add_option(
 Output details of actions take, esp. in optimizations. Can become a lot."""
 )
 
+tracing_group.add_option(
+    "--report-codegen",
+    action  = "store",
+    dest    = "codegen_report",
+    metavar = "FILENAME",
+    default = None,
+    help    = """\
+Write a report in JSON format to FILENAME, with the size of the generated C++
+code per module and function, its temporaries and helper calls, and the
+compile time and object size of each C++ file. Use this to find the code that
+makes builds slow and binaries large. Defaults to off."""
+)
 
 parser.add_option_group( tracing_group )
 
@@ -395,6 +469,19 @@ Specify the allowed number of parallel C++ compiler jobs. Defaults to the system
 CPU count.""",
 )
 
+parser.add_option(
+    "--build-tool",
+    action  = "store",
+    dest    = "build_tool",
+    choices = ( "scons", "ninja" ),
+    default = "scons",
+    help    = """\
+The tool to build with, one of 'scons' or 'ninja'. With 'ninja', scons is only
+asked for the commands once for the options used, and the objects of a previous
+build are kept and only compiled again if changed. Uses the "ninja" binary if
+installed, otherwise does the same itself. Defaults to 'scons'.""",
+)
+
 parser.add_option(
     "--improved",
     action  = "store_true",
@@ -414,6 +501,29 @@ parser.add_option(
 Given warnings for implicit exceptions detected at compile time.""",
 )
 
+parser.add_option(
+    "--immortal-constants",
+    action  = "store_true",
+    dest    = "immortal_constants",
+    default = False,
+    help    = """\
+Make constants never released, and untrack the immutable ones from the garbage
+collection right after their creation, instead of when it first visits them.
+This does not reduce the memory copied for forked processes, reference count
+changes still write to the constants. Defaults to off.""",
+)
+
+parser.add_option(
+    "--shared-runtime",
+    action  = "store_true",
+    dest    = "shared_runtime",
+    default = False,
+    help    = """\
+For extension modules, build the Nuitka run time as a shared library next to
+the module, instead of including it. The modules compiled like this to the same
+directory, with the same options, share it. Defaults to off.""",
+)
+
 parser.add_option(
     "--portable",
     action  = "store_true",
@@ -423,6 +533,18 @@ parser.add_option(
 Enable portable mode in build.""",
 )
 
+parser.add_option(
+    "--portable-single-file",
+    action  = "store_true",
+    dest    = "is_portable_single_file",
+    default = False,
+    help    = """\
+Portable mode, but with the Python library linked statically, and the modules
+it needs appended to the binary, so it is a single file. Extension modules are
+extracted to a cache directory when imported. Implies "--portable" and is only
+supported on Linux. Defaults to off.""",
+)
+
 if is_nuitka_python:
     count = 0
 
@@ -452,6 +574,15 @@ if options.verbose:
 def shallTraceExecution():
     return options.trace_execution
 
+def shallTraceStartup():
+    return options.startup_trace
+
+def shallProfileRuntime():
+    return options.profile_runtime
+
+def shallCallTraceHooks():
+    return options.trace_hooks
+
 def shallExecuteImmediately():
     return options.immediate_execution
 
@@ -470,6 +601,12 @@ def shallOnlyExecGcc():
 def shallHaveStatementLines():
     return options.statement_lines
 
+def getSplitCodeLines():
+    return options.split_lines
+
+def getConstantStreamingSize():
+    return options.stream_constants
+
 def shallMakeModule():
     return not options.executable
 
@@ -530,6 +667,9 @@ def isShowScons():
 def getJobLimit():
     return int( options.jobs )
 
+def isNinjaBuild():
+    return options.build_tool == "ninja"
+
 def isLto():
     return options.lto
 
@@ -558,4 +698,16 @@ def isExperimental():
     return hasattr( options, "experimental" ) and options.experimental
 
 def isPortableMode():
-    return options.is_portable_mode
+    return options.is_portable_mode or options.is_portable_single_file
+
+def isPortableSingleFile():
+    return options.is_portable_single_file
+
+def shallMakeConstantsImmortal():
+    return options.immortal_constants
+
+def isSharedRuntime():
+    return options.shared_runtime
+
+def getCodegenReportFilename():
+    return options.codegen_report
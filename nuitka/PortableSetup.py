@@ -17,13 +17,16 @@
 #
 """ Pack and copy files for portable mode.
 
-usage: PortableSetup.py mainscript outputdir
+usage: PortableSetup.py mainscript outputdir [binary]
 
+With a binary given, the files are appended to it as an archive instead, for a
+single file portable binary.
 """
 
 import sys
 import os
 import zipfile
+import struct
 
 python_library_archive_name = "_python.zip"
 python_dll_dir_name = "_python"
@@ -137,15 +140,20 @@ def getCopyList( imported_list ):
             bin_list.append( path )
     return zip_list, bin_list
 
+def getPythonLibraryPath():
+    with open( "/proc/%s/smaps" % os.getpid() ) as pmap:
+        for line in pmap:
+            if line.find("libpython") != -1:
+                return line[ line.find( "/" ): ].strip()
+
+    return None
+
 def copyPythonLibrary( outputdir ):
     if os.name == "posix" and os.uname()[0] == "Linux":
-        with open( "/proc/%s/smaps" % os.getpid() ) as pmap:
-            for line in pmap:
-                if line.find("libpython") != -1:
-                    src = line[ line.find( "/" ): ].strip()
-                    dst = os.path.join( outputdir, os.path.basename ( src ) )
-                    copyFile( src, dst )
-                    break
+        src = getPythonLibraryPath()
+        if src is not None:
+            dst = os.path.join( outputdir, os.path.basename ( src ) )
+            copyFile( src, dst )
     elif os.name == "nt":
         import ctypes
         from ctypes import windll
@@ -163,13 +171,91 @@ def copyPythonLibrary( outputdir ):
         # TODO: Add support for bsd and osx here
         sys.exit( "Error, unsupported platform for portable binaries." )
 
-def main( mainscript, outputdir ):
+def getByteCode( path, archive_name ):
+    # Compiled here, so the byte code is there for all modules, and matches the
+    # Python used, the payload importer only uses byte code.
+    import imp, marshal
+
+    with open( path, "rU" ) as source_file:
+        source_code = source_file.read()
+
+    code = compile( source_code, archive_name, "exec", 0, True )
+
+    return imp.get_magic() + \
+           struct.pack( "<I", int( os.stat( path ).st_mtime ) ) + \
+           marshal.dumps( code )
+
+def stripPayload( binary ):
+    # Remove the archive of a previous run, if any. The offsets of the archive
+    # are relative to its start, so its size can be derived from its end.
+    with open( binary, "rb" ) as binary_file:
+        binary_file.seek( -22, 2 )
+        end_record = binary_file.read( 22 )
+
+    if end_record[ :4 ] != b"PK\x05\x06":
+        return
+
+    directory_size, directory_offset = struct.unpack( "<II", end_record[ 12:20 ] )
+
+    with open( binary, "rb+" ) as binary_file:
+        binary_file.seek( 0, 2 )
+        size = binary_file.tell()
+        binary_file.truncate( size - 22 - directory_size - directory_offset )
+
+def appendPayload( binary, zip_list, bin_list, base_length ):
+    import io
+
+    buf = io.BytesIO()
+
+    with zipfile.ZipFile( buf, "w", zipfile.ZIP_STORED ) as zip_file:
+        done = set()
+
+        for path in zip_list:
+            path_base = path.rsplit( ".", 1 )[0]
+
+            if path_base in done:
+                continue
+            done.add( path_base )
+
+            archive_base = path_base[ base_length: ]
+
+            if os.path.isfile( path_base + ".py" ):
+                zip_file.write( path_base + ".py", archive_base + ".py" )
+                zip_file.writestr(
+                    archive_base + ".pyc",
+                    getByteCode( path_base + ".py", archive_base + ".py" )
+                )
+            elif os.path.isfile( path_base + ".pyc" ):
+                zip_file.write( path_base + ".pyc", archive_base + ".pyc" )
+
+        python_library = getPythonLibraryPath()
+
+        if python_library is not None:
+            bin_list = bin_list + [ python_library ]
+
+        for path in bin_list:
+            zip_file.write(
+                path,
+                python_dll_dir_name + "/" + os.path.basename( path )
+            )
+
+    stripPayload( binary )
+
+    with open( binary, "ab" ) as binary_file:
+        binary_file.write( buf.getvalue() )
+
+def main( mainscript, outputdir, binary = None ):
     imported_dict = getImportedDict( mainscript )
     imported_list = getImportedPathList( imported_dict )
     zip_list, bin_list = getCopyList( imported_list )
 
-    # pack script to archive
     base_length = len( os.path.dirname( os.__file__ ) ) + 1
+
+    if binary is not None:
+        appendPayload( binary, zip_list, bin_list, base_length )
+        return
+
+    # pack script to archive
     zip_path = os.path.join( outputdir, python_library_archive_name )
 
     with zipfile.ZipFile( zip_path, "w", zipfile.ZIP_STORED ) as zip_file:
@@ -190,11 +276,14 @@ def main( mainscript, outputdir ):
     # copy libpython
     copyPythonLibrary( outputdir )
 
-def setup( mainscript, outputdir ):
+def setup( mainscript, outputdir, binary = None ):
     # if use this script as module, use this method
     import subprocess
+    args = [ sys.executable, __file__, mainscript, outputdir ]
+    if binary is not None:
+        args.append( binary )
     proc = subprocess.Popen(
-        args   = ( sys.executable, __file__, mainscript, outputdir ),
+        args   = args,
         stdout = sys.stdout,
         stderr = sys.stderr,
         stdin  = sys.stdin,
@@ -206,5 +295,6 @@ def setup( mainscript, outputdir ):
 if __name__ == "__main__":
     main(
         mainscript = os.path.abspath( sys.argv[1] ),
-        outputdir  = os.path.abspath( sys.argv[2] )
+        outputdir  = os.path.abspath( sys.argv[2] ),
+        binary     = os.path.abspath( sys.argv[3] ) if len( sys.argv ) > 3 else None
     )
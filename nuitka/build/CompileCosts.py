@@ -0,0 +1,127 @@
+#     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+#
+#     Part of "Nuitka", an optimizing Python compiler that is compatible and
+#     integrates with CPython, but also works on its own.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+""" Costs of compiling the C++ files.
+
+The generated files differ a lot in size, and when a big one is started last,
+the other jobs are idle until it finishes. The durations of compilations are
+therefore recorded in the build directory, and the files are compiled in order
+of their expected duration, largest first. Files without a recorded duration
+are estimated from their size.
+
+This is used by "SingleExe.scons" too, so it must not use other modules of
+Nuitka, and work with Python2 for scons.
+"""
+
+import os, json
+
+costs_filename = "build-costs.json"
+
+# Seconds per byte of source code, if there are no durations to derive it from.
+_default_rate = 1.5e-5
+
+def getCostKey( filename ):
+    """ The name of the compiled file, the same for the object file. """
+
+    return os.path.splitext( os.path.basename( filename ) )[0]
+
+def loadCosts( source_dir ):
+    """ The recorded durations and last prediction of a build directory. """
+
+    try:
+        with open( os.path.join( source_dir, costs_filename ) ) as costs_file:
+            costs = json.load( costs_file )
+    except ( IOError, OSError, ValueError ):
+        costs = {}
+
+    costs.setdefault( "durations", {} )
+
+    return costs
+
+def saveCosts( source_dir, costs ):
+    with open( os.path.join( source_dir, costs_filename ), "w" ) as costs_file:
+        json.dump( costs, costs_file, indent = 1, sort_keys = True )
+
+def getExpectedDurations( filenames, durations, getSize = os.path.getsize ):
+    """ Expected compile time of each file, in seconds. """
+
+    sizes = {}
+
+    for filename in filenames:
+        try:
+            sizes[ filename ] = getSize( filename )
+        except OSError:
+            sizes[ filename ] = 0
+
+    measured = [
+        filename
+        for filename in filenames
+        if getCostKey( filename ) in durations and sizes[ filename ]
+    ]
+
+    measured_size = sum( sizes[ filename ] for filename in measured )
+
+    if measured_size:
+        rate = sum( durations[ getCostKey( filename ) ] for filename in measured ) / measured_size
+    else:
+        rate = _default_rate
+
+    return dict(
+        (
+            filename,
+            durations.get( getCostKey( filename ), sizes[ filename ] * rate )
+        )
+        for filename in filenames
+    )
+
+def sortByExpectedDuration( filenames, expected ):
+    """ The files to compile, the longest ones first. """
+
+    return sorted( filenames, key = lambda filename : -expected[ filename ] )
+
+def predictBuild( expected, job_limit ):
+    """ Predict the duration of compiling all files, started longest first.
+
+        Returns a dictionary with the predicted time until all compilations
+        are done, and the critical path, which are the files compiled one
+        after another by the job that finishes last.
+    """
+
+    jobs = [ ( 0.0, [] ) for _count in range( max( 1, job_limit ) ) ]
+
+    for filename in sortByExpectedDuration( expected, expected ):
+        # The next file is started by the job that is done first.
+        job = min( range( len( jobs ) ), key = lambda index : jobs[ index ][0] )
+        end, filenames = jobs[ job ]
+
+        jobs[ job ] = ( end + expected[ filename ], filenames + [ filename ] )
+
+    wall_clock, critical_path = max( jobs, key = lambda job : job[0] )
+
+    return {
+        "jobs"          : job_limit,
+        "total"         : sum( expected.values() ),
+        "wall_clock"    : wall_clock,
+        "critical_path" : [
+            {
+                "file"     : filename,
+                "duration" : expected[ filename ]
+            }
+            for filename in
+            critical_path
+        ]
+    }
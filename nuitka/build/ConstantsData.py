@@ -0,0 +1,67 @@
+#     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+#
+#     Part of "Nuitka", an optimizing Python compiler that is compatible and
+#     integrates with CPython, but also works on its own.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+""" The constants blob for MSVC.
+
+The constants blob is included by the assembler with gcc and clang. MSVC has no
+way of doing that, so a C++ file that defines it is created from the blob. This
+is done by "SingleExe.scons", and for the Ninja build, which does not run scons
+for every build, also by the Ninja backend.
+
+This is used by "SingleExe.scons" too, so it must not use other modules of
+Nuitka, and work with Python2 for scons.
+"""
+
+import os
+
+data_filename = "__constants_data.cpp"
+
+def writeConstantsDataCode( source_dir ):
+    """ Create the C++ file for the constants blob in the source directory.
+
+        It is only written if it changed, so it is not compiled again for
+        nothing.
+    """
+
+    blob_file = open( os.path.join( source_dir, "__constants.bin" ), "rb" )
+    constants_data = bytearray( blob_file.read() )
+    blob_file.close()
+
+    lines = [ 'extern "C" const unsigned char constant_bin[] =', "{" ]
+
+    for start in range( 0, len( constants_data ), 32 ):
+        lines.append(
+            "    %s," % ",".join( str( c ) for c in constants_data[ start : start + 32 ] )
+        )
+
+    lines += [ "    0", "};", "" ]
+
+    source_code = "\n".join( lines )
+
+    filename = os.path.join( source_dir, data_filename )
+
+    if os.path.isfile( filename ):
+        data_file = open( filename )
+        unchanged = data_file.read() == source_code
+        data_file.close()
+
+        if unchanged:
+            return
+
+    data_file = open( filename, "w" )
+    data_file.write( source_code )
+    data_file.close()
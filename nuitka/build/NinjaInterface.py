@@ -0,0 +1,405 @@
+#     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+#
+#     Part of "Nuitka", an optimizing Python compiler that is compatible and
+#     integrates with CPython, but also works on its own.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+""" Ninja interface.
+
+Alternative to running scons for every build. The commands are asked from scons
+only once for a set of options, so the flag logic of "SingleExe.scons" is used
+unchanged, and written to a Ninja build file. Up to date objects are then not
+compiled again, and nothing is if nothing changed.
+
+If no "ninja" binary is installed, the build file is executed by a small driver
+here instead, which does the same checks, based on time stamps, the commands,
+and the dependency files of the compiler.
+"""
+
+from nuitka import Options, Tracing, Utils
+
+from . import SconsInterface, CompileCosts, ConstantsData
+
+import os, json, hashlib, subprocess, time
+
+_description_filename = "build.json"
+_ninja_filename = "build.ninja"
+_commands_filename = "build.commands"
+
+def _getExportKey( options ):
+    """ Key for the commands exported by scons.
+
+        These only change with the options, the sources present, the relevant
+        environment variables, and Nuitka itself.
+    """
+
+    key = hashlib.md5()
+
+    key.update( Options.getVersion().encode( "utf-8" ) )
+    key.update( os.getcwd().encode( "utf-8" ) )
+    key.update( repr( sorted( options.items() ) ).encode( "utf-8" ) )
+
+    for name in ( "CXX", "CCFLAGS", "LDFLAGS", "PATH" ):
+        key.update( repr( os.environ.get( name ) ).encode( "utf-8" ) )
+
+    key.update(
+        repr(
+            sorted(
+                filename
+                for _path, filename in
+                Utils.listDir( options[ "source_dir" ] )
+                if filename.endswith( ".cpp" )
+                if filename != ConstantsData.data_filename
+            )
+        ).encode( "utf-8" )
+    )
+
+    with open( Utils.joinpath( SconsInterface.getSconsDataPath(), "SingleExe.scons" ), "rb" ) as scons_file:
+        key.update( scons_file.read() )
+
+    return key.hexdigest()
+
+def _getBuildDescription( options, quiet ):
+    source_dir = options[ "source_dir" ]
+    description_filename = Utils.joinpath( source_dir, _description_filename )
+
+    key = _getExportKey( options )
+
+    if Utils.isFile( description_filename ):
+        with open( description_filename ) as description_file:
+            description = json.load( description_file )
+
+        if description.get( "key" ) == key:
+            return description
+
+    export_options = dict( options )
+    export_options[ "export_file" ] = Utils.abspath( description_filename )
+
+    if os.system( SconsInterface.getSconsCommand( export_options, quiet ) ) != 0:
+        return None
+
+    with open( description_filename ) as description_file:
+        description = json.load( description_file )
+
+    for step in description[ "steps" ]:
+        # The constants blob is included by the assembler, which the dependency
+        # files of the compiler do not tell.
+        for source in step[ "inputs" ]:
+            if Utils.basename( source ) == "__constants.cpp":
+                step[ "implicit" ].append(
+                    Utils.joinpath( Utils.dirname( source ), "__constants.bin" )
+                )
+
+        if step[ "compile" ] and description[ "gcc_mode" ]:
+            step[ "depfile" ] = step[ "outputs" ][0] + ".d"
+            step[ "commands" ][-1] += " -MMD -MF %s" % step[ "depfile" ]
+
+    description[ "key" ] = key
+
+    with open( description_filename, "w" ) as description_file:
+        json.dump( description, description_file, indent = 1 )
+
+    return description
+
+def _escapeNinjaPath( path ):
+    return path.replace( "$", "$$" ).replace( " ", "$ " ).replace( ":", "$:" )
+
+def _writeNinjaFile( filename, description, source_dir ):
+    lines = [
+        "# Generated by Nuitka, do not edit.",
+        "builddir = %s" % _escapeNinjaPath( source_dir ),
+        "",
+        "rule compile",
+        "  command = $command",
+        "  description = Compiling $out",
+        "  depfile = $depfile",
+        "  deps = gcc",
+        "",
+        "rule link",
+        "  command = $command",
+        "  description = Linking $out",
+        ""
+    ]
+
+    for step in description[ "steps" ]:
+        lines.append(
+            "build %s: %s %s%s" % (
+                " ".join( _escapeNinjaPath( output ) for output in step[ "outputs" ] ),
+                "compile" if step[ "compile" ] else "link",
+                " ".join( _escapeNinjaPath( source ) for source in step[ "inputs" ] ),
+                ( " | " + " ".join( _escapeNinjaPath( implicit ) for implicit in step[ "implicit" ] ) )
+                  if step[ "implicit" ] else ""
+            )
+        )
+        lines.append(
+            "  command = %s" % " && ".join( step[ "commands" ] ).replace( "$", "$$" )
+        )
+
+        if "depfile" in step:
+            lines.append( "  depfile = %s" % _escapeNinjaPath( step[ "depfile" ] ) )
+
+    source_code = "\n".join( lines ) + "\n"
+
+    # Only write it when changed, so "ninja" does not reload it for nothing.
+    if Utils.isFile( filename ):
+        with open( filename ) as ninja_file:
+            if ninja_file.read() == source_code:
+                return
+
+    with open( filename, "w" ) as ninja_file:
+        ninja_file.write( source_code )
+
+def _findNinjaBinary():
+    for name in ( "ninja", "ninja-build" ):
+        for path in os.environ.get( "PATH", "" ).split( os.pathsep ):
+            candidate = Utils.joinpath( path, name )
+
+            if Utils.isFile( candidate ) and os.access( candidate, os.X_OK ):
+                return candidate
+
+    return None
+
+def _readDepFile( filename ):
+    """ Dependencies from a dependency file in make format, as gcc writes it. """
+
+    with open( filename ) as dep_file:
+        contents = dep_file.read().replace( "\\\n", " " )
+
+    return contents.split( ":", 1 )[1].split()
+
+def _getModificationTime( path ):
+    try:
+        return os.stat( path ).st_mtime
+    except OSError:
+        return None
+
+def _isOutdated( step, command, commands ):
+    if commands.get( step[ "outputs" ][0] ) != command:
+        return True
+
+    output_times = [ _getModificationTime( output ) for output in step[ "outputs" ] ]
+
+    if None in output_times:
+        return True
+
+    inputs = step[ "inputs" ] + step[ "implicit" ]
+
+    if "depfile" in step:
+        if not Utils.isFile( step[ "depfile" ] ):
+            return True
+
+        inputs = inputs + _readDepFile( step[ "depfile" ] )
+
+    for path in inputs:
+        input_time = _getModificationTime( path )
+
+        if input_time is None or input_time > min( output_times ):
+            return True
+
+    return False
+
+def _readNinjaLog( source_dir ):
+    """ The durations of the outputs from the log "ninja" writes, in seconds.
+
+        Each line has the start and end time in milliseconds, and the output.
+        The log is appended to, so later lines are for later builds.
+    """
+
+    result = {}
+
+    log_filename = Utils.joinpath( source_dir, ".ninja_log" )
+
+    if not Utils.isFile( log_filename ):
+        return result
+
+    with open( log_filename ) as log_file:
+        for line in log_file:
+            if line.startswith( "#" ):
+                continue
+
+            parts = line.rstrip( "\n" ).split( "\t" )
+
+            if len( parts ) < 4:
+                continue
+
+            try:
+                start, end = int( parts[0] ), int( parts[1] )
+            except ValueError:
+                continue
+
+            result[ os.path.normpath( parts[3] ) ] = ( end - start ) / 1000.0
+
+    return result
+
+def _recordNinjaDurations( description, source_dir, costs ):
+    durations = _readNinjaLog( source_dir )
+
+    for step in description[ "steps" ]:
+        if not step[ "compile" ]:
+            continue
+
+        duration = durations.get( os.path.normpath( step[ "outputs" ][0] ) )
+
+        if duration is not None:
+            costs[ "durations" ][ CompileCosts.getCostKey( step[ "inputs" ][0] ) ] = \
+              duration
+
+def _runCommand( command, quiet ):
+    if not quiet:
+        Tracing.printLine( command )
+
+    return subprocess.call( command, shell = True ) == 0
+
+def _orderSteps( description, costs ):
+    """ Put the compilations first, the ones expected to take longest first.
+
+        The links only depend on compilations or previous links, so they can
+        follow in their order.
+    """
+
+    compile_steps = [ step for step in description[ "steps" ] if step[ "compile" ] ]
+
+    expected = CompileCosts.getExpectedDurations(
+        [ step[ "inputs" ][0] for step in compile_steps ],
+        costs[ "durations" ]
+    )
+
+    costs[ "prediction" ] = CompileCosts.predictBuild( expected, Options.getJobLimit() )
+
+    compile_steps.sort( key = lambda step : -expected[ step[ "inputs" ][0] ] )
+
+    description[ "steps" ] = compile_steps + [
+        step
+        for step in
+        description[ "steps" ]
+        if not step[ "compile" ]
+    ]
+
+def _runBuildSteps( description, source_dir, quiet, costs ):
+    commands_filename = Utils.joinpath( source_dir, _commands_filename )
+
+    if Utils.isFile( commands_filename ):
+        with open( commands_filename ) as commands_file:
+            commands = json.load( commands_file )
+    else:
+        commands = {}
+
+    from multiprocessing.pool import ThreadPool
+
+    pool = ThreadPool( Options.getJobLimit() )
+
+    def runStep( step ):
+        command = " && ".join( step[ "commands" ] )
+
+        # Like "ninja" does, create the directories of outputs.
+        for output in step[ "outputs" ]:
+            output_dir = Utils.dirname( output )
+
+            if output_dir and not Utils.isDir( output_dir ):
+                try:
+                    Utils.makePath( output_dir )
+                except OSError:
+                    # Another job may have created it in the mean time.
+                    pass
+
+        start = time.time()
+
+        if not _runCommand( command, quiet ):
+            return False
+
+        if step[ "compile" ]:
+            costs[ "durations" ][ CompileCosts.getCostKey( step[ "inputs" ][0] ) ] = \
+              time.time() - start
+
+        commands[ step[ "outputs" ][0] ] = command
+
+        return True
+
+    # Compilations are done in parallel, links have to wait for them.
+    result = True
+    pending = []
+
+    for step in description[ "steps" ] + [ None ]:
+        if step is not None and step[ "compile" ]:
+            if _isOutdated( step, " && ".join( step[ "commands" ] ), commands ):
+                pending.append( step )
+
+            continue
+
+        if pending:
+            # One at a time, so they are started in the order given.
+            result = all( pool.map( runStep, pending, 1 ) )
+            pending = []
+
+        if not result or step is None:
+            break
+
+        if _isOutdated( step, " && ".join( step[ "commands" ] ), commands ):
+            result = runStep( step )
+
+            if not result:
+                break
+
+    pool.close()
+
+    with open( commands_filename, "w" ) as commands_file:
+        json.dump( commands, commands_file, indent = 1 )
+
+    CompileCosts.saveCosts( source_dir, costs )
+
+    return result
+
+def runNinja( options, quiet ):
+    source_dir = options[ "source_dir" ]
+
+    description = _getBuildDescription( options, quiet )
+
+    if description is None:
+        return False
+
+    # Scons creates this file for MSVC only when it runs, which is not for
+    # every build, but the constants blob may have changed nonetheless.
+    if description.get( "msvc_mode" ):
+        ConstantsData.writeConstantsDataCode( source_dir )
+
+    costs = CompileCosts.loadCosts( source_dir )
+    _orderSteps( description, costs )
+
+    ninja_binary = _findNinjaBinary()
+
+    if ninja_binary is None:
+        return _runBuildSteps( description, source_dir, quiet, costs )
+
+    ninja_filename = Utils.joinpath( source_dir, _ninja_filename )
+    _writeNinjaFile( ninja_filename, description, source_dir )
+
+    ninja_command = [
+        ninja_binary,
+        "-f", ninja_filename,
+        "-j", str( Options.getJobLimit() )
+    ]
+
+    if not quiet:
+        ninja_command.append( "-v" )
+
+    if Options.isShowScons():
+        Tracing.printLine( "Ninja command:", " ".join( ninja_command ) )
+
+    result = subprocess.call( ninja_command ) == 0
+
+    # The compile durations for the next build, also of a failed one.
+    _recordNinjaDurations( description, source_dir, costs )
+    CompileCosts.saveCosts( source_dir, costs )
+
+    return result
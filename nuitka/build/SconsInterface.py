@@ -38,7 +38,7 @@ def getSconsBinaryPath():
     else:
         return Utils.joinpath( getSconsInlinePath(), "bin", "scons.py" )
 
-def runScons( options, quiet ):
+def getSconsCommand( options, quiet ):
     # For the scons file to find the static C++ files and include path. The scons file is
     # unable to use __file__ for the task.
     os.environ[ "NUITKA_SCONS" ] = getSconsDataPath()
@@ -78,4 +78,7 @@ C:\\Python27 to execute scons which is not Python3 compatible.""" )
     if Options.isShowScons():
         Tracing.printLine( "Scons command:", scons_command )
 
-    return 0 == os.system( scons_command )
+    return scons_command
+
+def runScons( options, quiet ):
+    return 0 == os.system( getSconsCommand( options, quiet ) )
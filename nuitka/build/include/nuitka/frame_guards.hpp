@@ -147,6 +147,108 @@ static inline void dumpFrameStack( void )
 // that the line numbers are detached.
 extern PyFrameObject *detachCurrentFrame();
 
+#ifdef _NUITKA_TRACE_HOOKS
+// Call the profile and trace functions, as set with "sys.setprofile" and
+// "sys.settrace", for an event of a compiled frame, like "ceval.c" does it for
+// byte code. Other events than calls go to the trace function only if it asked
+// to trace the frame. Errors of the hooks are reported, but do not propagate.
+NUITKA_MAY_BE_UNUSED static void callTraceHooks( PyFrameObject *frame_object, int what, PyObject *arg )
+{
+    PyThreadState *tstate = PyThreadState_GET();
+
+    if ( likely( tstate->use_tracing == 0 ) || tstate->tracing )
+    {
+        return;
+    }
+
+    bool use_profile = tstate->c_profilefunc != NULL && ( what == PyTrace_CALL || what == PyTrace_RETURN );
+    bool use_trace = tstate->c_tracefunc != NULL && ( what == PyTrace_CALL || ( frame_object->f_trace != NULL && frame_object->f_trace != Py_None ) );
+
+    if ( !use_profile && !use_trace )
+    {
+        return;
+    }
+
+    // The hooks must not see or clear a pending exception of ours.
+    PyObject *exception_type, *exception_value, *exception_tb;
+    PyErr_Fetch( &exception_type, &exception_value, &exception_tb );
+
+    tstate->tracing++;
+    tstate->use_tracing = 0;
+
+    if ( use_profile && tstate->c_profilefunc != NULL )
+    {
+        if (unlikely( tstate->c_profilefunc( tstate->c_profileobj, frame_object, what, arg ) != 0 ))
+        {
+            PyErr_WriteUnraisable( (PyObject *)frame_object->f_code );
+        }
+    }
+
+    if ( use_trace && tstate->c_tracefunc != NULL )
+    {
+        if (unlikely( tstate->c_tracefunc( tstate->c_traceobj, frame_object, what, arg ) != 0 ))
+        {
+            PyErr_WriteUnraisable( (PyObject *)frame_object->f_code );
+        }
+    }
+
+    tstate->use_tracing = tstate->c_tracefunc != NULL || tstate->c_profilefunc != NULL;
+    tstate->tracing--;
+
+    PyErr_Restore( exception_type, exception_value, exception_tb );
+}
+
+// Give an exception leaving a compiled frame to the trace function.
+NUITKA_MAY_BE_UNUSED static void callExceptionTraceHook( PyFrameObject *frame_object, PythonException &exception )
+{
+    PyThreadState *tstate = PyThreadState_GET();
+
+    if ( likely( tstate->use_tracing == 0 ) || tstate->tracing || tstate->c_tracefunc == NULL )
+    {
+        return;
+    }
+
+    if ( frame_object->f_trace == NULL || frame_object->f_trace == Py_None )
+    {
+        return;
+    }
+
+    PyObject *traceback = (PyObject *)exception.getTraceback();
+
+    PyObject *arg = PyTuple_Pack(
+        3,
+        exception.getType(),
+        exception.getValue() ? exception.getValue() : Py_None,
+        traceback ? traceback : Py_None
+    );
+
+    if (unlikely( arg == NULL ))
+    {
+        PyErr_WriteUnraisable( (PyObject *)frame_object->f_code );
+        return;
+    }
+
+    callTraceHooks( frame_object, PyTrace_EXCEPTION, arg );
+
+    Py_DECREF( arg );
+}
+
+// The trace function may have replaced the trace function of the frame, but
+// frames are cached for re-use, and must start out without it.
+inline static void resetFrameTrace( PyFrameObject *frame_object )
+{
+    if ( frame_object->f_trace != Py_None )
+    {
+        Py_XDECREF( frame_object->f_trace );
+        frame_object->f_trace = INCREASE_REFCOUNT( Py_None );
+    }
+}
+
+#define TRACE_EXCEPTION( frame_guard, exception ) frame_guard.traceException( exception )
+#else
+#define TRACE_EXCEPTION( frame_guard, exception )
+#endif
+
 class FrameGuard
 {
 public:
@@ -165,6 +267,16 @@ public:
 
         this->preserving = false;
 
+#ifdef _NUITKA_TRACE_HOOKS
+        this->exception_exit = false;
+
+        // Cached frames still have the line last executed in them.
+        frame_object->f_lineno = frame_object->f_code->co_firstlineno;
+
+        resetFrameTrace( frame_object );
+        callTraceHooks( frame_object, PyTrace_CALL, Py_None );
+#endif
+
 #if _DEBUG_REFRAME
         // dumpFrameStack();
 #endif
@@ -175,6 +287,12 @@ public:
         // Our frame should be on top.
         assert( PyThreadState_GET()->frame == this->frame_object );
 
+#ifdef _NUITKA_TRACE_HOOKS
+        // The return value is not known here, exceptions give none at all.
+        callTraceHooks( this->frame_object, PyTrace_RETURN, this->exception_exit ? NULL : Py_None );
+        resetFrameTrace( this->frame_object );
+#endif
+
         // Put the previous frame on top instead.
         popFrameStack();
 
@@ -216,10 +334,14 @@ public:
         assertFrameObject( this->frame_object );
         assert( lineno >= 1 );
 
+        this->frame_object->f_lineno = lineno;
+
+#ifdef _NUITKA_TRACE_HOOKS
+        callTraceHooks( this->frame_object, PyTrace_LINE, Py_None );
+#else
         // Make sure f_lineno is the actually used information.
         assert( this->frame_object->f_trace == Py_None );
-
-        this->frame_object->f_lineno = lineno;
+#endif
     }
 
     int getLineNumber() const
@@ -233,8 +355,10 @@ public:
     {
         assertFrameObject( this->frame_object );
 
+#ifndef _NUITKA_TRACE_HOOKS
         // Make sure f_lineno is the actually used information.
         assert( this->frame_object->f_trace == Py_None );
+#endif
     }
 
     // Replace the frame object by a newer one.
@@ -292,11 +416,24 @@ public:
     }
 #endif
 
+#ifdef _NUITKA_TRACE_HOOKS
+    void traceException( PythonException &exception )
+    {
+        callExceptionTraceHook( this->frame_object, exception );
+
+        this->exception_exit = true;
+    }
+#endif
+
 private:
 
     bool preserving;
     PyFrameObject *frame_object;
 
+#ifdef _NUITKA_TRACE_HOOKS
+    bool exception_exit;
+#endif
+
 };
 
 class FrameGuardLight
@@ -312,6 +449,15 @@ public:
 #if PYTHON_VERSION >= 300
         preserving = false;
 #endif
+
+#ifdef _NUITKA_TRACE_HOOKS
+        // This is the first run of the generator, later resumptions and all
+        // returns are given to the hooks when sending to it.
+        (*frame_ptr)->f_lineno = (*frame_ptr)->f_code->co_firstlineno;
+
+        resetFrameTrace( *frame_ptr );
+        callTraceHooks( *frame_ptr, PyTrace_CALL, Py_None );
+#endif
     }
 
     ~FrameGuardLight()
@@ -353,10 +499,14 @@ public:
         assertFrameObject( *this->frame_ptr );
         assert( lineno >= 1 );
 
+        (*this->frame_ptr)->f_lineno = lineno;
+
+#ifdef _NUITKA_TRACE_HOOKS
+        callTraceHooks( *this->frame_ptr, PyTrace_LINE, Py_None );
+#else
         // Make sure f_lineno is the actually used information.
         assert( (*this->frame_ptr)->f_trace == Py_None );
-
-        (*this->frame_ptr)->f_lineno = lineno;
+#endif
     }
 
     // Replace the frame object by a newer one.
@@ -420,6 +570,13 @@ public:
     }
 #endif
 
+#ifdef _NUITKA_TRACE_HOOKS
+    void traceException( PythonException &exception )
+    {
+        callExceptionTraceHook( *this->frame_ptr, exception );
+    }
+#endif
+
 private:
 
     PyFrameObject **frame_ptr;
@@ -441,10 +598,14 @@ public:
         assertFrameObject( frame_object );
         assert( lineno >= 1 );
 
+        frame_object->f_lineno = lineno;
+
+#ifdef _NUITKA_TRACE_HOOKS
+        callTraceHooks( frame_object, PyTrace_LINE, Py_None );
+#else
         // Make sure f_lineno is the actually used information.
         assert( frame_object->f_trace == Py_None );
-
-        frame_object->f_lineno = lineno;
+#endif
     }
 
     PyFrameObject *getFrame() const
@@ -421,4 +421,16 @@ NUITKA_MAY_BE_UNUSED static void THROW_IF_ERROR_OCCURED_NOT( PyObject *ignored )
     }
 }
 
+// Throw the exception that occured, unless it is of the given type, which is
+// then left set for the caller to handle.
+NUITKA_MAY_BE_UNUSED static void THROW_IF_ERROR_OCCURED_NOT_KEEP( PyObject *kept )
+{
+    assert( ERROR_OCCURED() );
+
+    if ( !PyErr_ExceptionMatches( kept ) )
+    {
+        throw PythonException();
+    }
+}
+
 #endif
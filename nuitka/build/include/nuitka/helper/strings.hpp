@@ -0,0 +1,366 @@
+//     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+//
+//     Part of "Nuitka", an optimizing Python compiler that is compatible and
+//     integrates with CPython, but also works on its own.
+//
+//     Licensed under the Apache License, Version 2.0 (the "License");
+//     you may not use this file except in compliance with the License.
+//     You may obtain a copy of the License at
+//
+//        http://www.apache.org/licenses/LICENSE-2.0
+//
+//     Unless required by applicable law or agreed to in writing, software
+//     distributed under the License is distributed on an "AS IS" BASIS,
+//     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//     See the License for the specific language governing permissions and
+//     limitations under the License.
+//
+#ifndef __NUITKA_HELPER_STRINGS_H__
+#define __NUITKA_HELPER_STRINGS_H__
+
+#if PYTHON_VERSION < 300
+
+// The maximum number of conversions the compiler will hand to STRING_FORMAT,
+// for larger formats it uses the generic operation instead.
+#define NUITKA_STRING_FORMAT_MAX 16
+
+// Copy the given strings into one new string of the given total size, returns
+// NULL with an exception set, if that cannot be allocated.
+static PyObject *_JOIN_STRINGS( PyObject **strings, Py_ssize_t count, Py_ssize_t size )
+{
+    PyObject *result = PyString_FromStringAndSize( NULL, size );
+
+    if (unlikely( result == NULL ))
+    {
+        return NULL;
+    }
+
+    char *buffer = PyString_AS_STRING( result );
+
+    for ( Py_ssize_t i = 0; i < count; i++ )
+    {
+        Py_ssize_t length = PyString_GET_SIZE( strings[ i ] );
+
+        memcpy( buffer, PyString_AS_STRING( strings[ i ] ), length );
+        buffer += length;
+    }
+
+    return result;
+}
+
+// Concatenate the values of a tuple, as "a + b + c + ..." would. When all of
+// them are strings, this creates only the result string, otherwise it adds
+// them one by one, so the semantics are the ones of the normal operation.
+NUITKA_MAY_BE_UNUSED static PyObject *STRING_CONCAT( PyObject *operands )
+{
+    assertObject( operands );
+    assert( PyTuple_CheckExact( operands ) );
+    assert( PyTuple_GET_SIZE( operands ) >= 2 );
+
+    Py_ssize_t count = PyTuple_GET_SIZE( operands );
+    Py_ssize_t size = 0;
+
+    for ( Py_ssize_t i = 0; i < count; i++ )
+    {
+        PyObject *operand = PyTuple_GET_ITEM( operands, i );
+
+        if ( !PyString_CheckExact( operand ) )
+        {
+            PyObject *result = BINARY_OPERATION_ADD(
+                PyTuple_GET_ITEM( operands, 0 ),
+                PyTuple_GET_ITEM( operands, 1 )
+            );
+
+            for ( Py_ssize_t j = 2; j < count; j++ )
+            {
+                PyObjectTemporary value( result );
+
+                result = BINARY_OPERATION_ADD(
+                    value.asObject(),
+                    PyTuple_GET_ITEM( operands, j )
+                );
+            }
+
+            return result;
+        }
+
+        if (unlikely( size > PY_SSIZE_T_MAX - PyString_GET_SIZE( operand ) ))
+        {
+            PyErr_Format( PyExc_OverflowError, "strings are too large to concat" );
+            throw PythonException();
+        }
+
+        size += PyString_GET_SIZE( operand );
+    }
+
+    PyObject *result = _JOIN_STRINGS( &PyTuple_GET_ITEM( operands, 0 ), count, size );
+
+    if (unlikely( result == NULL ))
+    {
+        throw PythonException();
+    }
+
+    return result;
+}
+
+// Format the rest of a string, once a conversion was found that the fast way of
+// STRING_FORMAT cannot do. The generic formatting continues with the format from
+// that conversion on, and its result is appended to what was done already. With
+// "as_unicode", this switches to unicode formatting, the way CPython does it,
+// when it encounters a unicode value.
+static PyObject *_STRING_FORMAT_REST( PyObject **parts, Py_ssize_t done, Py_ssize_t size, PyObject *suffixes, PyObject *values, bool as_unicode )
+{
+    PyObject *rest_values = PyTuple_GetSlice( values, done, PyTuple_GET_SIZE( values ) );
+
+    if (unlikely( rest_values == NULL ))
+    {
+        return NULL;
+    }
+
+    PyObject *suffix = PyTuple_GET_ITEM( suffixes, done );
+    PyObject *rest;
+
+    if ( as_unicode )
+    {
+        PyObject *unicode_suffix = PyUnicode_Decode(
+            PyString_AS_STRING( suffix ),
+            PyString_GET_SIZE( suffix ),
+            NULL,
+            NULL
+        );
+
+        if (unlikely( unicode_suffix == NULL ))
+        {
+            Py_DECREF( rest_values );
+            return NULL;
+        }
+
+        rest = PyUnicode_Format( unicode_suffix, rest_values );
+        Py_DECREF( unicode_suffix );
+    }
+    else
+    {
+        rest = PyString_Format( suffix, rest_values );
+    }
+
+    Py_DECREF( rest_values );
+
+    if ( rest == NULL || size == 0 )
+    {
+        return rest;
+    }
+
+    PyObject *prefix = _JOIN_STRINGS( parts, 2 * done + 1, size );
+
+    if (unlikely( prefix == NULL ))
+    {
+        Py_DECREF( rest );
+        return NULL;
+    }
+
+    PyObject *result = PyNumber_Add( prefix, rest );
+
+    Py_DECREF( prefix );
+    Py_DECREF( rest );
+
+    return result;
+}
+
+// Format a string with a format that was parsed at compile time. The "pieces"
+// are the literal parts of the format, one more than there are conversions,
+// and the "suffixes" are the format starting with each conversion. Each one of
+// the "conversions" is 's', 'r', or 'd' and applies to the value at the same
+// position. Values that would make the result unicode, or that are not simple
+// for "%d", are left to the generic string formatting.
+NUITKA_MAY_BE_UNUSED static PyObject *STRING_FORMAT( PyObject *pieces, PyObject *suffixes, char const *conversions, PyObject *values )
+{
+    assertObject( pieces );
+    assertObject( suffixes );
+    assertObject( values );
+    assert( PyTuple_CheckExact( pieces ) );
+    assert( PyTuple_CheckExact( suffixes ) );
+    assert( PyTuple_CheckExact( values ) );
+
+    Py_ssize_t count = PyTuple_GET_SIZE( values );
+
+    assert( count <= NUITKA_STRING_FORMAT_MAX );
+    assert( PyTuple_GET_SIZE( pieces ) == count + 1 );
+    assert( PyTuple_GET_SIZE( suffixes ) == count );
+
+    PyObject *parts[ 2 * NUITKA_STRING_FORMAT_MAX + 1 ];
+    Py_ssize_t size = PyString_GET_SIZE( PyTuple_GET_ITEM( pieces, 0 ) );
+    Py_ssize_t i;
+
+    PyObject *result;
+
+    parts[ 0 ] = PyTuple_GET_ITEM( pieces, 0 );
+
+    for ( i = 0; i < count; i++ )
+    {
+        PyObject *value = PyTuple_GET_ITEM( values, i );
+        PyObject *converted;
+        bool as_unicode = false;
+
+        switch( conversions[ i ] )
+        {
+            case 's':
+                if ( PyString_CheckExact( value ) )
+                {
+                    converted = INCREASE_REFCOUNT( value );
+                }
+                else if ( PyUnicode_Check( value ) )
+                {
+                    converted = NULL;
+                    as_unicode = true;
+                }
+                else
+                {
+                    converted = _PyObject_Str( value );
+
+                    if (unlikely( converted == NULL ))
+                    {
+                        result = NULL;
+                        goto finish;
+                    }
+
+                    // The unicode formatting will call "__str__" again, just
+                    // like CPython does when it switches to unicode.
+                    if ( !PyString_Check( converted ) )
+                    {
+                        Py_DECREF( converted );
+                        converted = NULL;
+                        as_unicode = true;
+                    }
+                }
+                break;
+            case 'r':
+                converted = PyObject_Repr( value );
+
+                if (unlikely( converted == NULL ))
+                {
+                    result = NULL;
+                    goto finish;
+                }
+                break;
+            default:
+                assert( conversions[ i ] == 'd' );
+
+                if ( PyInt_CheckExact( value ) || PyLong_CheckExact( value ) )
+                {
+                    converted = PyObject_Str( value );
+
+                    if (unlikely( converted == NULL ))
+                    {
+                        result = NULL;
+                        goto finish;
+                    }
+                }
+                else
+                {
+                    converted = NULL;
+                }
+        }
+
+        if ( converted == NULL )
+        {
+            result = _STRING_FORMAT_REST( parts, i, size, suffixes, values, as_unicode );
+            goto finish;
+        }
+
+        parts[ 2 * i + 1 ] = converted;
+        parts[ 2 * i + 2 ] = PyTuple_GET_ITEM( pieces, i + 1 );
+
+        if (unlikely( size > PY_SSIZE_T_MAX - PyString_GET_SIZE( converted ) - PyString_GET_SIZE( parts[ 2 * i + 2 ] ) ))
+        {
+            PyErr_Format( PyExc_OverflowError, "formatted string is too long" );
+
+            i += 1;
+            result = NULL;
+            goto finish;
+        }
+
+        size += PyString_GET_SIZE( converted ) + PyString_GET_SIZE( parts[ 2 * i + 2 ] );
+    }
+
+    result = _JOIN_STRINGS( parts, 2 * count + 1, size );
+
+finish:
+    for ( Py_ssize_t j = 0; j < i; j++ )
+    {
+        Py_DECREF( parts[ 2 * j + 1 ] );
+    }
+
+    if (unlikely( result == NULL ))
+    {
+        throw PythonException();
+    }
+
+    return result;
+}
+
+#endif
+
+// Add "value" to the str or unicode object "*operand" by resizing it in place,
+// the way CPython does it for "s += t" on local variables. This is only done if
+// the caller holds the only reference. Returns 1 if done, 0 if the generic
+// operation has to be used, and -1 on errors. For str, "*operand" was then
+// released and set to NULL.
+NUITKA_MAY_BE_UNUSED static int STRING_ADD_INPLACE( PyObject **operand, PyObject *value )
+{
+    PyObject *object = *operand;
+
+    assertObject( object );
+    assertObject( value );
+
+    if ( Py_REFCNT( object ) != 1 )
+    {
+        return 0;
+    }
+
+#if PYTHON_VERSION < 300
+    if ( PyString_CheckExact( object ) && PyString_CheckExact( value ) && !PyString_CHECK_INTERNED( object ) )
+    {
+        Py_ssize_t size = PyString_GET_SIZE( object );
+        Py_ssize_t value_size = PyString_GET_SIZE( value );
+
+        if (unlikely( size > PY_SSIZE_T_MAX - value_size ))
+        {
+            return 0;
+        }
+
+        if (unlikely( _PyString_Resize( operand, size + value_size ) == -1 ))
+        {
+            return -1;
+        }
+
+        // The value may have been the object itself, which is now resized.
+        memcpy( PyString_AS_STRING( *operand ) + size, PyString_AS_STRING( value == object ? *operand : value ), value_size );
+
+        return 1;
+    }
+
+    if ( PyUnicode_CheckExact( object ) && PyUnicode_CheckExact( value ) )
+    {
+        Py_ssize_t size = PyUnicode_GET_SIZE( object );
+        Py_ssize_t value_size = PyUnicode_GET_SIZE( value );
+
+        if (unlikely( size > PY_SSIZE_T_MAX / (Py_ssize_t)sizeof( Py_UNICODE ) - 1 - value_size ))
+        {
+            return 0;
+        }
+
+        if (unlikely( PyUnicode_Resize( operand, size + value_size ) == -1 ))
+        {
+            return -1;
+        }
+
+        memcpy( PyUnicode_AS_UNICODE( *operand ) + size, PyUnicode_AS_UNICODE( value == object ? *operand : value ), value_size * sizeof( Py_UNICODE ) );
+
+        return 1;
+    }
+#endif
+
+    return 0;
+}
+
+#endif
@@ -179,6 +179,67 @@ NUITKA_MAY_BE_UNUSED static PyObject *LOOKUP_SUBSCRIPT( PyObject *source, PyObje
     return result;
 }
 
+// Look up a subscript, but return NULL with the "KeyError" set instead of
+// throwing it. Other exceptions are thrown. For dictionaries, the "KeyError" is
+// made directly.
+NUITKA_MAY_BE_UNUSED static PyObject *LOOKUP_SUBSCRIPT_OR_ERROR( PyObject *source, PyObject *subscript )
+{
+    assertObject( source );
+    assertObject( subscript );
+
+#if PYTHON_VERSION < 330
+    if ( PyDict_CheckExact( source ) )
+    {
+        long hash = PyObject_Hash( subscript );
+
+        if (unlikely( hash == -1 ))
+        {
+            throw PythonException();
+        }
+
+        PyDictObject *dict = (PyDictObject *)source;
+        PyDictEntry *entry = dict->ma_lookup( dict, subscript, hash );
+
+        if (unlikely( entry == NULL ))
+        {
+            throw PythonException();
+        }
+
+        if ( entry->me_value == NULL )
+        {
+            // Like "dict" does it, tuple keys are wrapped, or they would be
+            // taken as the arguments of the exception.
+            PyObject *key = PyTuple_Pack( 1, subscript );
+
+            if (unlikely( key == NULL ))
+            {
+                throw PythonException();
+            }
+
+            PyErr_SetObject( PyExc_KeyError, key );
+            Py_DECREF( key );
+
+            return NULL;
+        }
+
+        return INCREASE_REFCOUNT( entry->me_value );
+    }
+#endif
+
+    PyObject *result = PyObject_GetItem( source, subscript );
+
+    if ( result == NULL )
+    {
+        THROW_IF_ERROR_OCCURED_NOT_KEEP( PyExc_KeyError );
+    }
+    else
+    {
+        assertObject( result );
+    }
+
+    return result;
+}
+
 NUITKA_MAY_BE_UNUSED static void SET_SUBSCRIPT( PyObject *value, PyObject *target, PyObject *subscript )
 {
     assertObject( value );
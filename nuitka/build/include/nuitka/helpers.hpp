@@ -121,6 +121,7 @@ static char *_PyUnicode_AS_STRING( PyObject *unicode )
 #include "nuitka/helper/raising.hpp"
 
 #include "helper/operations.hpp"
+#include "nuitka/helper/strings.hpp"
 
 #include "nuitka/helper/richcomparisons.hpp"
 #include "nuitka/helper/sequences.hpp"
@@ -472,6 +473,39 @@ NUITKA_MAY_BE_UNUSED static PyObject *ITERATOR_NEXT( PyObject *iterator )
     return result;
 }
 
+// Return the next item of a value like "next" does, but NULL with the
+// "StopIteration" set instead of throwing it at the end of iteration.
+NUITKA_MAY_BE_UNUSED static PyObject *BUILTIN_NEXT1_OR_ERROR( PyObject *iterator )
+{
+    assertObject( iterator );
+
+    if (unlikely( !PyIter_Check( iterator ) ))
+    {
+        PyErr_Format( PyExc_TypeError, "%s object is not an iterator", Py_TYPE( iterator )->tp_name );
+        throw PythonException();
+    }
+
+    PyObject *result = (*Py_TYPE( iterator )->tp_iternext)( iterator );
+
+    if (unlikely( result == NULL ))
+    {
+        if ( ERROR_OCCURED() )
+        {
+            THROW_IF_ERROR_OCCURED_NOT_KEEP( PyExc_StopIteration );
+        }
+        else
+        {
+            PyErr_SetNone( PyExc_StopIteration );
+        }
+    }
+    else
+    {
+        assertObject( result );
+    }
+
+    return result;
+}
+
 NUITKA_MAY_BE_UNUSED static PyObject *BUILTIN_NEXT1( PyObject *iterator )
 {
     assertObject( iterator );
@@ -865,6 +899,27 @@ NUITKA_MAY_BE_UNUSED static PyObject *LOOKUP_ATTRIBUTE( PyObject *source, PyObje
     }
 }
 
+// Look up an attribute, but return NULL with the "AttributeError" set instead of
+// throwing it. Other exceptions are thrown.
+NUITKA_MAY_BE_UNUSED static PyObject *LOOKUP_ATTRIBUTE_OR_ERROR( PyObject *source, PyObject *attr_name )
+{
+    assertObject( source );
+    assertObject( attr_name );
+
+    PyObject *result = PyObject_GetAttr( source, attr_name );
+
+    if ( result == NULL )
+    {
+        THROW_IF_ERROR_OCCURED_NOT_KEEP( PyExc_AttributeError );
+    }
+    else
+    {
+        assertObject( result );
+    }
+
+    return result;
+}
+
 NUITKA_MAY_BE_UNUSED static bool HAS_ATTRIBUTE( PyObject *source, PyObject *attr_name )
 {
     assertObject( source );
@@ -1167,6 +1222,133 @@ NUITKA_MAY_BE_UNUSED static PyObject *LIST_COPY( PyObject *list )
     return result;
 }
 
+// Copy of a constant made from literal data, where the contained lists, dicts,
+// and sets must be new objects each time too. These are not shared inside the
+// constant, so unlike "copy.deepcopy", no memo is needed.
+NUITKA_MAY_BE_UNUSED static PyObject *DEEP_COPY( PyObject *value )
+{
+    assertObject( value );
+
+    if ( PyDict_CheckExact( value ) )
+    {
+        // Copied first, so the order is the same as for other dictionary
+        // constants. Replacing the values then does not change it.
+        PyObject *result = PyDict_Copy( value );
+
+        if (unlikely( result == NULL ))
+        {
+            throw PythonException();
+        }
+
+        Py_ssize_t pos = 0;
+        PyObject *key, *dict_value;
+
+        while ( PyDict_Next( value, &pos, &key, &dict_value ) )
+        {
+            PyObject *dict_value_copy = DEEP_COPY( dict_value );
+
+            int res = PyDict_SetItem( result, key, dict_value_copy );
+
+            Py_DECREF( dict_value_copy );
+
+            if (unlikely( res == -1 ))
+            {
+                Py_DECREF( result );
+                throw PythonException();
+            }
+        }
+
+        return result;
+    }
+    else if ( PyTuple_CheckExact( value ) )
+    {
+        Py_ssize_t size = PyTuple_GET_SIZE( value );
+
+        PyObject *result = PyTuple_New( size );
+
+        if (unlikely( result == NULL ))
+        {
+            throw PythonException();
+        }
+
+        for ( Py_ssize_t i = 0; i < size; i++ )
+        {
+            PyTuple_SET_ITEM( result, i, DEEP_COPY( PyTuple_GET_ITEM( value, i ) ) );
+        }
+
+        return result;
+    }
+    else if ( PyList_CheckExact( value ) )
+    {
+        Py_ssize_t size = PyList_GET_SIZE( value );
+
+        PyObject *result = PyList_New( size );
+
+        if (unlikely( result == NULL ))
+        {
+            throw PythonException();
+        }
+
+        for ( Py_ssize_t i = 0; i < size; i++ )
+        {
+            PyList_SET_ITEM( result, i, DEEP_COPY( PyList_GET_ITEM( value, i ) ) );
+        }
+
+        return result;
+    }
+    else if ( Py_TYPE( value ) == &PySet_Type )
+    {
+        // Set elements are hashable, and therefore not copied.
+        PyObject *result = PySet_New( value );
+
+        if (unlikely( result == NULL ))
+        {
+            throw PythonException();
+        }
+
+        return result;
+    }
+    else
+    {
+        return INCREASE_REFCOUNT( value );
+    }
+}
+
+// Create a dictionary from a constant tuple of keys and values alternating,
+// like a dictionary display does it. It is sized for all of them first, and
+// the keys are added in order, so the iteration order is the same as with
+// CPython, even with colliding keys.
+NUITKA_MAY_BE_UNUSED static PyObject *MAKE_DICT_FROM_ITEMS( PyObject *items )
+{
+    assertObject( items );
+
+    Py_ssize_t size = PyTuple_GET_SIZE( items );
+
+    PyObject *result = _PyDict_NewPresized( size / 2 );
+
+    if (unlikely( result == NULL ))
+    {
+        throw PythonException();
+    }
+
+    for ( Py_ssize_t i = 0; i < size; i += 2 )
+    {
+        PyObject *dict_value = DEEP_COPY( PyTuple_GET_ITEM( items, i + 1 ) );
+
+        int res = PyDict_SetItem( result, PyTuple_GET_ITEM( items, i ), dict_value );
+
+        Py_DECREF( dict_value );
+
+        if (unlikely( res == -1 ))
+        {
+            Py_DECREF( result );
+            throw PythonException();
+        }
+    }
+
+    return result;
+}
+
 
 // Compile source code given, pretending the file name was given.
 extern PyObject *COMPILE_CODE( PyObject *source_code, PyObject *file_name, PyObject *mode, int flags );
@@ -1273,18 +1455,45 @@ NUITKA_MAY_BE_UNUSED static PyObject *EVAL_CODE( PyObject *code, PyObject *globa
 
 #include "nuitka/importing.hpp"
 
-// For the constant loading:
-extern void UNSTREAM_INIT( void );
-extern PyObject *UNSTREAM_CONSTANT( char const *buffer, Py_ssize_t size );
-extern PyObject *UNSTREAM_STRING( char const *buffer, Py_ssize_t size, bool intern );
-extern PyObject *UNSTREAM_FLOAT( char const *buffer );
+// For the constant loading, the data comes from the blob of constants:
+extern "C" const unsigned char constant_bin[];
+
+extern PyObject *UNSTREAM_CONSTANT( unsigned char const *buffer, Py_ssize_t size );
+extern PyObject *UNSTREAM_STRING( unsigned char const *buffer, Py_ssize_t size, bool intern );
+extern PyObject *UNSTREAM_FLOAT( unsigned char const *buffer );
+
+// Give constants a reference count, that never drops to zero, and optionally
+// untrack them from the garbage collection, so it does not write to them.
+// Only to be used for constants that cannot be part of cycles.
+NUITKA_MAY_BE_UNUSED static void MAKE_CONSTANT_IMMORTAL( PyObject *constant, bool untrack )
+{
+    assertObject( constant );
+
+    Py_ssize_t immortal_refcount = PY_SSIZE_T_MAX / 4;
+
+    Py_REFCNT( constant ) += immortal_refcount;
+#ifdef Py_REF_DEBUG
+    _Py_RefTotal += immortal_refcount;
+#endif
+
+    if ( untrack && PyObject_IS_GC( constant ) && _PyObject_GC_IS_TRACKED( constant ) )
+    {
+        PyObject_GC_UnTrack( constant );
+    }
+}
 
 extern void enhancePythonTypes( void );
 
+#ifdef _NUITKA_SHARED_RUNTIME
+// Create the constants of the run time, when it is a shared library.
+extern void _initRuntimeConstants( void );
+#endif
+
 // Parse the command line parameters and provide it to sys module.
 extern void setCommandLineParameters( int argc, char *argv[] );
 
-// Replace inspect functions with ones that accept compiled types too.
+// Replace inspect functions with ones that accept compiled types too, once
+// the module is imported.
 extern void patchInspectModule( void );
 
 // Replace builtin functions with ones that accept compiled types too.
@@ -1399,6 +1608,14 @@ NUITKA_MAY_BE_UNUSED static PyObject *MODULE_NAME( PyObject *module )
 extern void _initPortableEnvironment( char *binary_path );
 #endif
 
+#ifdef _NUITKA_PORTABLE_SINGLE_FILE
+// The binary itself, which has the Python library archive appended.
+extern char const *getPayloadArchivePath( void );
+
+// Import from the archive appended to the binary, once Python is initialized.
+extern void registerPayloadImporter( void );
+#endif
+
 #include <nuitka/threading.hpp>
 
 #endif
@@ -75,6 +75,14 @@
 #define NUITKA_NO_RETURN
 #endif
 
+// For code that runs only once, and was split off from large functions, it is
+// not inlined again, and gcc optimizes cold functions for size.
+#ifdef __GNUC__
+#define NUITKA_COLD __attribute__((__noinline__, __cold__))
+#else
+#define NUITKA_COLD
+#endif
+
 NUITKA_MAY_BE_UNUSED static PyObject *_eval_globals_tmp;
 NUITKA_MAY_BE_UNUSED static PyObject *_eval_locals_tmp;
 
@@ -160,4 +168,8 @@ extern PyObject *_sentinel_value;
 
 #include "nuitka/compiled_frame.hpp"
 
+#include "nuitka/startup_trace.hpp"
+
+#include "nuitka/runtime_profile.hpp"
+
 #endif
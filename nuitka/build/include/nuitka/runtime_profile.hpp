@@ -0,0 +1,196 @@
+//     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+//
+//     Part of "Nuitka", an optimizing Python compiler that is compatible and
+//     integrates with CPython, but also works on its own.
+//
+//     Licensed under the Apache License, Version 2.0 (the "License");
+//     you may not use this file except in compliance with the License.
+//     You may obtain a copy of the License at
+//
+//        http://www.apache.org/licenses/LICENSE-2.0
+//
+//     Unless required by applicable law or agreed to in writing, software
+//     distributed under the License is distributed on an "AS IS" BASIS,
+//     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//     See the License for the specific language governing permissions and
+//     limitations under the License.
+//
+#ifndef __NUITKA_RUNTIME_PROFILE_H__
+#define __NUITKA_RUNTIME_PROFILE_H__
+
+// Profiling of compiled functions and generators, which do not call the
+// profile function of "sys.setprofile". This is compiled in with
+// "--profile-runtime" only, and writes a file for the "pstats" module at exit,
+// named by the environment variable "NUITKA_PROFILE_FILE", by default
+// "nuitka-<pid>.prof".
+
+#ifdef _NUITKA_PROFILE
+
+#if defined( _MSC_VER )
+#include <intrin.h>
+#define NUITKA_THREAD_LOCAL __declspec( thread )
+#else
+#define NUITKA_THREAD_LOCAL __thread
+#endif
+
+#if !defined( _MSC_VER ) && !( defined( __GNUC__ ) && ( defined( __x86_64__ ) || defined( __i386__ ) ) )
+#include <time.h>
+#endif
+
+typedef unsigned long long profile_ticks_t;
+
+// The time stamp counter where available, converted to seconds at exit only.
+NUITKA_MAY_BE_UNUSED static inline profile_ticks_t getProfileTicks( void )
+{
+#if defined( _MSC_VER )
+    return __rdtsc();
+#elif defined( __GNUC__ ) && ( defined( __x86_64__ ) || defined( __i386__ ) )
+    unsigned int low, high;
+
+    __asm__ __volatile__ ( "rdtsc" : "=a" (low), "=d" (high) );
+
+    return ( (profile_ticks_t)high << 32 ) | low;
+#else
+    struct timespec now;
+    clock_gettime( CLOCK_MONOTONIC, &now );
+
+    return (profile_ticks_t)now.tv_sec * 1000000000ULL + now.tv_nsec;
+#endif
+}
+
+struct NuitkaProfileEntry;
+
+// The calls of a function from one caller, the "pstats" has these too.
+struct NuitkaProfileEdge
+{
+    NuitkaProfileEntry *caller;
+
+    profile_ticks_t calls;
+    profile_ticks_t primitive_calls;
+    profile_ticks_t total_time;
+    profile_ticks_t cumulative_time;
+
+    NuitkaProfileEdge *next;
+};
+
+// The totals of a function, recursive calls are not primitive ones, and their
+// time only counts once for the cumulative time, as "cProfile" does it. Only
+// calls in the same thread are recursive ones.
+struct NuitkaProfileEntry
+{
+    PyCodeObject *code_object;
+
+    profile_ticks_t calls;
+    profile_ticks_t primitive_calls;
+    profile_ticks_t total_time;
+    profile_ticks_t cumulative_time;
+
+    NuitkaProfileEdge *callers;
+    NuitkaProfileEntry *next;
+};
+
+// The entry of a code object, created on first use.
+extern NuitkaProfileEntry *getProfileEntry( PyCodeObject *code_object );
+
+extern NuitkaProfileEdge *getProfileEdge( NuitkaProfileEntry *entry, NuitkaProfileEntry *caller );
+
+// Register the writing of the profile at exit.
+extern void startRuntimeProfile( void );
+
+class ProfileGuard;
+
+extern NUITKA_THREAD_LOCAL ProfileGuard *current_profile_guard;
+
+// Measures the time from its creation to its destruction, the time of the
+// guards created meanwhile is subtracted for the time spent in the function
+// itself.
+class ProfileGuard
+{
+public:
+    explicit ProfileGuard( NuitkaProfileEntry *entry )
+    {
+        this->entry = entry;
+        this->parent = current_profile_guard;
+        this->children_time = 0;
+
+        current_profile_guard = this;
+
+        // Recursive, if the function is already active in this thread.
+        this->primitive = true;
+
+        for ( ProfileGuard *guard = this->parent; guard != NULL; guard = guard->parent )
+        {
+            if ( guard->entry == entry )
+            {
+                this->primitive = false;
+                break;
+            }
+        }
+
+        this->start = getProfileTicks();
+    }
+
+    ~ProfileGuard()
+    {
+        profile_ticks_t elapsed = getProfileTicks() - this->start;
+        profile_ticks_t own_time = elapsed - this->children_time;
+
+        current_profile_guard = this->parent;
+
+        entry->calls += 1;
+        entry->total_time += own_time;
+
+        if ( this->primitive )
+        {
+            entry->primitive_calls += 1;
+            entry->cumulative_time += elapsed;
+        }
+
+        if ( this->parent )
+        {
+            this->parent->children_time += elapsed;
+        }
+
+        NuitkaProfileEdge *edge = getProfileEdge(
+            entry,
+            this->parent ? this->parent->entry : NULL
+        );
+
+        edge->calls += 1;
+        edge->total_time += own_time;
+
+        if ( this->primitive )
+        {
+            edge->primitive_calls += 1;
+            edge->cumulative_time += elapsed;
+        }
+    }
+
+private:
+
+    ProfileGuard( const ProfileGuard &other ) { assert( false ); }
+
+    NuitkaProfileEntry *entry;
+    ProfileGuard *parent;
+
+    bool primitive;
+
+    profile_ticks_t start;
+    profile_ticks_t children_time;
+};
+
+#define PROFILE_INIT() startRuntimeProfile()
+#define PROFILE_FUNCTION( code_object ) \
+    static NuitkaProfileEntry *_profile_entry = getProfileEntry( code_object ); \
+    ProfileGuard _profile_guard( _profile_entry )
+#define PROFILE_GENERATOR( code_object ) ProfileGuard _profile_guard( getProfileEntry( code_object ) )
+
+#else
+
+#define PROFILE_INIT()
+#define PROFILE_FUNCTION( code_object )
+#define PROFILE_GENERATOR( code_object )
+
+#endif
+
+#endif
@@ -0,0 +1,56 @@
+//     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+//
+//     Part of "Nuitka", an optimizing Python compiler that is compatible and
+//     integrates with CPython, but also works on its own.
+//
+//     Licensed under the Apache License, Version 2.0 (the "License");
+//     you may not use this file except in compliance with the License.
+//     You may obtain a copy of the License at
+//
+//        http://www.apache.org/licenses/LICENSE-2.0
+//
+//     Unless required by applicable law or agreed to in writing, software
+//     distributed under the License is distributed on an "AS IS" BASIS,
+//     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//     See the License for the specific language governing permissions and
+//     limitations under the License.
+//
+#ifndef __NUITKA_STARTUP_TRACE_H__
+#define __NUITKA_STARTUP_TRACE_H__
+
+// Timing of the startup phases and of the module initializations. This is
+// compiled in with "--startup-trace" only, and then reports to stderr, if the
+// environment variable "NUITKA_STARTUP_TRACE" is set at run time.
+
+#ifdef _NUITKA_STARTUP_TRACE
+
+// Report the time since the previous phase ended.
+extern void startupTracePhase( char const *phase );
+
+// Report the time a module initialization took, including the time of the
+// modules imported by it, when the object goes out of scope.
+class StartupTraceModule
+{
+public:
+    explicit StartupTraceModule( char const *module_name );
+    ~StartupTraceModule();
+
+private:
+
+    StartupTraceModule( const StartupTraceModule &other ) { assert( false ); }
+
+    char const *module_name;
+    double start;
+};
+
+#define STARTUP_TRACE_PHASE( phase ) startupTracePhase( phase )
+#define STARTUP_TRACE_MODULE( module_name ) StartupTraceModule _startup_trace_module( module_name )
+
+#else
+
+#define STARTUP_TRACE_PHASE( phase )
+#define STARTUP_TRACE_MODULE( module_name )
+
+#endif
+
+#endif
@@ -123,6 +123,25 @@ public:
         return INCREASE_REFCOUNT( this->asObject() );
     }
 
+    void inplaceAdd( PyObject *value )
+    {
+        int status = this->free_value ? STRING_ADD_INPLACE( &this->object, value ) : 0;
+
+        if ( status == 0 )
+        {
+            this->assign1( BINARY_OPERATION( PyNumber_InPlaceAdd, this->asObject(), value ) );
+        }
+        else if (unlikely( status == -1 ))
+        {
+            if ( this->object == NULL )
+            {
+                this->free_value = false;
+            }
+
+            throw PythonException();
+        }
+    }
+
     bool isInitialized() const
     {
         return this->object != NULL;
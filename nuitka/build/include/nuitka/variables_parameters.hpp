@@ -98,6 +98,20 @@ public:
         return INCREASE_REFCOUNT( this->asObject() );
     }
 
+    void inplaceAdd( PyObject *value )
+    {
+        int status = STRING_ADD_INPLACE( &this->object, value );
+
+        if ( status == 0 )
+        {
+            this->assign1( BINARY_OPERATION( PyNumber_InPlaceAdd, this->asObject(), value ) );
+        }
+        else if (unlikely( status == -1 ))
+        {
+            throw PythonException();
+        }
+    }
+
     bool isInitialized() const
     {
         return this->object != NULL;
@@ -63,6 +63,13 @@ public:
         this->object = object;
     }
 
+    void assign0( PyObject *object )
+    {
+        assertObject( object );
+
+        this->assign1( INCREASE_REFCOUNT( object ) );
+    }
+
 private:
 
     PyObjectTemporary( const PyObjectTemporary &object ) { assert( false ); }
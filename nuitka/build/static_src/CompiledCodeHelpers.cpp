@@ -915,55 +915,337 @@ void PRINT_NEW_LINE( void )
 
 #endif
 
-// We unstream some constant objects using the "cPickle" module function "loads"
-static PyObject *_module_cPickle = NULL;
-static PyObject *_module_cPickle_function_loads = NULL;
+// We unstream some constant objects from a format of our own, see "Streaming.py"
+// of the compiler for a description, these must match.
 
-void UNSTREAM_INIT()
+// The built-in type constants, in the order of "constant_builtin_types".
+static PyTypeObject *_unstream_types[] =
 {
 #if PYTHON_VERSION < 300
-    _module_cPickle = PyImport_ImportModule( "cPickle" );
+    &PyInt_Type,
 #else
-    _module_cPickle = PyImport_ImportModule( "pickle" );
+    &PyLong_Type,
 #endif
-    assert( _module_cPickle );
+    &PySet_Type,
+#if PYTHON_VERSION < 300
+    &PyString_Type,
+#else
+    &PyUnicode_Type,
+#endif
+    &PyFloat_Type,
+    &PyList_Type,
+    &PyTuple_Type,
+    &PyDict_Type,
+    &PyComplex_Type,
+#if PYTHON_VERSION < 300
+    &PyUnicode_Type,
+    &PyLong_Type,
+    &PyInstance_Type
+#else
+    &PyRange_Type,
+    &PyBytes_Type
+#endif
+};
 
-    _module_cPickle_function_loads = PyObject_GetAttrString( _module_cPickle, "loads" );
-    assert( _module_cPickle_function_loads );
+static size_t _unstreamSize( unsigned char const *&buffer )
+{
+    size_t result = 0;
+    int shift = 0;
+
+    while( true )
+    {
+        unsigned char c = *buffer++;
+
+        result |= (size_t)( c & 0x7f ) << shift;
+
+        if ( ( c & 0x80 ) == 0 )
+        {
+            return result;
+        }
+
+        shift += 7;
+    }
 }
 
-PyObject *UNSTREAM_CONSTANT( char const *buffer, Py_ssize_t size )
+static PyObject *_unstreamValue( unsigned char const *&buffer, PyObject **memo, Py_ssize_t &memo_count );
+
+static PyObject *_unstreamTuple( unsigned char const *&buffer, PyObject **memo, Py_ssize_t &memo_count )
 {
-    assert( buffer );
-    assert( _module_cPickle_function_loads );
+    Py_ssize_t size = _unstreamSize( buffer );
+
+    PyObject *result = PyTuple_New( size );
+    assertObject( result );
+
+    for ( Py_ssize_t i = 0; i < size; i++ )
+    {
+        PyTuple_SET_ITEM( result, i, _unstreamValue( buffer, memo, memo_count ) );
+    }
+
+    return result;
+}
+
+static PyObject *_unstreamValue( unsigned char const *&buffer, PyObject **memo, Py_ssize_t &memo_count )
+{
+    PyObject *result;
+
+    switch( *buffer++ )
+    {
+        case 'N':
+            return INCREASE_REFCOUNT( Py_None );
+        case 'T':
+            return INCREASE_REFCOUNT( Py_True );
+        case 'F':
+            return INCREASE_REFCOUNT( Py_False );
+        case 'E':
+            return INCREASE_REFCOUNT( Py_Ellipsis );
+        case 'M':
+        {
+            Py_ssize_t index = _unstreamSize( buffer );
+            assert( index < memo_count );
+
+            return INCREASE_REFCOUNT( memo[ index ] );
+        }
+        case 'i':
+        {
+            size_t value = _unstreamSize( buffer );
+
+            // Signed values are stored "zig-zag" encoded.
+            long signed_value = (long)( value >> 1 );
+
+            if ( value & 1 )
+            {
+                signed_value = -signed_value - 1;
+            }
 
-    PyObject *result = PyObject_CallFunction(
-        _module_cPickle_function_loads,
 #if PYTHON_VERSION < 300
-        (char *)"(s#)", // TODO: Why the ()
+            result = PyInt_FromLong( signed_value );
 #else
-        (char *)"y#",
+            result = PyLong_FromLong( signed_value );
 #endif
-        buffer,
-        size
-    );
+            assertObject( result );
+
+            // Not remembered.
+            return result;
+        }
+        case 'l':
+        case 'm':
+        {
+            bool negative = buffer[-1] == 'm';
+            Py_ssize_t size = _unstreamSize( buffer );
+
+            result = _PyLong_FromByteArray( buffer, size, 1, 0 );
+            assertObject( result );
+
+            buffer += size;
+
+            if ( negative )
+            {
+                PyObject *positive = result;
+
+                result = PyNumber_Negative( positive );
+                assertObject( result );
+
+                Py_DECREF( positive );
+            }
+
+            break;
+        }
+        case 's':
+        {
+            Py_ssize_t size = _unstreamSize( buffer );
+
+#if PYTHON_VERSION < 300
+            result = PyString_FromStringAndSize( (char const *)buffer, size );
+#else
+            result = PyBytes_FromStringAndSize( (char const *)buffer, size );
+#endif
+            assertObject( result );
+
+            buffer += size;
+
+            break;
+        }
+        case 'u':
+        {
+            Py_ssize_t size = _unstreamSize( buffer );
+
+#if PYTHON_VERSION < 300
+            result = PyUnicode_DecodeUTF8( (char const *)buffer, size, NULL );
+#else
+            result = PyUnicode_DecodeUTF8( (char const *)buffer, size, "surrogatepass" );
+#endif
+            assertObject( result );
+
+            buffer += size;
+
+            break;
+        }
+        case 'f':
+        {
+            result = PyFloat_FromDouble( _PyFloat_Unpack8( buffer, 0 ) );
+            assertObject( result );
+
+            buffer += 8;
+
+            break;
+        }
+        case 'j':
+        {
+            double real = _PyFloat_Unpack8( buffer, 0 );
+            double imag = _PyFloat_Unpack8( buffer + 8, 0 );
 
-    if ( !result )
+            result = PyComplex_FromDoubles( real, imag );
+            assertObject( result );
+
+            buffer += 16;
+
+            break;
+        }
+        case 't':
+        {
+            result = _unstreamTuple( buffer, memo, memo_count );
+
+            break;
+        }
+        case 'a':
+        {
+            // Not remembered, because it has mutable elements.
+            return _unstreamTuple( buffer, memo, memo_count );
+        }
+        case 'z':
+        {
+            PyObject *elements = _unstreamTuple( buffer, memo, memo_count );
+
+            result = PyFrozenSet_New( elements );
+            assertObject( result );
+
+            Py_DECREF( elements );
+
+            break;
+        }
+        case 'L':
+        {
+            Py_ssize_t size = _unstreamSize( buffer );
+
+            result = PyList_New( size );
+            assertObject( result );
+
+            for ( Py_ssize_t i = 0; i < size; i++ )
+            {
+                PyList_SET_ITEM( result, i, _unstreamValue( buffer, memo, memo_count ) );
+            }
+
+            // Not remembered, because mutable.
+            return result;
+        }
+        case 'S':
+        {
+            Py_ssize_t size = _unstreamSize( buffer );
+
+            result = PySet_New( NULL );
+            assertObject( result );
+
+            for ( Py_ssize_t i = 0; i < size; i++ )
+            {
+                PyObject *element = _unstreamValue( buffer, memo, memo_count );
+
+                int res = PySet_Add( result, element );
+                assert( res == 0 );
+
+                Py_DECREF( element );
+            }
+
+            return result;
+        }
+        case 'd':
+        {
+            Py_ssize_t size = _unstreamSize( buffer );
+
+            result = PyDict_New();
+            assertObject( result );
+
+            for ( Py_ssize_t i = 0; i < size; i++ )
+            {
+                PyObject *key = _unstreamValue( buffer, memo, memo_count );
+                PyObject *value = _unstreamValue( buffer, memo, memo_count );
+
+                int res = PyDict_SetItem( result, key, value );
+                assert( res == 0 );
+
+                Py_DECREF( key );
+                Py_DECREF( value );
+            }
+
+            return result;
+        }
+#if PYTHON_VERSION >= 300
+        case 'r':
+        {
+            PyObject *args = _unstreamTuple( buffer, memo, memo_count );
+
+            result = PyObject_CallObject( (PyObject *)&PyRange_Type, args );
+            assertObject( result );
+
+            Py_DECREF( args );
+
+            return result;
+        }
+#endif
+        case 'y':
+        {
+            size_t index = _unstreamSize( buffer );
+            assert( index < sizeof( _unstream_types ) / sizeof( _unstream_types[ 0 ] ) );
+
+            return INCREASE_REFCOUNT( (PyObject *)_unstream_types[ index ] );
+        }
+        default:
+            assert( false );
+            return NULL;
+    }
+
+    // Immutable values are remembered, later ones may refer to them.
+    memo[ memo_count++ ] = result;
+
+    return result;
+}
+
+PyObject *UNSTREAM_CONSTANT( unsigned char const *buffer, Py_ssize_t size )
+{
+    assert( buffer );
+
+    unsigned char const *current = buffer;
+
+    Py_ssize_t memo_size = _unstreamSize( current );
+
+    // Borrowed references only, the values are owned by their containers.
+    PyObject *memo_buffer[ 32 ];
+    PyObject **memo = memo_size <= 32 ? memo_buffer : (PyObject **)PyMem_Malloc( memo_size * sizeof( PyObject * ) );
+    assert( memo );
+
+    Py_ssize_t memo_count = 0;
+
+    PyObject *result = _unstreamValue( current, memo, memo_count );
+
+    assert( memo_count == memo_size );
+    assert( current == buffer + size );
+
+    if ( memo != memo_buffer )
     {
-        PyErr_Print();
+        PyMem_Free( memo );
     }
 
     assertObject( result );
+    assert( !ERROR_OCCURED() );
 
     return result;
 }
 
-PyObject *UNSTREAM_STRING( char const *buffer, Py_ssize_t size, bool intern )
+PyObject *UNSTREAM_STRING( unsigned char const *buffer, Py_ssize_t size, bool intern )
 {
 #if PYTHON_VERSION < 300
-    PyObject *result = PyString_FromStringAndSize( buffer, size );
+    PyObject *result = PyString_FromStringAndSize( (char const *)buffer, size );
 #else
-    PyObject *result = PyUnicode_FromStringAndSize( buffer, size );
+    PyObject *result = PyUnicode_FromStringAndSize( (char const *)buffer, size );
 #endif
 
     assert( !ERROR_OCCURED() );
@@ -991,9 +1273,9 @@ PyObject *UNSTREAM_STRING( char const *buffer, Py_ssize_t size, bool intern )
     return result;
 }
 
-PyObject *UNSTREAM_FLOAT( char const *buffer )
+PyObject *UNSTREAM_FLOAT( unsigned char const *buffer )
 {
-    double x = _PyFloat_Unpack8( (unsigned char *)buffer, 0 );
+    double x = _PyFloat_Unpack8( buffer, 0 );
     assert( x != -1.0 || !PyErr_Occurred() );
 
     PyObject *result = PyFloat_FromDouble(x);
@@ -1649,7 +1931,12 @@ void _initPortableEnvironment( char *binary_path )
 {
     // setup environ
     // orignal_value;binary_directory/_python;binary_directory/_python.zip
+#ifdef _NUITKA_PORTABLE_SINGLE_FILE
+    // Found without searching "PATH" for it.
+    char *binary_directory = getBinaryDirectory( (char *)getPayloadArchivePath() );
+#else
     char *binary_directory = getBinaryDirectory( binary_path );
+#endif
     if ( !binary_directory )
         abort();
 
@@ -1661,6 +1948,12 @@ void _initPortableEnvironment( char *binary_path )
 
     // get insert value
     size_t insert_size = strlen( binary_directory ) * 2 + 50;
+#ifdef _NUITKA_PORTABLE_SINGLE_FILE
+    // The library archive is appended to the binary, "zipimport" can use it
+    // from there, until the payload importer is registered.
+    char const *archive_path = getPayloadArchivePath();
+    insert_size += strlen( archive_path );
+#endif
     char *insert_path = (char *) malloc( insert_size );
     memset( insert_path, 0, insert_size );
 #if defined( _WIN32 )
@@ -1668,10 +1961,14 @@ void _initPortableEnvironment( char *binary_path )
 #else
     char env_string[] = "%s/%s:%s/%s:";
 #endif
+#ifdef _NUITKA_PORTABLE_SINGLE_FILE
+    snprintf( insert_path, insert_size, "%s:", archive_path );
+#else
     snprintf( insert_path, insert_size, env_string,
         binary_directory, "_python",
         binary_directory, "_python.zip"
     );
+#endif
 
     // set environment
     size_t python_home_size = orignal_home_size + insert_size;
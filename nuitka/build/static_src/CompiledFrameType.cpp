@@ -470,9 +470,14 @@ static PyFrameObject *duplicateFrame( PyFrameObject *old_frame )
 {
     PyFrameObject *new_frame = PyObject_GC_NewVar( PyFrameObject, &PyFrame_Type, 0 );
 
+#ifdef _NUITKA_TRACE_HOOKS
+    // Keep tracing the frame, if the trace function asked for it.
+    new_frame->f_trace = INCREASE_REFCOUNT_X( old_frame->f_trace );
+#else
     // Allow only to detach only our tracing frames.
     assert( old_frame->f_trace == Py_None );
     new_frame->f_trace = INCREASE_REFCOUNT( Py_None );
+#endif
 
     // Copy the back reference if any.
     new_frame->f_back = old_frame->f_back;
@@ -96,12 +96,23 @@ static PyObject *Nuitka_Generator_send( Nuitka_GeneratorObject *generator, PyObj
             generator->m_frame->f_back = return_frame;
 
             thread_state->frame = generator->m_frame;
+
+#ifdef _NUITKA_TRACE_HOOKS
+            // Each resumption is a call for the hooks, the first run is given
+            // to them by the frame guard, as only it creates the frame.
+            callTraceHooks( generator->m_frame, PyTrace_CALL, Py_None );
+#endif
         }
 
         // Continue the yielder function while preventing recursion.
         generator->m_running = true;
 
-        swapFiber( &generator->m_caller_context, &generator->m_yielder_context );
+        {
+            // Each resumption counts as a call, like for uncompiled generators.
+            PROFILE_GENERATOR( generator->m_code_object );
+
+            swapFiber( &generator->m_caller_context, &generator->m_yielder_context );
+        }
 
         generator->m_running = false;
 
@@ -111,6 +122,21 @@ static PyObject *Nuitka_Generator_send( Nuitka_GeneratorObject *generator, PyObj
         assert( thread_state->frame == generator->m_frame );
         assertFrameObject( generator->m_frame );
 
+#ifdef _NUITKA_TRACE_HOOKS
+        // Yielding returns a value, finishing returns None, unless it is by an
+        // exception.
+        callTraceHooks(
+            generator->m_frame,
+            PyTrace_RETURN,
+            generator->m_yielded != NULL ? generator->m_yielded : ( PyErr_ExceptionMatches( PyExc_StopIteration ) ? Py_None : NULL )
+        );
+
+        if ( generator->m_yielded == NULL )
+        {
+            resetFrameTrace( generator->m_frame );
+        }
+#endif
+
         thread_state->frame = return_frame;
         Py_CLEAR( generator->m_frame->f_back );
 
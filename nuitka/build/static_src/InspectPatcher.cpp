@@ -18,10 +18,7 @@
 
 #include "nuitka/prelude.hpp"
 
-extern PyObject *_python_str_plain_inspect;
-extern PyObject *_python_int_0;
-
-static PyObject *module_inspect;
+static PyObject *module_inspect = NULL;
 
 static char *kwlist[] = { (char *)"object", NULL };
 
@@ -191,9 +188,8 @@ static PyMethodDef _method_def_inspect_getgeneratorstate_replacement =
 };
 #endif
 
-void patchInspectModule( void )
+static void _patchInspectModule( void )
 {
-    module_inspect = IMPORT_MODULE( _python_str_plain_inspect, Py_None, Py_None, _python_tuple_empty, _python_int_0 );
     assertObject( module_inspect );
 
     // Patch "inspect.isfunction" unless it is already patched.
@@ -268,6 +264,148 @@ void patchInspectModule( void )
 
 }
 
+// The meta path hook, that waits for "inspect" to be imported.
+static PyObject *inspect_patcher = NULL;
+
+static void _removeInspectPatcher( void )
+{
+    PyObject *meta_path = PySys_GetObject( (char *)"meta_path" );
+
+    Py_ssize_t index = meta_path ? PySequence_Index( meta_path, inspect_patcher ) : -1;
+
+    if ( index >= 0 )
+    {
+        PySequence_DelItem( meta_path, index );
+    }
+    else
+    {
+        PyErr_Clear();
+    }
+}
+
+static char *_kwlist_patcher[] = { (char *)"fullname", (char *)"unused", NULL };
+
+static PyObject *_inspect_patcher_find_module( PyObject *self, PyObject *args, PyObject *kwds )
+{
+    PyObject *module_name;
+    PyObject *unused;
+
+    if ( !PyArg_ParseTupleAndKeywords( args, kwds, "O|O:find_module", _kwlist_patcher, &module_name, &unused ))
+    {
+        return NULL;
+    }
+
+    if ( strcmp( Nuitka_String_AsString( module_name ), "inspect" ) != 0 )
+    {
+        return INCREASE_REFCOUNT( Py_None );
+    }
+
+    // Not needed anymore, and must not be asked again for the import below.
+    _removeInspectPatcher();
+
+    module_inspect = PyImport_ImportModule( "inspect" );
+
+    if (unlikely( module_inspect == NULL ))
+    {
+        return NULL;
+    }
+
+    _patchInspectModule();
+
+    // Loading is then only giving the module that was imported already.
+    return INCREASE_REFCOUNT( inspect_patcher );
+}
+
+static PyObject *_inspect_patcher_load_module( PyObject *self, PyObject *args, PyObject *kwds )
+{
+    PyObject *module_name;
+    PyObject *unused;
+
+    if ( !PyArg_ParseTupleAndKeywords( args, kwds, "O|O:load_module", _kwlist_patcher, &module_name, &unused ))
+    {
+        return NULL;
+    }
+
+    return INCREASE_REFCOUNT( module_inspect );
+}
+
+static PyMethodDef _method_def_inspect_patcher_find_module =
+{
+    "find_module",
+    (PyCFunction)_inspect_patcher_find_module,
+    METH_VARARGS | METH_KEYWORDS,
+    NULL
+};
+
+static PyMethodDef _method_def_inspect_patcher_load_module =
+{
+    "load_module",
+    (PyCFunction)_inspect_patcher_load_module,
+    METH_VARARGS | METH_KEYWORDS,
+    NULL
+};
+
+// Importing "inspect" takes a lot of time at startup, so it is only patched
+// once it is imported, which a meta path hook notices. If it is imported
+// already, patch it right away.
+void patchInspectModule( void )
+{
+    PyObject *sys_modules = PySys_GetObject( (char *)"modules" );
+    assertObject( sys_modules );
+
+    PyObject *module = PyDict_GetItemString( sys_modules, "inspect" );
+
+    if ( module != NULL )
+    {
+        if ( inspect_patcher != NULL )
+        {
+            _removeInspectPatcher();
+        }
+
+        if ( module_inspect == NULL )
+        {
+            module_inspect = INCREASE_REFCOUNT( module );
+
+            _patchInspectModule();
+        }
+
+        return;
+    }
+
+    if ( inspect_patcher != NULL )
+    {
+        return;
+    }
+
+    PyObject *method_dict = PyDict_New();
+    assertObject( method_dict );
+
+    PyObject *patcher_find_module = PyCFunction_New( &_method_def_inspect_patcher_find_module, NULL );
+    assertObject( patcher_find_module );
+    PyDict_SetItemString( method_dict, "find_module", patcher_find_module );
+
+    PyObject *patcher_load_module = PyCFunction_New( &_method_def_inspect_patcher_load_module, NULL );
+    assertObject( patcher_load_module );
+    PyDict_SetItemString( method_dict, "load_module", patcher_load_module );
+
+    inspect_patcher = PyObject_CallFunctionObjArgs(
+        (PyObject *)&PyType_Type,
+#if PYTHON_VERSION < 300
+        PyString_FromString( "_nuitka_inspect_patcher" ),
+#else
+        PyUnicode_FromString( "_nuitka_inspect_patcher" ),
+#endif
+        _python_tuple_empty,
+        method_dict,
+        NULL
+    );
+
+    assertObject( inspect_patcher );
+
+    int res = PyList_Insert( PySys_GetObject( (char *)"meta_path" ), 0, inspect_patcher );
+    assert( res == 0 );
+}
+
 extern int Nuitka_IsInstance( PyObject *inst, PyObject *cls );
 
 static PyObject *_builtin_isinstance_replacement( PyObject *self, PyObject *args )
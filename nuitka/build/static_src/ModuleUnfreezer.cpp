@@ -28,6 +28,83 @@ PyObject *loader_frozen_modules = NULL;
 
 static struct _inittab *frozen_modules = NULL;
 
+// Hash table of the frozen modules by name, with open addressing. The size is a
+// power of two and at least twice the number of modules, so there are always
+// empty slots, which end the search for names that are not frozen modules.
+static struct _inittab **frozen_modules_table = NULL;
+static size_t frozen_modules_table_mask = 0;
+
+static size_t _hashModuleName( char const *name )
+{
+    // FNV-1a, good enough for the short dotted names of modules.
+    size_t result = 2166136261U;
+
+    while ( *name )
+    {
+        result ^= (unsigned char)*name++;
+        result *= 16777619U;
+    }
+
+    return result;
+}
+
+static void _initFrozenModulesTable( void )
+{
+    size_t count = 0;
+
+    for ( struct _inittab *current = frozen_modules; current->name != NULL; current++ )
+    {
+        count += 1;
+    }
+
+    size_t size = 8;
+
+    while ( size < 2 * count )
+    {
+        size *= 2;
+    }
+
+    frozen_modules_table = (struct _inittab **)PyMem_Malloc( size * sizeof( struct _inittab * ) );
+    assert( frozen_modules_table );
+
+    memset( frozen_modules_table, 0, size * sizeof( struct _inittab * ) );
+    frozen_modules_table_mask = size - 1;
+
+    for ( struct _inittab *current = frozen_modules; current->name != NULL; current++ )
+    {
+        size_t index = _hashModuleName( current->name ) & frozen_modules_table_mask;
+
+        while ( frozen_modules_table[ index ] != NULL )
+        {
+            index = ( index + 1 ) & frozen_modules_table_mask;
+        }
+
+        frozen_modules_table[ index ] = current;
+    }
+}
+
+static struct _inittab *_findFrozenModule( char const *name )
+{
+    size_t index = _hashModuleName( name ) & frozen_modules_table_mask;
+
+    for (;;)
+    {
+        struct _inittab *current = frozen_modules_table[ index ];
+
+        if ( current == NULL )
+        {
+            return NULL;
+        }
+
+        if ( strcmp( name, current->name ) == 0 )
+        {
+            return current;
+        }
+
+        index = ( index + 1 ) & frozen_modules_table_mask;
+    }
+}
+
 static char *_kwlist[] = { (char *)"fullname", (char *)"unused", NULL };
 
 static PyObject *_path_unfreezer_find_module( PyObject *self, PyObject *args, PyObject *kwds )
@@ -55,16 +132,9 @@ static PyObject *_path_unfreezer_find_module( PyObject *self, PyObject *args, Py
     printf( "Looking for module '%s'...\n", name );
 #endif
 
-    struct _inittab *current = frozen_modules;
-
-    while ( current->name != NULL )
+    if ( _findFrozenModule( name ) != NULL )
     {
-       if ( strcmp( name, current->name ) == 0 )
-       {
-           return INCREASE_REFCOUNT( loader_frozen_modules );
-       }
-
-       current++;
+        return INCREASE_REFCOUNT( loader_frozen_modules );
     }
 
 #if _DEBUG_UNFREEZER
@@ -98,43 +168,45 @@ static PyObject *_path_unfreezer_load_module( PyObject *self, PyObject *args, Py
 
     char *name = Nuitka_String_AsString( module_name );
 
-    struct _inittab *current = frozen_modules;
+    struct _inittab *current = _findFrozenModule( name );
 
-    while ( current->name != NULL )
+    if ( current == NULL )
     {
-       if ( strcmp( name, current->name ) == 0 )
-       {
+        assert( false );
+
+        return INCREASE_REFCOUNT( Py_None );
+    }
+
 #if _DEBUG_UNFREEZER
-           printf( "Loading %s\n", name );
+    printf( "Loading %s\n", name );
 #endif
 
-           // Check prelude on why this is necessary.
+    // Check prelude on why this is necessary.
 #if PYTHON_VERSION < 300
-           current->python_initfunc();
+    current->python_initfunc();
 #else
-           current->initfunc();
+    current->initfunc();
 #endif
 
-           if (unlikely( ERROR_OCCURED() ))
-           {
-               return NULL;
-           }
+    if (unlikely( ERROR_OCCURED() ))
+    {
+        return NULL;
+    }
 
-           PyObject *sys_modules = PySys_GetObject( (char *)"modules" );
+    PyObject *sys_modules = PySys_GetObject( (char *)"modules" );
 
 #if _DEBUG_UNFREEZER
-           printf( "Loaded %s\n", name );
+    printf( "Loaded %s\n", name );
 #endif
 
-           return LOOKUP_SUBSCRIPT( sys_modules, module_name );
-       }
-
-       current++;
+    // This loader is before the hook that waits for "inspect" to be imported,
+    // so in case it is included, patch it here.
+    if ( strcmp( name, "inspect" ) == 0 )
+    {
+        patchInspectModule();
     }
 
-    assert( false );
-
-    return INCREASE_REFCOUNT( Py_None );
+    return LOOKUP_SUBSCRIPT( sys_modules, module_name );
 }
 
 
@@ -165,6 +237,7 @@ void registerMetaPathBasedUnfreezer( struct _inittab *_frozen_modules )
     }
 
     frozen_modules = _frozen_modules;
+    _initFrozenModulesTable();
 
     // Register the initialization functions for modules included in the traditional way.
     int res = PyImport_ExtendInittab( _frozen_modules );
@@ -0,0 +1,671 @@
+//     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+//
+//     Part of "Nuitka", an optimizing Python compiler that is compatible and
+//     integrates with CPython, but also works on its own.
+//
+//     Licensed under the Apache License, Version 2.0 (the "License");
+//     you may not use this file except in compliance with the License.
+//     You may obtain a copy of the License at
+//
+//        http://www.apache.org/licenses/LICENSE-2.0
+//
+//     Unless required by applicable law or agreed to in writing, software
+//     distributed under the License is distributed on an "AS IS" BASIS,
+//     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//     See the License for the specific language governing permissions and
+//     limitations under the License.
+//
+// Importer for the payload of single file portable binaries. The Python library
+// archive is appended to the binary as a zip file without compression. The
+// binary is memory mapped, and byte code is unmarshalled from the mapping
+// directly, without reading or copying files. Extension modules are extracted
+// into a cache directory, because the dynamic loader needs files for them.
+//
+// During "Py_Initialize", the archive is used by "zipimport" as the first
+// entry of "sys.path", afterwards this importer takes over.
+
+#include "nuitka/prelude.hpp"
+
+#include "marshal.h"
+
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <dlfcn.h>
+#include <errno.h>
+#include <limits.h>
+
+// Sub-directory of the archive with extension modules and the Python library.
+#define PAYLOAD_DLL_DIR "_python/"
+
+#if PYTHON_VERSION < 330
+#define PAYLOAD_PYC_HEADER_SIZE 8
+#else
+#define PAYLOAD_PYC_HEADER_SIZE 12
+#endif
+
+struct PayloadEntry
+{
+    unsigned char const *data;
+    size_t size;
+};
+
+static char payload_path[ PATH_MAX + 1 ];
+
+static unsigned char const *payload_data = NULL;
+static size_t payload_size = 0;
+
+// The entries of the archive, and a dictionary of their names to the index.
+static struct PayloadEntry *payload_entries = NULL;
+static PyObject *payload_index = NULL;
+
+// Identifies the archive contents for the extraction cache, derived from its
+// central directory, which has names, sizes and checksums of all entries.
+static unsigned long long payload_hash = 0;
+
+static PyObject *loader_payload = NULL;
+
+static unsigned int _readUInt16( unsigned char const *data )
+{
+    return data[0] | ( data[1] << 8 );
+}
+
+static unsigned int _readUInt32( unsigned char const *data )
+{
+    return data[0] | ( data[1] << 8 ) | ( data[2] << 16 ) | ( (unsigned int)data[3] << 24 );
+}
+
+char const *getPayloadArchivePath( void )
+{
+    if ( payload_path[0] == 0 )
+    {
+        ssize_t res = readlink( "/proc/self/exe", payload_path, PATH_MAX );
+
+        if ( res <= 0 )
+        {
+            fprintf( stderr, "getPayloadArchivePath: cannot find binary\n" );
+            abort();
+        }
+
+        payload_path[ res ] = 0;
+    }
+
+    return payload_path;
+}
+
+static bool _mapPayload( void )
+{
+    int fd = open( getPayloadArchivePath(), O_RDONLY );
+
+    if ( fd == -1 )
+    {
+        return false;
+    }
+
+    struct stat stat_buffer;
+
+    if ( fstat( fd, &stat_buffer ) == -1 )
+    {
+        close( fd );
+        return false;
+    }
+
+    void *mapping = mmap( NULL, stat_buffer.st_size, PROT_READ, MAP_PRIVATE, fd, 0 );
+    close( fd );
+
+    if ( mapping == MAP_FAILED )
+    {
+        return false;
+    }
+
+    payload_data = (unsigned char const *)mapping;
+    payload_size = stat_buffer.st_size;
+
+    return true;
+}
+
+// Read the central directory of the archive. The offsets in it are relative to
+// the start of the archive, which is after the binary.
+static bool _readPayloadDirectory( void )
+{
+    if ( payload_size < 22 )
+    {
+        return false;
+    }
+
+    unsigned char const *end_record = payload_data + payload_size - 22;
+
+    if ( _readUInt32( end_record ) != 0x06054b50 )
+    {
+        return false;
+    }
+
+    size_t count = _readUInt16( end_record + 10 );
+    size_t directory_size = _readUInt32( end_record + 12 );
+    size_t directory_offset = _readUInt32( end_record + 16 );
+
+    if ( directory_size + directory_offset > payload_size - 22 )
+    {
+        return false;
+    }
+
+    unsigned char const *directory = end_record - directory_size;
+    unsigned char const *archive = directory - directory_offset;
+
+    payload_hash = 14695981039346656037ULL;
+
+    for ( size_t i = 0; i < directory_size; i++ )
+    {
+        payload_hash ^= directory[ i ];
+        payload_hash *= 1099511628211ULL;
+    }
+
+    payload_entries = (struct PayloadEntry *)PyMem_Malloc( count * sizeof( struct PayloadEntry ) );
+    payload_index = PyDict_New();
+
+    unsigned char const *current = directory;
+
+    for ( size_t i = 0; i < count; i++ )
+    {
+        if ( _readUInt32( current ) != 0x02014b50 )
+        {
+            return false;
+        }
+
+        unsigned int method = _readUInt16( current + 10 );
+        size_t size = _readUInt32( current + 20 );
+        size_t name_length = _readUInt16( current + 28 );
+        size_t extra_length = _readUInt16( current + 30 );
+        size_t comment_length = _readUInt16( current + 32 );
+        unsigned char const *header = archive + _readUInt32( current + 42 );
+
+        // Only stored entries can be used in place, others are left to
+        // "zipimport".
+        if ( method == 0 && _readUInt32( header ) == 0x04034b50 )
+        {
+            payload_entries[ i ].data = header + 30 + _readUInt16( header + 26 ) + _readUInt16( header + 28 );
+            payload_entries[ i ].size = size;
+
+#if PYTHON_VERSION < 300
+            PyObject *name = PyString_FromStringAndSize( (char const *)current + 46, name_length );
+#else
+            PyObject *name = PyUnicode_FromStringAndSize( (char const *)current + 46, name_length );
+#endif
+            PyObject *index = PyInt_FromSsize_t( i );
+
+            PyDict_SetItem( payload_index, name, index );
+
+            Py_DECREF( name );
+            Py_DECREF( index );
+        }
+
+        current += 46 + name_length + extra_length + comment_length;
+    }
+
+    return true;
+}
+
+static struct PayloadEntry *_findPayloadEntry( char const *format, char const *name )
+{
+    // Module names are dotted, archive names use slashes.
+    char module_path[ PATH_MAX + 1 ];
+
+    strncpy( module_path, name, PATH_MAX );
+    module_path[ PATH_MAX ] = 0;
+
+    for ( char *c = module_path; *c; c++ )
+    {
+        if ( *c == '.' )
+        {
+            *c = '/';
+        }
+    }
+
+    char entry_name[ PATH_MAX + 1 ];
+    snprintf( entry_name, sizeof( entry_name ), format, module_path );
+
+    PyObject *index = PyDict_GetItemString( payload_index, entry_name );
+
+    if ( index == NULL )
+    {
+        return NULL;
+    }
+
+    return &payload_entries[ PyInt_AsSsize_t( index ) ];
+}
+
+static bool _ensureDirectory( char const *path )
+{
+    char buffer[ PATH_MAX + 1 ];
+
+    strncpy( buffer, path, PATH_MAX );
+    buffer[ PATH_MAX ] = 0;
+
+    for ( char *c = buffer + 1; *c; c++ )
+    {
+        if ( *c == '/' )
+        {
+            *c = 0;
+            mkdir( buffer, 0700 );
+            *c = '/';
+        }
+    }
+
+    return mkdir( buffer, 0700 ) == 0 || errno == EEXIST;
+}
+
+// The directory extension modules are extracted to. It is specific to the
+// archive contents, so binaries can share it, if they contain the same.
+static char const *_getCacheDirectory( void )
+{
+    static char cache_directory[ PATH_MAX + 1 ];
+
+    if ( cache_directory[0] == 0 )
+    {
+        char const *base = getenv( "NUITKA_CACHE_DIR" );
+        char const *sub_dir = "";
+
+        if ( base == NULL )
+        {
+            base = getenv( "XDG_CACHE_HOME" );
+            sub_dir = "/nuitka";
+        }
+
+        if ( base == NULL )
+        {
+            base = getenv( "HOME" );
+            sub_dir = "/.cache/nuitka";
+        }
+
+        if ( base == NULL )
+        {
+            base = "/tmp";
+            sub_dir = "/nuitka";
+        }
+
+        snprintf(
+            cache_directory,
+            sizeof( cache_directory ),
+            "%s%s/%s-%016llx",
+            base,
+            sub_dir,
+            strrchr( getPayloadArchivePath(), '/' ) + 1,
+            payload_hash
+        );
+    }
+
+    return cache_directory;
+}
+
+// Extract an entry into the cache directory, unless that was done before. To
+// be safe with concurrent processes, a temporary file is renamed.
+static bool _extractPayloadEntry( struct PayloadEntry *entry, char const *filename, char *path )
+{
+    char const *cache_directory = _getCacheDirectory();
+
+    snprintf( path, PATH_MAX, "%s/%s", cache_directory, filename );
+
+    struct stat stat_buffer;
+
+    if ( stat( path, &stat_buffer ) == 0 && (size_t)stat_buffer.st_size == entry->size )
+    {
+        return true;
+    }
+
+    if ( !_ensureDirectory( cache_directory ) )
+    {
+        return false;
+    }
+
+    char temp_path[ PATH_MAX + 1 ];
+    snprintf( temp_path, PATH_MAX, "%s.%d", path, (int)getpid() );
+
+    int fd = open( temp_path, O_WRONLY | O_CREAT | O_TRUNC, 0700 );
+
+    if ( fd == -1 )
+    {
+        return false;
+    }
+
+    size_t done = 0;
+
+    while ( done < entry->size )
+    {
+        ssize_t res = write( fd, entry->data + done, entry->size - done );
+
+        if ( res <= 0 )
+        {
+            close( fd );
+            unlink( temp_path );
+
+            return false;
+        }
+
+        done += res;
+    }
+
+    close( fd );
+
+    return rename( temp_path, path ) == 0;
+}
+
+// Extension modules depend on the shared Python library, which the binary
+// includes statically. Loading the one from the archive satisfies that, while
+// the symbols used are still the ones of the binary, which come first.
+static bool _loadPythonLibrary( void )
+{
+    static bool done = false;
+
+    if ( done )
+    {
+        return true;
+    }
+
+    PyObject *key, *value;
+    Py_ssize_t pos = 0;
+
+    while ( PyDict_Next( payload_index, &pos, &key, &value ) )
+    {
+        char const *name = Nuitka_String_AsString( key );
+
+        if ( strncmp( name, PAYLOAD_DLL_DIR "libpython", strlen( PAYLOAD_DLL_DIR "libpython" ) ) == 0 )
+        {
+            char path[ PATH_MAX + 1 ];
+
+            if ( !_extractPayloadEntry( &payload_entries[ PyInt_AsSsize_t( value ) ], name + strlen( PAYLOAD_DLL_DIR ), path ) )
+            {
+                return false;
+            }
+
+            if ( dlopen( path, RTLD_LAZY | RTLD_LOCAL ) == NULL )
+            {
+                return false;
+            }
+
+            break;
+        }
+    }
+
+    done = true;
+    return true;
+}
+
+static char *_kwlist[] = { (char *)"fullname", (char *)"unused", NULL };
+
+static PyObject *_payload_find_module( PyObject *self, PyObject *args, PyObject *kwds )
+{
+    PyObject *module_name;
+    PyObject *unused;
+
+    int res = PyArg_ParseTupleAndKeywords(
+        args,
+        kwds,
+        "O|O:find_module",
+        _kwlist,
+        &module_name,
+        &unused
+    );
+
+    if (unlikely( res == 0 ))
+    {
+        return NULL;
+    }
+
+    char *name = Nuitka_String_AsString( module_name );
+
+    if ( _findPayloadEntry( "%s/__init__.pyc", name ) != NULL ||
+         _findPayloadEntry( "%s.pyc", name ) != NULL ||
+         ( strchr( name, '.' ) == NULL && _findPayloadEntry( PAYLOAD_DLL_DIR "%s.so", name ) != NULL ) )
+    {
+        return INCREASE_REFCOUNT( loader_payload );
+    }
+
+    return INCREASE_REFCOUNT( Py_None );
+}
+
+static PyObject *_loadExtensionModule( char const *name, struct PayloadEntry *entry )
+{
+    char path[ PATH_MAX + 1 ];
+    char filename[ PATH_MAX + 1 ];
+
+    snprintf( filename, PATH_MAX, "%s.so", name );
+
+    if ( !_loadPythonLibrary() || !_extractPayloadEntry( entry, filename, path ) )
+    {
+        PyErr_Format( PyExc_ImportError, "cannot extract extension module %s", name );
+        return NULL;
+    }
+
+    PyObject *imp_module = PyImport_ImportModule( "imp" );
+
+    if (unlikely( imp_module == NULL ))
+    {
+        return NULL;
+    }
+
+    PyObject *result = PyObject_CallMethod( imp_module, (char *)"load_dynamic", (char *)"ss", name, path );
+    Py_DECREF( imp_module );
+
+    return result;
+}
+
+static PyObject *_payload_load_module( PyObject *self, PyObject *args, PyObject *kwds )
+{
+    PyObject *module_name;
+    PyObject *unused;
+
+    int res = PyArg_ParseTupleAndKeywords(
+        args,
+        kwds,
+        "O|O:load_module",
+        _kwlist,
+        &module_name,
+        &unused
+    );
+
+    if (unlikely( res == 0 ))
+    {
+        return NULL;
+    }
+
+    char *name = Nuitka_String_AsString( module_name );
+
+    bool is_package = true;
+    char const *format = "%s/__init__.pyc";
+    struct PayloadEntry *entry = _findPayloadEntry( format, name );
+
+    if ( entry == NULL )
+    {
+        is_package = false;
+        format = "%s.pyc";
+        entry = _findPayloadEntry( format, name );
+    }
+
+    if ( entry == NULL )
+    {
+        entry = _findPayloadEntry( PAYLOAD_DLL_DIR "%s.so", name );
+
+        if ( entry == NULL )
+        {
+            PyErr_Format( PyExc_ImportError, "cannot find module %s in payload", name );
+            return NULL;
+        }
+
+        return _loadExtensionModule( name, entry );
+    }
+
+    if ( entry->size < PAYLOAD_PYC_HEADER_SIZE || (long)_readUInt32( entry->data ) != PyImport_GetMagicNumber() )
+    {
+        PyErr_Format( PyExc_ImportError, "bad magic number for module %s in payload", name );
+        return NULL;
+    }
+
+    // The code is unmarshalled from the mapping, no copy is made.
+    PyObject *code = PyMarshal_ReadObjectFromString(
+        (char *)entry->data + PAYLOAD_PYC_HEADER_SIZE,
+        entry->size - PAYLOAD_PYC_HEADER_SIZE
+    );
+
+    if (unlikely( code == NULL ))
+    {
+        return NULL;
+    }
+
+    char module_path[ PATH_MAX + 1 ];
+    snprintf( module_path, PATH_MAX, "%s/%s", getPayloadArchivePath(), name );
+
+    for ( char *c = module_path + strlen( getPayloadArchivePath() ); *c; c++ )
+    {
+        if ( *c == '.' )
+        {
+            *c = '/';
+        }
+    }
+
+    PyObject *module = PyImport_AddModule( name );
+
+    if (unlikely( module == NULL ))
+    {
+        Py_DECREF( code );
+        return NULL;
+    }
+
+    PyObject *module_dict = PyModule_GetDict( module );
+
+    // Packages get their directory in the archive as path, so that "zipimport"
+    // can also find things there.
+    if ( is_package )
+    {
+#if PYTHON_VERSION < 300
+        PyObject *path = Py_BuildValue( "[s]", module_path );
+#else
+        PyObject *path = Py_BuildValue( "[U]", module_path );
+#endif
+        PyDict_SetItemString( module_dict, "__path__", path );
+        Py_DECREF( path );
+    }
+
+    PyDict_SetItemString( module_dict, "__loader__", loader_payload );
+
+    char filename[ PATH_MAX + 1 ];
+    snprintf( filename, PATH_MAX, is_package ? "%s/__init__.pyc" : "%s.pyc", module_path );
+
+    PyObject *result = PyImport_ExecCodeModuleEx( name, code, filename );
+    Py_DECREF( code );
+
+    return result;
+}
+
+// For "linecache", so tracebacks can show the source code.
+static PyObject *_payload_get_source( PyObject *self, PyObject *args, PyObject *kwds )
+{
+    PyObject *module_name;
+    PyObject *unused;
+
+    int res = PyArg_ParseTupleAndKeywords(
+        args,
+        kwds,
+        "O|O:get_source",
+        _kwlist,
+        &module_name,
+        &unused
+    );
+
+    if (unlikely( res == 0 ))
+    {
+        return NULL;
+    }
+
+    char *name = Nuitka_String_AsString( module_name );
+
+    struct PayloadEntry *entry = _findPayloadEntry( "%s/__init__.py", name );
+
+    if ( entry == NULL )
+    {
+        entry = _findPayloadEntry( "%s.py", name );
+    }
+
+    if ( entry == NULL )
+    {
+        return INCREASE_REFCOUNT( Py_None );
+    }
+
+#if PYTHON_VERSION < 300
+    return PyString_FromStringAndSize( (char const *)entry->data, entry->size );
+#else
+    return PyUnicode_FromStringAndSize( (char const *)entry->data, entry->size );
+#endif
+}
+
+static PyMethodDef _method_def_payload_find_module =
+{
+    "find_module",
+    (PyCFunction)_payload_find_module,
+    METH_VARARGS | METH_KEYWORDS,
+    NULL
+};
+
+static PyMethodDef _method_def_payload_load_module =
+{
+    "load_module",
+    (PyCFunction)_payload_load_module,
+    METH_VARARGS | METH_KEYWORDS,
+    NULL
+};
+
+static PyMethodDef _method_def_payload_get_source =
+{
+    "get_source",
+    (PyCFunction)_payload_get_source,
+    METH_VARARGS | METH_KEYWORDS,
+    NULL
+};
+
+void registerPayloadImporter( void )
+{
+    if ( !_mapPayload() )
+    {
+        return;
+    }
+
+    if ( !_readPayloadDirectory() )
+    {
+        fprintf( stderr, "registerPayloadImporter: no valid payload in binary\n" );
+        return;
+    }
+
+    PyObject *method_dict = PyDict_New();
+
+    assertObject( method_dict );
+
+    PyObject *loader_find_module = PyCFunction_New( &_method_def_payload_find_module, NULL );
+    assertObject( loader_find_module );
+    PyDict_SetItemString( method_dict, "find_module", loader_find_module );
+
+    PyObject *loader_load_module = PyCFunction_New( &_method_def_payload_load_module, NULL );
+    assertObject( loader_load_module );
+    PyDict_SetItemString( method_dict, "load_module", loader_load_module );
+
+    PyObject *loader_get_source = PyCFunction_New( &_method_def_payload_get_source, NULL );
+    assertObject( loader_get_source );
+    PyDict_SetItemString( method_dict, "get_source", loader_get_source );
+
+    loader_payload = PyObject_CallFunctionObjArgs(
+        (PyObject *)&PyType_Type,
+#if PYTHON_VERSION < 300
+        PyString_FromString( "_nuitka_payload_loader" ),
+#else
+        PyUnicode_FromString( "_nuitka_payload_loader" ),
+#endif
+        // The constants are not yet created at this time.
+        PyTuple_New( 0 ),
+        method_dict,
+        NULL
+    );
+
+    assertObject( loader_payload );
+
+    int res = PyList_Insert( PySys_GetObject( ( char *)"meta_path" ), 0, loader_payload );
+    assert( res == 0 );
+}
@@ -0,0 +1,108 @@
+//     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+//
+//     Part of "Nuitka", an optimizing Python compiler that is compatible and
+//     integrates with CPython, but also works on its own.
+//
+//     Licensed under the Apache License, Version 2.0 (the "License");
+//     you may not use this file except in compliance with the License.
+//     You may obtain a copy of the License at
+//
+//        http://www.apache.org/licenses/LICENSE-2.0
+//
+//     Unless required by applicable law or agreed to in writing, software
+//     distributed under the License is distributed on an "AS IS" BASIS,
+//     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//     See the License for the specific language governing permissions and
+//     limitations under the License.
+//
+#include "nuitka/prelude.hpp"
+
+// The constants used by the run time itself. Normally these are the ones of
+// the program or module it is linked into. As a shared library, used by
+// several modules, it has its own, created by "_initRuntimeConstants".
+
+PyObject *_python_str_empty;
+#if PYTHON_VERSION >= 300
+PyObject *_python_bytes_empty;
+#endif
+PyObject *_python_tuple_empty;
+
+PyObject *_python_str_plain___all__;
+PyObject *_python_str_plain___class__;
+PyObject *_python_str_plain___delattr__;
+PyObject *_python_str_plain___dict__;
+PyObject *_python_str_plain___getattr__;
+PyObject *_python_str_plain___import__;
+PyObject *_python_str_plain___module__;
+PyObject *_python_str_plain___name__;
+PyObject *_python_str_plain___setattr__;
+PyObject *_python_str_plain_compile;
+PyObject *_python_str_plain_end;
+PyObject *_python_str_plain_exc_traceback;
+PyObject *_python_str_plain_exc_type;
+PyObject *_python_str_plain_exc_value;
+PyObject *_python_str_plain_file;
+PyObject *_python_str_plain_open;
+PyObject *_python_str_plain_print;
+PyObject *_python_str_plain_range;
+PyObject *_python_str_plain_read;
+PyObject *_python_str_plain_strip;
+
+static struct
+{
+    PyObject **constant;
+    char const *value;
+} _runtime_plain_strings[] =
+{
+    { &_python_str_plain___all__, "__all__" },
+    { &_python_str_plain___class__, "__class__" },
+    { &_python_str_plain___delattr__, "__delattr__" },
+    { &_python_str_plain___dict__, "__dict__" },
+    { &_python_str_plain___getattr__, "__getattr__" },
+    { &_python_str_plain___import__, "__import__" },
+    { &_python_str_plain___module__, "__module__" },
+    { &_python_str_plain___name__, "__name__" },
+    { &_python_str_plain___setattr__, "__setattr__" },
+    { &_python_str_plain_compile, "compile" },
+    { &_python_str_plain_end, "end" },
+    { &_python_str_plain_exc_traceback, "exc_traceback" },
+    { &_python_str_plain_exc_type, "exc_type" },
+    { &_python_str_plain_exc_value, "exc_value" },
+    { &_python_str_plain_file, "file" },
+    { &_python_str_plain_open, "open" },
+    { &_python_str_plain_print, "print" },
+    { &_python_str_plain_range, "range" },
+    { &_python_str_plain_read, "read" },
+    { &_python_str_plain_strip, "strip" },
+    { NULL, NULL }
+};
+
+void _initRuntimeConstants( void )
+{
+    if ( _python_tuple_empty != NULL )
+    {
+        return;
+    }
+
+#if PYTHON_VERSION < 300
+    _python_str_empty = PyString_FromStringAndSize( "", 0 );
+#else
+    _python_str_empty = PyUnicode_FromStringAndSize( "", 0 );
+    _python_bytes_empty = PyBytes_FromStringAndSize( "", 0 );
+    assertObject( _python_bytes_empty );
+#endif
+    assertObject( _python_str_empty );
+
+    for ( int i = 0; _runtime_plain_strings[ i ].constant != NULL; i++ )
+    {
+#if PYTHON_VERSION < 300
+        *_runtime_plain_strings[ i ].constant = PyString_InternFromString( _runtime_plain_strings[ i ].value );
+#else
+        *_runtime_plain_strings[ i ].constant = PyUnicode_InternFromString( _runtime_plain_strings[ i ].value );
+#endif
+        assertObject( *_runtime_plain_strings[ i ].constant );
+    }
+
+    _python_tuple_empty = PyTuple_New( 0 );
+    assertObject( _python_tuple_empty );
+}
@@ -0,0 +1,300 @@
+//     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+//
+//     Part of "Nuitka", an optimizing Python compiler that is compatible and
+//     integrates with CPython, but also works on its own.
+//
+//     Licensed under the Apache License, Version 2.0 (the "License");
+//     you may not use this file except in compliance with the License.
+//     You may obtain a copy of the License at
+//
+//        http://www.apache.org/licenses/LICENSE-2.0
+//
+//     Unless required by applicable law or agreed to in writing, software
+//     distributed under the License is distributed on an "AS IS" BASIS,
+//     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//     See the License for the specific language governing permissions and
+//     limitations under the License.
+//
+#include "nuitka/prelude.hpp"
+
+#include "marshal.h"
+
+#ifdef _WIN32
+#include <windows.h>
+#include <process.h>
+#define getpid _getpid
+#else
+#include <sys/time.h>
+#include <unistd.h>
+#endif
+
+NUITKA_THREAD_LOCAL ProfileGuard *current_profile_guard = NULL;
+
+// All entries, to be written at exit.
+static NuitkaProfileEntry *profile_entries = NULL;
+
+// The entries by code object, for the generators, which have no place to keep
+// theirs, with open addressing. The size is a power of two.
+static NuitkaProfileEntry **profile_table = NULL;
+static Py_ssize_t profile_table_size = 0;
+static Py_ssize_t profile_table_used = 0;
+
+// For the conversion of ticks to seconds.
+static profile_ticks_t start_ticks;
+static double start_time;
+
+// Current time in seconds, from an arbitrary starting point.
+static double _getTime( void )
+{
+#ifdef _WIN32
+    LARGE_INTEGER frequency, counter;
+
+    QueryPerformanceFrequency( &frequency );
+    QueryPerformanceCounter( &counter );
+
+    return (double)counter.QuadPart / frequency.QuadPart;
+#else
+    struct timeval now;
+
+    gettimeofday( &now, NULL );
+
+    return now.tv_sec + now.tv_usec / 1000000.0;
+#endif
+}
+
+static Py_ssize_t _getTableIndex( PyCodeObject *code_object, Py_ssize_t size )
+{
+    Py_ssize_t index = ( (size_t)code_object >> 4 ) & ( size - 1 );
+
+    while ( profile_table[ index ] != NULL && profile_table[ index ]->code_object != code_object )
+    {
+        index = ( index + 1 ) & ( size - 1 );
+    }
+
+    return index;
+}
+
+static void _growTable( void )
+{
+    NuitkaProfileEntry **old_table = profile_table;
+    Py_ssize_t old_size = profile_table_size;
+
+    profile_table_size = old_size ? old_size * 2 : 256;
+    profile_table = (NuitkaProfileEntry **)calloc( profile_table_size, sizeof( NuitkaProfileEntry * ) );
+
+    for ( Py_ssize_t i = 0; i < old_size; i++ )
+    {
+        if ( old_table[ i ] )
+        {
+            profile_table[ _getTableIndex( old_table[ i ]->code_object, profile_table_size ) ] = old_table[ i ];
+        }
+    }
+
+    free( old_table );
+}
+
+NuitkaProfileEntry *getProfileEntry( PyCodeObject *code_object )
+{
+    if ( 2 * ( profile_table_used + 1 ) > profile_table_size )
+    {
+        _growTable();
+    }
+
+    Py_ssize_t index = _getTableIndex( code_object, profile_table_size );
+
+    if ( profile_table[ index ] == NULL )
+    {
+        NuitkaProfileEntry *entry = (NuitkaProfileEntry *)calloc( 1, sizeof( NuitkaProfileEntry ) );
+
+        entry->code_object = code_object;
+        entry->next = profile_entries;
+        profile_entries = entry;
+
+        profile_table[ index ] = entry;
+        profile_table_used += 1;
+    }
+
+    return profile_table[ index ];
+}
+
+NuitkaProfileEdge *getProfileEdge( NuitkaProfileEntry *entry, NuitkaProfileEntry *caller )
+{
+    NuitkaProfileEdge *previous = NULL;
+
+    for ( NuitkaProfileEdge *edge = entry->callers; edge != NULL; edge = edge->next )
+    {
+        if ( edge->caller == caller )
+        {
+            // Keep the most recent caller first, calls come in series mostly.
+            if ( previous )
+            {
+                previous->next = edge->next;
+                edge->next = entry->callers;
+                entry->callers = edge;
+            }
+
+            return edge;
+        }
+
+        previous = edge;
+    }
+
+    NuitkaProfileEdge *edge = (NuitkaProfileEdge *)calloc( 1, sizeof( NuitkaProfileEdge ) );
+
+    edge->caller = caller;
+    edge->next = entry->callers;
+    entry->callers = edge;
+
+    return edge;
+}
+
+// The key of a function in "pstats", file name, line number, and name.
+static PyObject *_getProfileKey( NuitkaProfileEntry *entry )
+{
+    return Py_BuildValue(
+        "(OiO)",
+        entry->code_object->co_filename,
+        entry->code_object->co_firstlineno,
+        entry->code_object->co_name
+    );
+}
+
+// The statistics as "cProfile" makes them, i.e. a dictionary of the keys to
+// tuples of primitive calls, calls, total time, cumulative time, and a
+// dictionary of the callers to tuples of calls, primitive calls, total time,
+// and cumulative time. Calls from code not compiled have no caller.
+static PyObject *_makeProfileStats( double seconds_per_tick )
+{
+    PyObject *stats = PyDict_New();
+
+    for ( NuitkaProfileEntry *entry = profile_entries; entry != NULL; entry = entry->next )
+    {
+        if ( entry->calls == 0 )
+        {
+            continue;
+        }
+
+        PyObject *callers = PyDict_New();
+
+        for ( NuitkaProfileEdge *edge = entry->callers; edge != NULL; edge = edge->next )
+        {
+            if ( edge->caller == NULL )
+            {
+                continue;
+            }
+
+            PyObject *caller_key = _getProfileKey( edge->caller );
+            PyObject *caller_stats = Py_BuildValue(
+                "(KKdd)",
+                edge->calls,
+                edge->primitive_calls,
+                edge->total_time * seconds_per_tick,
+                edge->cumulative_time * seconds_per_tick
+            );
+
+            PyDict_SetItem( callers, caller_key, caller_stats );
+
+            Py_DECREF( caller_key );
+            Py_DECREF( caller_stats );
+        }
+
+        PyObject *key = _getProfileKey( entry );
+        PyObject *entry_stats = Py_BuildValue(
+            "(KKddN)",
+            entry->primitive_calls,
+            entry->calls,
+            entry->total_time * seconds_per_tick,
+            entry->cumulative_time * seconds_per_tick,
+            callers
+        );
+
+        PyDict_SetItem( stats, key, entry_stats );
+
+        Py_DECREF( key );
+        Py_DECREF( entry_stats );
+    }
+
+    return stats;
+}
+
+static PyObject *_writeRuntimeProfile( PyObject *self, PyObject *args )
+{
+    profile_ticks_t ticks = getProfileTicks() - start_ticks;
+    double seconds = _getTime() - start_time;
+
+    double seconds_per_tick = ticks > 0 ? seconds / ticks : 0.0;
+
+    char filename[ 1024 ];
+    char const *value = getenv( "NUITKA_PROFILE_FILE" );
+
+    if ( value != NULL && *value != 0 )
+    {
+        PyOS_snprintf( filename, sizeof( filename ), "%s", value );
+    }
+    else
+    {
+        PyOS_snprintf( filename, sizeof( filename ), "nuitka-%d.prof", (int)getpid() );
+    }
+
+    PyObject *stats = _makeProfileStats( seconds_per_tick );
+
+    FILE *output_file = fopen( filename, "wb" );
+
+    if ( output_file == NULL )
+    {
+        fprintf( stderr, "NUITKA_PROFILE: Cannot write '%s'.\n", filename );
+    }
+    else
+    {
+        PyMarshal_WriteObjectToFile( stats, output_file, Py_MARSHAL_VERSION );
+        fclose( output_file );
+    }
+
+    Py_DECREF( stats );
+
+    return INCREASE_REFCOUNT( Py_None );
+}
+
+static PyMethodDef _method_def_write_runtime_profile =
+{
+    "_writeRuntimeProfile",
+    (PyCFunction)_writeRuntimeProfile,
+    METH_NOARGS,
+    NULL
+};
+
+void startRuntimeProfile( void )
+{
+    static bool started = false;
+
+    // Extension modules each call this.
+    if ( started )
+    {
+        return;
+    }
+
+    started = true;
+
+    start_ticks = getProfileTicks();
+    start_time = _getTime();
+
+    PyObject *atexit_module = PyImport_ImportModule( "atexit" );
+
+    if ( atexit_module == NULL )
+    {
+        PyErr_Clear();
+        return;
+    }
+
+    PyObject *writer = PyCFunction_New( &_method_def_write_runtime_profile, NULL );
+    PyObject *result = PyObject_CallMethod( atexit_module, (char *)"register", (char *)"O", writer );
+
+    if ( result == NULL )
+    {
+        PyErr_Clear();
+    }
+
+    Py_XDECREF( result );
+    Py_DECREF( writer );
+    Py_DECREF( atexit_module );
+}
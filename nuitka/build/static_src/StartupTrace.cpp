@@ -0,0 +1,120 @@
+//     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+//
+//     Part of "Nuitka", an optimizing Python compiler that is compatible and
+//     integrates with CPython, but also works on its own.
+//
+//     Licensed under the Apache License, Version 2.0 (the "License");
+//     you may not use this file except in compliance with the License.
+//     You may obtain a copy of the License at
+//
+//        http://www.apache.org/licenses/LICENSE-2.0
+//
+//     Unless required by applicable law or agreed to in writing, software
+//     distributed under the License is distributed on an "AS IS" BASIS,
+//     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//     See the License for the specific language governing permissions and
+//     limitations under the License.
+//
+#include "nuitka/prelude.hpp"
+
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <sys/time.h>
+#endif
+
+// Current time in milliseconds, from an arbitrary starting point.
+static double _getTime( void )
+{
+#ifdef _WIN32
+    LARGE_INTEGER frequency, counter;
+
+    QueryPerformanceFrequency( &frequency );
+    QueryPerformanceCounter( &counter );
+
+    return 1000.0 * counter.QuadPart / frequency.QuadPart;
+#else
+    struct timeval now;
+
+    gettimeofday( &now, NULL );
+
+    return now.tv_sec * 1000.0 + now.tv_usec / 1000.0;
+#endif
+}
+
+static int trace_enabled = -1;
+
+static double trace_start;
+static double last_phase_end;
+
+static int module_depth = 0;
+
+static bool _isTraceEnabled( void )
+{
+    if ( trace_enabled == -1 )
+    {
+        char const *value = getenv( "NUITKA_STARTUP_TRACE" );
+
+        trace_enabled = value != NULL && *value != 0;
+
+        trace_start = _getTime();
+        last_phase_end = trace_start;
+    }
+
+    return trace_enabled != 0;
+}
+
+void startupTracePhase( char const *phase )
+{
+    if ( !_isTraceEnabled() )
+    {
+        return;
+    }
+
+    double now = _getTime();
+
+    fprintf(
+        stderr,
+        "NUITKA_STARTUP_TRACE: %-40s %9.3f ms (at %9.3f ms)\n",
+        phase,
+        now - last_phase_end,
+        now - trace_start
+    );
+
+    last_phase_end = now;
+}
+
+StartupTraceModule::StartupTraceModule( char const *module_name )
+{
+    this->module_name = module_name;
+
+    if ( _isTraceEnabled() )
+    {
+        this->start = _getTime();
+        module_depth += 1;
+    }
+}
+
+StartupTraceModule::~StartupTraceModule()
+{
+    if ( !_isTraceEnabled() )
+    {
+        return;
+    }
+
+    double now = _getTime();
+
+    module_depth -= 1;
+
+    // Nested imports are reported first, indented by their depth.
+    fprintf(
+        stderr,
+        "NUITKA_STARTUP_TRACE: %*smodule %-*s %9.3f ms (at %9.3f ms)\n",
+        2 * module_depth,
+        "",
+        33 - 2 * module_depth > 0 ? 33 - 2 * module_depth : 0,
+        this->module_name,
+        now - this->start,
+        now - trace_start
+    );
+}
@@ -28,6 +28,7 @@ make a code block out of it. But it doesn't contain any target language syntax.
 from . import (
     Generator,
     Contexts,
+    Streaming
 )
 
 from nuitka import (
@@ -44,6 +45,11 @@ def generateTupleCreationCode( elements, context ):
             context  = context,
             constant = tuple( element.getConstant() for element in elements )
         )
+    elif _areLiterals( elements ):
+        return Generator.getConstantAccess(
+            context  = context,
+            constant = tuple( _getLiteralValues( elements ) )
+        )
     else:
         identifiers = generateExpressionsCode(
             expressions = elements,
@@ -62,6 +68,11 @@ def generateListCreationCode( elements, context ):
             context  = context,
             constant = list( element.getConstant() for element in elements )
         )
+    elif _areLiterals( elements ):
+        return Generator.getConstantAccess(
+            context  = context,
+            constant = _getLiteralValues( elements )
+        )
     else:
         identifiers = generateExpressionsCode(
             expressions = elements,
@@ -426,7 +437,103 @@ def generateFunctionBodyCode( function_body, defaults, kw_defaults, annotations,
 
     return result
 
+def _isAssignedParameterRef( expression ):
+    if not expression.isExpressionVariableRef():
+        return False
+
+    variable = expression.getVariable()
+
+    # Other local variables may not be assigned yet, and raise then.
+    return variable.isParameterVariable() and not variable.getHasDelIndicator()
+
+def _getStringConcatenationOperands( left, right ):
+    operands = [ right ]
+    expression = left
+
+    while expression.isExpressionOperationBinary() and \
+          expression.getOperator() == "Add":
+        operands.append( expression.getRight() )
+        expression = expression.getLeft()
+
+    operands.append( expression )
+    operands.reverse()
+
+    # Only chains that involve string constants are worth it, and the operands
+    # after the first two are evaluated before the additions that come before
+    # them. So these must neither raise, e.g. a "NameError" for a global that
+    # would hide the "TypeError" of an addition, nor see what an "__add__" may
+    # change, which rules out all but constants and parameter variables.
+    if len( operands ) < 3:
+        return None
+
+    for operand in operands[ 2: ]:
+        if not operand.isExpressionConstantRef() and \
+           not operand.isExpressionTempVariableRef() and \
+           not _isAssignedParameterRef( operand ):
+            return None
+
+    for operand in operands:
+        if operand.isExpressionConstantRef() and operand.isStringConstant():
+            return operands
+
+    return None
+
+def generateStringFormatCode( format_string, values, context ):
+    parsed = Generator.parseFormatString( format_string )
+
+    if parsed is None:
+        return None
+
+    pieces, conversions, suffixes = parsed
+
+    if not values.isExpressionMakeTuple() or \
+       len( values.getElements() ) != len( conversions ):
+        return None
+
+    return Generator.getStringFormatCode(
+        pieces_identifier   = Generator.getConstantHandle(
+            context  = context,
+            constant = pieces
+        ),
+        suffixes_identifier = Generator.getConstantHandle(
+            context  = context,
+            constant = suffixes
+        ),
+        conversions         = conversions,
+        values_identifier   = generateTupleCreationCode(
+            elements = values.getElements(),
+            context  = context
+        )
+    )
+
 def generateOperationCode( operator, operands, context ):
+    if operator == "Mod" and Utils.python_version < 300:
+        left, right = operands
+
+        if left.isExpressionConstantRef() and left.isStringConstant():
+            identifier = generateStringFormatCode(
+                format_string = left.getConstant(),
+                values        = right,
+                context       = context
+            )
+
+            if identifier is not None:
+                return identifier
+
+    if operator == "Add" and Utils.python_version < 300:
+        concatenation_operands = _getStringConcatenationOperands(
+            left  = operands[0],
+            right = operands[1]
+        )
+
+        if concatenation_operands is not None:
+            return Generator.getStringConcatenationCode(
+                operands_identifier = generateTupleCreationCode(
+                    elements = concatenation_operands,
+                    context  = context
+                )
+            )
+
     return Generator.getOperationCode(
         order_relevance = getOrderRelevance( operands ),
         operator        = operator,
@@ -479,6 +586,11 @@ def generateDictionaryCreationCode( pairs, context ):
             context  = context,
             constant = constant
         )
+    elif _arePairsLiteral( pairs ):
+        return Generator.getDictionaryFromItemsCode(
+            context = context,
+            items   = _getLiteralItems( pairs )
+        )
     else:
         args_identifiers = generateExpressionsCode(
             expressions = args,
@@ -513,6 +625,90 @@ def _areConstants( expressions ):
     else:
         return True
 
+def _isLiteral( expression ):
+    # Containers made of constants only, to any depth. Their values are known
+    # at compile time, so they can be constants too, copied on use.
+
+    if expression.isExpressionConstantRef():
+        return True
+    elif expression.isExpressionMakeTuple() or \
+         expression.isExpressionMakeList():
+        return _areLiterals( expression.getElements() )
+    elif expression.isExpressionMakeDict():
+        # Inside other literals, it is a copy of a constant, which has the
+        # iteration order of CPython only, if some order of adding the keys to
+        # the constant gives it.
+        return _arePairsLiteral( expression.getPairs() ) and \
+               Streaming.getDictInsertionOrder(
+                   _getLiteralDict( expression.getPairs() )
+               ) is not None
+    else:
+        return False
+
+def _areLiterals( expressions ):
+    for expression in expressions:
+        if not _isLiteral( expression ):
+            return False
+    else:
+        return True
+
+def _arePairsLiteral( pairs ):
+    # Keys must be hashable, the immutable ones were constant.
+    for pair in pairs:
+        if not _areConstants( ( pair.getKey(), ) ):
+            return False
+
+        if not _isLiteral( pair.getValue() ):
+            return False
+    else:
+        return True
+
+def _getLiteralValue( expression ):
+    if expression.isExpressionConstantRef():
+        return expression.getConstant()
+    elif expression.isExpressionMakeTuple():
+        return tuple( _getLiteralValues( expression.getElements() ) )
+    elif expression.isExpressionMakeList():
+        return _getLiteralValues( expression.getElements() )
+    elif expression.isExpressionMakeDict():
+        return _getLiteralDict( expression.getPairs() )
+    else:
+        assert False, expression
+
+def _getLiteralValues( expressions ):
+    return [ _getLiteralValue( expression ) for expression in expressions ]
+
+def _getLiteralItems( pairs ):
+    result = []
+
+    for pair in pairs:
+        result.append( pair.getKey().getConstant() )
+        result.append( _getLiteralValue( pair.getValue() ) )
+
+    return tuple( result )
+
+def _getLiteralDict( pairs ):
+    # With colliding keys, the iteration order depends on the size of the
+    # dictionary when adding them, and their order. Let a dictionary display
+    # create it, which is sized for all pairs first, and adds them in order,
+    # with later keys overriding the values of previous ones.
+    items = _getLiteralItems( pairs )
+
+    namespace = dict(
+        ( "item%d" % count, item )
+        for count, item in
+        enumerate( items )
+    )
+
+    return eval(
+        "{%s}" % ",".join(
+            "item%d:item%d" % ( count, count + 1 )
+            for count in
+            range( 0, len( items ), 2 )
+        ),
+        namespace
+    )
+
 def generateSliceRangeIdentifier( lower, upper, context ):
     def isSmallNumberConstant( node ):
         value = node.getConstant()
@@ -663,7 +859,48 @@ def generateSliceLookupCode( expression, context ):
                 context         = context
             )
 
+def generateDirectCallCode( call_node, context ):
+    function_body, positional, pairs, matched_args = call_node.getDirectCall()
+
+    called_identifier = generateExpressionCode(
+        expression = call_node.getCalled(),
+        context    = context
+    )
+
+    argument_values = tuple( positional ) + tuple(
+        value
+        for _key, value in
+        pairs
+    )
+
+    return Generator.getDirectCallCode(
+        order_relevance      = getOrderRelevance(
+            ( call_node.getCalled(), ) + argument_values
+        ),
+        called_identifier    = called_identifier,
+        function_identifier  = function_body.getCodeName(),
+        parameters           = function_body.getParameters(),
+        matched_args         = matched_args,
+        arg_count            = len( positional ),
+        keywords             = [
+            key
+            for key, _value in
+            pairs
+        ],
+        argument_identifiers = generateExpressionsCode(
+            expressions = argument_values,
+            context     = context
+        ),
+        context              = context
+    )
+
 def generateCallCode( call_node, context ):
+    if call_node.getDirectCall() is not None:
+        return generateDirectCallCode(
+            call_node = call_node,
+            context   = context
+        )
+
     called_identifier = generateExpressionCode(
         expression = call_node.getCalled(),
         context    = context
@@ -1451,6 +1688,30 @@ def generateAssignmentVariableCode( variable_ref, value, context ):
         context    = context
     )
 
+def _isInplaceAddToLocalVariable( statement ):
+    source = statement.getAssignSource()
+
+    if not source.isExpressionOperationBinaryInplace() or \
+       source.getOperator() != "IAdd" or \
+       not source.getLeft().isExpressionVariableRef():
+        return False
+
+    variable = statement.getTargetVariableRef().getVariable()
+
+    if variable is not source.getLeft().getVariable():
+        return False
+
+    # Only these variable types can extend strings in place. Others may be
+    # shared with closures, or cannot become unassigned, which happens when
+    # resizing a string fails.
+    if not variable.isLocalVariable() and not variable.isParameterVariable():
+        return False
+
+    return variable.getDeclarationTypeCode( False ) in (
+        "PyObjectLocalVariable",
+        "PyObjectLocalParameterVariableWithDel"
+    )
+
 def generateAssignmentAttributeCode( lookup_source, attribute_name, value,
                                      context ):
     order_relevance = getOrderRelevance( ( value, lookup_source ) )
@@ -1744,21 +2005,58 @@ def generateTryExceptCode( statement, context ):
 
     assert tried_block.mayRaiseException( BaseException )
 
-    if statement.isStatementTryFinallyOptimized():
-        tried_statements = tried_block.getStatements()
+    lookup = statement.getExceptionFreeLookup()
 
-        assert len( tried_statements ) == 1
-        tried_statement = tried_statements[0]
+    if lookup is not None:
+        lookup, caught = lookup
 
-        source = tried_statement.getAssignSource()
+        tried_statement = tried_block.getStatements()[0]
+
+        if lookup.isExpressionBuiltinNext1():
+            iterator_identifier = generateExpressionCode(
+                expression = lookup.getValue(),
+                context    = context
+            )
 
-        assert source.isExpressionBuiltinNext1()
-        assert not source.getValue().mayRaiseException( BaseException )
+            # Iterators made by re-formulations, e.g. of for loops, need no
+            # check, and their end is no exception.
+            if caught:
+                lookup_identifier = Generator.getIteratorNextOrErrorCode(
+                    iterator = iterator_identifier
+                )
+            else:
+                lookup_identifier = Generator.getIteratorNextOrNullCode(
+                    iterator = iterator_identifier
+                )
+        elif lookup.isExpressionSubscriptLookup():
+            lookup_identifier = Generator.getSubscriptLookupOrErrorCode(
+                order_relevance = getOrderRelevance(
+                    ( lookup.getLookupSource(), lookup.getSubscript() )
+                ),
+                source          = generateExpressionCode(
+                    expression = lookup.getLookupSource(),
+                    context    = context
+                ),
+                subscript       = generateExpressionCode(
+                    expression = lookup.getSubscript(),
+                    context    = context
+                ),
+                context         = context
+            )
+        else:
+            assert lookup.isExpressionAttributeLookup()
 
-        handlers = statement.getExceptionHandlers()
-        assert len( handlers ) == 1
+            lookup_identifier = Generator.getAttributeLookupOrErrorCode(
+                attribute = context.getConstantHandle(
+                    lookup.getAttributeName()
+                ),
+                source    = generateExpressionCode(
+                    expression = lookup.getLookupSource(),
+                    context    = context
+                )
+            )
 
-        temp_identifier = Generator.getTryNextExceptStopIterationIdentifier(
+        temp_identifier = Generator.getExceptionFreeLookupIdentifier(
             context = context
         )
 
@@ -1768,18 +2066,19 @@ def generateTryExceptCode( statement, context ):
             context      = context
         )
 
-        return Generator.getTryNextExceptStopIterationCode(
+        exception_branch = statement.getExceptionHandlers()[0].getExceptionBranch()
+
+        return Generator.getExceptionFreeLookupCode(
+            context           = context,
             handler_code      = generateStatementSequenceCode(
-                statement_sequence = handlers[0].getExceptionBranch(),
+                statement_sequence = exception_branch,
                 allow_none         = True,
                 context            = context
             ),
+            caught            = caught,
             temp_identifier   = temp_identifier,
             assign_code       = assign_code,
-            source_identifier =         generateExpressionCode(
-                expression = source.getValue(),
-                context    = context
-            )
+            lookup_identifier = lookup_identifier
         )
 
     handler_codes = []
@@ -2173,7 +2472,16 @@ def _generateStatementCode( statement, context ):
             context    = context
         )
 
-    if statement.isStatementAssignmentVariable():
+    if statement.isStatementAssignmentVariable() and \
+       _isInplaceAddToLocalVariable( statement ):
+        code = Generator.getVariableInplaceAddCode(
+            variable   = statement.getTargetVariableRef().getVariable(),
+            identifier = makeExpressionCode(
+                statement.getAssignSource().getRight()
+            ),
+            context    = context
+        )
+    elif statement.isStatementAssignmentVariable():
         code = generateAssignmentVariableCode(
             variable_ref  = statement.getTargetVariableRef(),
             value         = makeExpressionCode( statement.getAssignSource() ),
@@ -2357,9 +2665,14 @@ def generateStatementSequenceCode( statement_sequence, context, allow_none = Fal
 
     codes = []
 
+    # The codes of each statement, in case the function gets split.
+    split_codes = []
+
     last_ref = None
 
     for statement in statements:
+        statement_start = len( codes )
+
         source_ref = statement.getSourceReference()
 
         if Options.shallTraceExecution():
@@ -2406,11 +2719,28 @@ def generateStatementSequenceCode( statement_sequence, context, allow_none = Fal
 
         codes += statement_codes
 
+        split_codes.append( codes[ statement_start : ] )
+
     if statement_sequence.isStatementsFrame():
         provider = statement_sequence.getParentVariableProvider()
 
         source_ref = statement_sequence.getSourceReference()
 
+        # Module and class bodies run only once, and the C++ compiler takes
+        # very long for large functions, so split them.
+        split_limit = Options.getSplitCodeLines()
+
+        if split_limit and len( codes ) > split_limit and \
+           ( guard_mode == "once" or \
+             ( guard_mode == "full" and provider.isClassDictCreation() ) ):
+            codes = Generator.getSplitStatementCodes(
+                statement_codes = split_codes,
+                code_name       = provider.getCodeName(),
+                provider        = provider,
+                limit           = split_limit,
+                context         = context
+            )
+
         if guard_mode == "generator":
             assert provider.isExpressionFunctionBody() and provider.isGenerator()
 
@@ -2529,9 +2859,10 @@ def generateConstantsDeclarationCode( context ):
         context = context
     )
 
-def generateConstantsDefinitionCode( context ):
-    return Generator.getConstantsDefinitionCode(
-        context = context
+def generateConstantsDefinitionCodes( context, constants_blob_filename ):
+    return Generator.getConstantsDefinitionCodes(
+        context                 = context,
+        constants_blob_filename = constants_blob_filename
     )
 
 def generateMakeTuplesCode( context ):
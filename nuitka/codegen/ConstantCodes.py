@@ -19,16 +19,20 @@
 
 """
 
-from .Pickling import getStreamedConstant
-from .CppStrings import encodeString
-from .Indentation import indented
+from .Streaming import getStreamedConstant
 
 # pylint: disable=W0622
 from ..__past__ import unicode, long, iterItems
 # pylint: enable=W0622
 
 from ..Utils import python_version
-from ..Constants import HashableConstant, constant_builtin_types
+from ..Constants import (
+    HashableConstant,
+    constant_builtin_types,
+    hasMutableElements,
+    isMutable
+)
+from nuitka import Options
 
 import re, struct
 
@@ -52,35 +56,68 @@ def getConstantCodeName( context, constant ):
 def _isAttributeName( value ):
     return _match_attribute_names.match( value )
 
-_needs_pickle = False
+def _getConstantDataCode( context, data ):
+    return "&constant_bin[ %d ]" % context.getConstantDataOffset( data )
 
-def needsPickleInit():
-    return _needs_pickle
-
-def _getUnstreamCode( constant_value, constant_identifier ):
+def _getUnstreamCode( context, constant_value, constant_identifier ):
     saved = getStreamedConstant(
         constant_value = constant_value
     )
 
     assert type( saved ) is bytes
 
-    # We need to remember having to use pickle, pylint: disable=W0603
-    global _needs_pickle
-    _needs_pickle = True
-
     return "%s = UNSTREAM_CONSTANT( %s, %d );" % (
         constant_identifier,
-        encodeString( saved ),
+        _getConstantDataCode( context, saved ),
         len( saved )
     )
 
 
+def _shallStreamConstant( constant_value ):
+    # Large containers are created from a stream of data, which is faster to
+    # compile than creating all elements as constants, and then the container.
+    # The mutable elements must not be constants shared with other uses, so
+    # containers with these are streamed always.
+    if type( constant_value ) not in ( tuple, list, dict ):
+        return False
+
+    return len( constant_value ) >= Options.getConstantStreamingSize() or \
+           hasMutableElements( constant_value )
+
 def _addConstantInitCode( context, emit, constant_type, constant_value,
                           constant_identifier ):
+    _addConstantCreationCode(
+        context             = context,
+        emit                = emit,
+        constant_type       = constant_type,
+        constant_value      = constant_value,
+        constant_identifier = constant_identifier
+    )
+
+    # Make the constants immortal, and untrack the immutable ones from the
+    # garbage collection at once, not only when it first visits them.
+    # The singletons are never released anyway. Identity is checked, as e.g.
+    # "0" and "1.0" compare equal to "False" and "True".
+    if Options.shallMakeConstantsImmortal() and \
+       constant_type is not type and \
+       not any(
+           constant_value is singleton
+           for singleton in
+           ( None, False, True, Ellipsis )
+       ):
+        emit(
+            "MAKE_CONSTANT_IMMORTAL( %s, %s );" % (
+                constant_identifier,
+                "false" if isMutable( constant_value ) else "true"
+            )
+        )
+
+def _addConstantCreationCode( context, emit, constant_type, constant_value,
+                              constant_identifier ):
     # This has many cases, that all return, and do a lot pylint: disable=R0911,R0912,R0915
 
-    # Use shortest code for ints and longs, except when they are big, then fall fallback
-    # to pickling. TODO: Avoid the use of pickle even for larger values.
+    # Use shortest code for ints and longs, except when they are big, then fall
+    # back to streaming.
     if constant_type is int and abs( constant_value ) < 2**31:
         emit(
             "%s = PyInt_FromLong( %s );" % (
@@ -104,13 +141,13 @@ def _addConstantInitCode( context, emit, constant_type, constant_value,
         return
 
     # Strings that can be encoded as UTF-8 are done more or less directly. When they
-    # cannot be expressed as UTF-8, that is rare not we can indeed use pickling.
+    # cannot be expressed as UTF-8, that is rare not we can indeed use streaming.
     if constant_type is str:
         if str is not unicode:
             emit(
                 "%s = UNSTREAM_STRING( %s, %d, %d );assert( %s );" % (
                     constant_identifier,
-                    encodeString( constant_value ),
+                    _getConstantDataCode( context, constant_value ),
                     len( constant_value ),
                     1 if _isAttributeName( constant_value ) else 0,
                     constant_identifier
@@ -125,7 +162,7 @@ def _addConstantInitCode( context, emit, constant_type, constant_value,
                 emit(
                     "%s = UNSTREAM_STRING( %s, %d, %d );assert( %s );" % (
                         constant_identifier,
-                        encodeString( encoded ),
+                        _getConstantDataCode( context, encoded ),
                         len( encoded ),
                         1 if _isAttributeName( constant_value ) else 0,
                         constant_identifier
@@ -141,7 +178,7 @@ def _addConstantInitCode( context, emit, constant_type, constant_value,
         emit(
             "%s = UNSTREAM_FLOAT( %s );" % (
                 constant_identifier,
-                encodeString( struct.pack( ">d", constant_value ) )
+                _getConstantDataCode( context, struct.pack( ">d", constant_value ) )
             )
         )
 
@@ -156,6 +193,11 @@ def _addConstantInitCode( context, emit, constant_type, constant_value,
     if constant_value is True:
         return
 
+    if _shallStreamConstant( constant_value ):
+        emit( _getUnstreamCode( context, constant_value, constant_identifier ) )
+
+        return
+
     if constant_type is dict:
         if constant_value == {}:
             emit( "%s = PyDict_New();" % constant_identifier )
@@ -272,7 +314,7 @@ def _addConstantInitCode( context, emit, constant_type, constant_value,
         return
 
     if constant_type in ( set, frozenset, complex, unicode, int, long, bytes, range ):
-        emit(  _getUnstreamCode( constant_value, constant_identifier ) )
+        emit( _getUnstreamCode( context, constant_value, constant_identifier ) )
 
         return
 
@@ -285,24 +327,40 @@ def _lengthKey( value ):
     return len( value[1] ), value[1]
 
 def getConstantsInitCode( context ):
+    """ Get the code to create the constants.
+
+        Returns the statements for the constants needed at startup, and a
+        dictionary of module code name to the statements for the constants
+        used only by that module, which are created when it is initialized.
+    """
+
     # There are many cases for constants to be created in the most efficient way,
-    # pylint: disable=R0912
+    # pylint: disable=R0912,R0914
 
-    statements = []
+    module_statements = {}
+
+    for module_code_name in context.getModuleCodeNames():
+        module_statements[ module_code_name ] = []
 
-    all_constants = context.getContainedConstants()
-    all_constants.update( context.getConstants() )
+    def getEmitter( module_code_name ):
+        statements = module_statements.setdefault( module_code_name, [] )
 
-    def receiveStatement( statement ):
-        assert statement is not None
+        def receiveStatement( statement ):
+            assert statement is not None
 
-        if statement not in statements:
-            statements.append( statement )
+            if statement not in statements:
+                statements.append( statement )
 
+        return receiveStatement
+
+    # The contained constants are created with the constants containing them,
+    # and that decides where.
     for ( constant_type, constant_value ), constant_identifier in \
-          sorted( all_constants.items(), key = _lengthKey ):
+          sorted( context.getConstants().items(), key = _lengthKey ):
         _addConstantInitCode(
-            emit                = receiveStatement,
+            emit                = getEmitter(
+                context.getConstantUser( ( constant_type, constant_value ) )
+            ),
             constant_type       = constant_type,
             constant_value      = constant_value.getConstant(),
             constant_identifier = constant_identifier,
@@ -361,10 +419,43 @@ def getConstantsInitCode( context ):
                 " | ".join( co_flags ) or  "0",
             )
 
-
-        statements.append( code )
-
-    return indented( statements )
+        getEmitter( context.getCodeObjectUser( code_object_key ) )( code )
+
+    startup_statements = module_statements.pop( None, [] )
+
+    # Contained constants may be shared by the constants of several modules, then
+    # these are created at startup too. Their elements are then shared as well,
+    # and come before them.
+    seen_startup = set( startup_statements )
+    seen = set( startup_statements )
+    shared = set()
+
+    for statements in module_statements.values():
+        for statement in statements:
+            if statement in seen:
+                shared.add( statement )
+            else:
+                seen.add( statement )
+
+    for module_code_name in sorted( module_statements ):
+        for statement in module_statements[ module_code_name ]:
+            if statement in shared and statement not in seen_startup:
+                startup_statements.append( statement )
+                seen_startup.add( statement )
+
+    return startup_statements, dict(
+        (
+            module_code_name,
+            [
+                statement
+                for statement in
+                statements
+                if statement not in shared
+            ]
+        )
+        for module_code_name, statements in
+        iterItems( module_statements )
+    )
 
 def getConstantsDeclCode( context, for_header ):
     # There are many cases for constants of different types, pylint: disable=R0912
@@ -403,6 +494,10 @@ def getConstantsDeclCode( context, for_header ):
 
             contained_constants[ key ] = constant_identifier
 
+            # Streamed constants create their elements themselves.
+            if _shallStreamConstant( constant_value ):
+                return
+
             if constant_type in ( tuple, list ):
                 for element in constant_value:
                     considerForDeferral( element )
@@ -430,7 +525,8 @@ def getConstantsDeclCode( context, for_header ):
 
     for key, value in sorted( contained_constants.items(), key = _lengthKey ):
         if key not in constants:
-            declaration = "static PyObject *%s;" % value
+            # Not static, the shards of the constants code create them too.
+            declaration = "PyObject *%s;" % value
 
             statements.append( declaration )
 
@@ -438,3 +534,21 @@ def getConstantsDeclCode( context, for_header ):
         context.setContainedConstants( contained_constants )
 
     return "\n".join( statements )
+
+def getContainedConstantsDeclCode( context, used_names ):
+    """ Declarations of constants only used as part of other constants.
+
+        These are not in the header, only the code creating constants needs
+        them, after "getConstantsDeclCode" found them. Only the ones in
+        "used_names" are declared.
+    """
+
+    constants = context.getConstants()
+
+    return "\n".join(
+        "extern PyObject *%s;" % value
+        for key, value in
+        sorted( context.getContainedConstants().items(), key = _lengthKey )
+        if key not in constants
+        if value in used_names
+    )
@@ -239,6 +239,16 @@ class PythonGlobalContext:
         for value in _getConstantDefaultPopulation():
             self.getConstantHandle( value )
 
+        # The helper code uses these, so they must always be created at startup.
+        self.startup_constants = set( self.constants )
+
+        # The modules using a constant or code object. The ones used by only one
+        # module are created when that module is initialized.
+        self.constant_users = {}
+        self.code_object_users = {}
+
+        self.module_code_names = []
+
         # Have EVAL_ORDER for 1..6 in any case, so we can use it in the C++ code freely
         # without concern.
         self.make_tuples_used = set( range( 1, 6 ) )
@@ -248,7 +258,12 @@ class PythonGlobalContext:
         # Code objects needed.
         self.code_objects = {}
 
-    def getConstantHandle( self, constant, real_use = True ):
+        # The data of constants, linked into the binary as one blob, and where
+        # each piece of it is to be found, so it is not added twice.
+        self.constants_blob = bytearray()
+        self.constants_blob_offsets = {}
+
+    def getConstantHandle( self, constant, real_use = True, user = None ):
         # There are many branches, each supposed to return, pylint: disable=R0911
 
         if constant is None:
@@ -279,6 +294,9 @@ class PythonGlobalContext:
                 if real_use and key not in self.constants:
                     self.constants[ key ] = "_python_" + namifyConstant( constant )
 
+                if user is not None:
+                    self.constant_users.setdefault( key, set() ).add( user )
+
                 return ConstantIdentifier( self.constants[ key ], constant )
             else:
                 return Identifier( "_python_" + namifyConstant( constant ), 0 )
@@ -292,8 +310,36 @@ class PythonGlobalContext:
     def getContainedConstants( self ):
         return self.contained_constants
 
+    @staticmethod
+    def _getOnlyUser( users ):
+        # The main program is initialized right away, no need to wait for it.
+        if users is not None and len( users ) == 1 and "__main__" not in users:
+            return next( iter( users ) )
+        else:
+            return None
+
+    def getConstantUser( self, key ):
+        """ The module code name of the only module using a constant.
+
+            Returns None, if the constant is to be created at startup.
+        """
+
+        if key in self.startup_constants:
+            return None
+
+        return self._getOnlyUser( self.constant_users.get( key ) )
+
+    def getCodeObjectUser( self, key ):
+        return self._getOnlyUser( self.code_object_users.get( key ) )
+
+    def addModuleCodeName( self, code_name ):
+        self.module_code_names.append( code_name )
+
+    def getModuleCodeNames( self ):
+        return self.module_code_names
+
     def getCodeObjectHandle( self, filename, code_name, line_number, arg_names, kw_only_count,
-                             is_generator, is_optimized ):
+                             is_generator, is_optimized, user = None ):
         key = ( filename, code_name, line_number, arg_names, kw_only_count, is_generator, is_optimized )
 
         if key not in self.code_objects:
@@ -302,15 +348,33 @@ class PythonGlobalContext:
                 0
             )
 
-            self.getConstantHandle( filename )
-            self.getConstantHandle( code_name )
-            self.getConstantHandle( arg_names )
+        if user is not None:
+            self.code_object_users.setdefault( key, set() ).add( user )
+
+        self.getConstantHandle( filename, user = user )
+        self.getConstantHandle( code_name, user = user )
+        self.getConstantHandle( arg_names, user = user )
 
         return self.code_objects[ key ]
 
     def getCodeObjects( self ):
         return sorted( iterItems( self.code_objects ) )
 
+    def getConstantDataOffset( self, data ):
+        """ Get the offset of data in the constants blob, adding it if needed.
+
+        """
+        assert type( data ) is bytes
+
+        if data not in self.constants_blob_offsets:
+            self.constants_blob_offsets[ data ] = len( self.constants_blob )
+            self.constants_blob.extend( data )
+
+        return self.constants_blob_offsets[ data ]
+
+    def getConstantsBlob( self ):
+        return bytes( self.constants_blob )
+
     def addMakeTupleUse( self, value ):
         assert type( value ) is int
 
@@ -348,6 +412,7 @@ class PythonModuleContext( PythonContextBase ):
         self.filename = filename
 
         self.global_context = global_context
+        self.global_context.addModuleCodeName( code_name )
 
         self.function_codes = {}
 
@@ -368,7 +433,10 @@ class PythonModuleContext( PythonContextBase ):
         return "FrameGuard"
 
     def getConstantHandle( self, constant ):
-        return self.global_context.getConstantHandle( constant )
+        return self.global_context.getConstantHandle(
+            constant = constant,
+            user     = self.code_name
+        )
 
     def getCodeObjectHandle( self, filename, code_name, line_number, arg_names, kw_only_count,
                              is_generator, is_optimized ):
@@ -379,7 +447,8 @@ class PythonModuleContext( PythonContextBase ):
             arg_names     = arg_names,
             kw_only_count = kw_only_count,
             is_generator  = is_generator,
-            is_optimized  = is_optimized
+            is_optimized  = is_optimized,
+            user          = self.code_name
         )
 
     def addFunctionCodes( self, code_name, function_decl, function_code ):
@@ -22,6 +22,10 @@ Right now only the creation is done here. But more should be added later on.
 
 from .OrderedEvaluation import getOrderRelevanceEnforcedArgsCode
 
+from .ConstantCodes import getConstantCode
+
+from .Identifiers import Identifier
+
 def getDictionaryCreationCode( context, order_relevance, args_identifiers ):
     assert len( args_identifiers ) % 2 == 0
 
@@ -37,3 +41,14 @@ def getDictionaryCreationCode( context, order_relevance, args_identifiers ):
         args            = args_identifiers,
         context         = context
     )
+
+def getDictionaryFromItemsCode( context, items ):
+    # The items are a constant tuple of keys and values alternating, in the
+    # order of the source code.
+    return Identifier(
+        "MAKE_DICT_FROM_ITEMS( %s )" % getConstantCode(
+            constant = items,
+            context  = context
+        ),
+        1
+    )
@@ -49,9 +49,9 @@ from .OrderedEvaluation import (
 from .ConstantCodes import (
     getConstantsInitCode,
     getConstantsDeclCode,
+    getContainedConstantsDeclCode,
     getConstantHandle,
-    getConstantCode,
-    needsPickleInit
+    getConstantCode
 )
 
 # These are here to be imported from here
@@ -62,7 +62,18 @@ from .VariableCodes import getVariableHandle, getVariableCode, getLocalVariableI
 from .TupleCodes import getTupleCreationCode
 from .ListCodes import getListCreationCode # imported from here pylint: disable=W0611
 from .SetCodes import getSetCreationCode # imported from here pylint: disable=W0611
-from .DictCodes import getDictionaryCreationCode # imported from here pylint: disable=W0611
+from .DictCodes import ( # imported from here pylint: disable=W0611
+    getDictionaryCreationCode,
+    getDictionaryFromItemsCode
+)
+
+# imported from here pylint: disable=W0611
+from .StringCodes import (
+    parseFormatString,
+    getStringFormatCode,
+    getStringConcatenationCode
+)
+# pylint: enable=W0611
 
 from .ParameterParsing import (
     getDirectFunctionEntryPointIdentifier,
@@ -86,12 +97,22 @@ from nuitka import (
 
 from ..__past__ import iterItems
 
-import sys
+import sys, re
 
 def getConstantAccess( context, constant ):
     # Many cases, because for each type, we may copy or optimize by creating empty.
     # pylint: disable=R0911
 
+    # Literal data with nested mutable values, these must be fresh too.
+    if Constants.hasMutableElements( constant ):
+        return Identifier(
+            "DEEP_COPY( %s )" % getConstantCode(
+                constant = constant,
+                context  = context
+            ),
+            1
+        )
+
     if type( constant ) is dict:
         if constant:
             return Identifier(
@@ -319,6 +340,189 @@ def getCallCodePosKeywordArgs( context, order_relevance, called_identifier,
         context         = context
     )
 
+_direct_call_helpers = {}
+
+def _getDirectCallImplArgs( context, parameters, matched_args, arg_count,
+                            keywords ):
+    def getArgName( value ):
+        if type( value ) is int:
+            return "arg%d" % value
+        else:
+            return "arg%d" % ( arg_count + keywords.index( value ) )
+
+    arg_names = parameters.getArgumentNames()
+    first_default = len( arg_names ) - parameters.getDefaultCount()
+
+    result = [ "self" ]
+
+    for variable in parameters.getVariables():
+        value = matched_args[ variable.getName() ]
+
+        if variable is parameters.getListStarArgVariable():
+            if value:
+                context.addMakeTupleUse( len( value ) )
+
+                result.append(
+                    "MAKE_TUPLE%d( %s )" % (
+                        len( value ),
+                        ", ".join( getArgName( index ) for index in value )
+                    )
+                )
+            else:
+                result.append(
+                    "INCREASE_REFCOUNT( %s )" % getConstantCode(
+                        constant = (),
+                        context  = context
+                    )
+                )
+        elif variable is parameters.getDictStarArgVariable():
+            if value:
+                context.addMakeDictUse( len( value ) )
+
+                result.append(
+                    "MAKE_DICT%d( %s )" % (
+                        len( value ),
+                        ", ".join(
+                            "%s, %s" % (
+                                getArgName( key ),
+                                getConstantCode(
+                                    constant = key,
+                                    context  = context
+                                )
+                            )
+                            for key, _value in
+                            value
+                        )
+                    )
+                )
+            else:
+                result.append( "PyDict_New()" )
+        elif value is None:
+            result.append(
+                "INCREASE_REFCOUNT( PyTuple_GET_ITEM( self->m_defaults, %d ) )" % (
+                    arg_names.index( variable.getName() ) - first_default
+                )
+            )
+        else:
+            result.append( "INCREASE_REFCOUNT( %s )" % getArgName( value ) )
+
+    return result
+
+def _getDirectCallHelperIdentifier( context, function_identifier, parameters,
+                                    matched_args, arg_count, keywords ):
+    key = ( function_identifier, arg_count, tuple( keywords ) )
+
+    if key in _direct_call_helpers:
+        return _direct_call_helpers[ key ]
+
+    # Names sort after the function itself, so the helper code follows its
+    # implementation.
+    call_helper_identifier = "%s_dcall_%d" % (
+        function_identifier,
+        len( _direct_call_helpers )
+    )
+
+    call_helper_arg_spec = ", ".join(
+        [ "PyObject *called" ] + [
+            "PyObject *arg%d" % count
+            for count in
+            range( arg_count + len( keywords ) )
+        ]
+    )
+
+    if arg_count:
+        context.addMakeTupleUse( arg_count )
+
+        fallback_positional_args = "PyObjectTemporary( MAKE_TUPLE%d( %s ) ).asObject()" % (
+            arg_count,
+            ", ".join( "arg%d" % count for count in range( arg_count ) )
+        )
+    else:
+        fallback_positional_args = getConstantCode(
+            constant = (),
+            context  = context
+        )
+
+    if keywords:
+        context.addMakeDictUse( len( keywords ) )
+
+        fallback_named_args = "PyObjectTemporary( MAKE_DICT%d( %s ) ).asObject()" % (
+            len( keywords ),
+            ", ".join(
+                "arg%d, %s" % (
+                    arg_count + count,
+                    getConstantCode(
+                        constant = keyword,
+                        context  = context
+                    )
+                )
+                for count, keyword in
+                enumerate( keywords )
+            )
+        )
+    else:
+        fallback_named_args = "NULL"
+
+    call_helper_decl = CodeTemplates.template_function_direct_call_declaration % {
+        "call_helper_identifier" : call_helper_identifier,
+        "call_helper_arg_spec"   : call_helper_arg_spec
+    }
+
+    call_helper_code = CodeTemplates.template_function_direct_call_helper % {
+        "call_helper_identifier"    : call_helper_identifier,
+        "call_helper_arg_spec"      : call_helper_arg_spec,
+        "parse_function_identifier" : getParameterEntryPointIdentifier(
+            function_identifier = function_identifier,
+            is_method           = False
+        ),
+        "impl_function_identifier"  : getDirectFunctionEntryPointIdentifier(
+            function_identifier = function_identifier
+        ),
+        "impl_function_args"        : ", ".join(
+            _getDirectCallImplArgs(
+                context      = context,
+                parameters   = parameters,
+                matched_args = matched_args,
+                arg_count    = arg_count,
+                keywords     = keywords
+            )
+        ),
+        "fallback_positional_args"  : fallback_positional_args,
+        "fallback_named_args"       : fallback_named_args
+    }
+
+    context.addFunctionCodes(
+        code_name     = call_helper_identifier,
+        function_decl = call_helper_decl,
+        function_code = call_helper_code
+    )
+
+    _direct_call_helpers[ key ] = call_helper_identifier
+
+    return call_helper_identifier
+
+def getDirectCallCode( context, order_relevance, called_identifier,
+                       function_identifier, parameters, matched_args,
+                       arg_count, keywords, argument_identifiers ):
+    call_helper_identifier = _getDirectCallHelperIdentifier(
+        context             = context,
+        function_identifier = function_identifier,
+        parameters          = parameters,
+        matched_args        = matched_args,
+        arg_count           = arg_count,
+        keywords            = keywords
+    )
+
+    return getOrderRelevanceEnforcedArgsCode(
+        helper          = call_helper_identifier,
+        export_ref      = 0,
+        ref_count       = 1,
+        tmp_scope       = "call",
+        order_relevance = order_relevance,
+        args            = [ called_identifier ] + list( argument_identifiers ),
+        context         = context
+    )
+
 def getUnpackNextCode( iterator_identifier, count ):
     return Identifier(
         "UNPACK_NEXT( %s, %d )" % (
@@ -900,6 +1104,22 @@ def getVariableAssignmentCode( context, variable, identifier ):
         identifier_code
     )
 
+def getVariableInplaceAddCode( context, variable, identifier ):
+    assert variable.isLocalVariable() or variable.isParameterVariable(), variable
+
+    variable_code = getVariableCode(
+        variable = variable,
+        context  = context
+    )
+
+    # The variable value is used before the value to add is computed, so an
+    # unassigned variable raises first.
+    return "%s.asObject();\n%s.inplaceAdd( %s );" % (
+        variable_code,
+        variable_code,
+        identifier.getCodeTemporaryRef()
+    )
+
 def getAssignmentTempKeeperCode( source_identifier, variable, context ):
     ref_count = source_identifier.getCheapRefCount()
     variable_name = variable.getName()
@@ -1074,18 +1294,73 @@ def getTryExceptCode( context, code_tried, handler_codes ):
         "tb_making"      : tb_making.getCodeExportRef(),
     }
 
-def getTryNextExceptStopIterationIdentifier( context ):
+def getExceptionFreeLookupIdentifier( context ):
     try_count = context.allocateTryNumber()
 
-    return Identifier( "_tmp_unpack_%d" % try_count, 1 )
+    return Identifier( "_tmp_lookup_%d" % try_count, 1 )
 
-def getTryNextExceptStopIterationCode( source_identifier, handler_code, assign_code, temp_identifier ):
-    return CodeTemplates.template_try_next_except_stop_iteration % {
-        "temp_var"          : temp_identifier.getCode(),
-        "handler_code"      : indented( handler_code ),
-        "assignment_code"   : assign_code,
-        "source_identifier" : source_identifier.getCodeTemporaryRef()
-    }
+def getExceptionFreeLookupCode( context, lookup_identifier, handler_code,
+                                assign_code, temp_identifier, caught ):
+    if caught:
+        handler_code = list( handler_code or () )
+
+        # The traceback has the line number of the frame.
+        if handler_code:
+            handler_code.insert(
+                0,
+                CodeTemplates.template_setup_except_handler_detaching % {
+                }
+            )
+
+        return CodeTemplates.template_try_lookup_except_caught % {
+            "temp_var"          : temp_identifier.getCode(),
+            "handler_code"      : indented( handler_code ),
+            "assignment_code"   : indented( assign_code ),
+            "lookup_identifier" : lookup_identifier.getCodeExportRef(),
+            "guard_class"       : context.getFrameGuardClass(),
+            "tb_making"         : getTracebackMakingIdentifier(
+                context = context
+            ).getCodeExportRef()
+        }
+    else:
+        return CodeTemplates.template_try_lookup_except_not_found_aborting % {
+            "temp_var"          : temp_identifier.getCode(),
+            "handler_code"      : indented( handler_code ),
+            "assignment_code"   : assign_code,
+            "lookup_identifier" : lookup_identifier.getCodeExportRef()
+        }
+
+def getIteratorNextOrNullCode( iterator ):
+    return Identifier(
+        "ITERATOR_NEXT( %s )" % iterator.getCodeTemporaryRef(),
+        1
+    )
+
+def getIteratorNextOrErrorCode( iterator ):
+    return Identifier(
+        "BUILTIN_NEXT1_OR_ERROR( %s )" % iterator.getCodeTemporaryRef(),
+        1
+    )
+
+def getSubscriptLookupOrErrorCode( context, order_relevance, subscript, source ):
+    return getOrderRelevanceEnforcedArgsCode(
+        helper          = "LOOKUP_SUBSCRIPT_OR_ERROR",
+        export_ref      = 0,
+        ref_count       = 1,
+        tmp_scope       = "subscr",
+        order_relevance = order_relevance,
+        args            = ( source, subscript ),
+        context         = context
+    )
+
+def getAttributeLookupOrErrorCode( attribute, source ):
+    return Identifier(
+        "LOOKUP_ATTRIBUTE_OR_ERROR( %s, %s )" % (
+            source.getCodeTemporaryRef(),
+            attribute.getCodeTemporaryRef()
+        ),
+        1
+    )
 
 
 def getRaiseExceptionWithCauseCode( context, order_relevance, exception_type,
@@ -2422,8 +2697,25 @@ def getFunctionCode( context, function_name, function_qualname,
         constant = function_doc
     )
 
+    if context.isForCreatedFunction() or Options.shallProfileRuntime():
+        code_identifier = context.getCodeObjectHandle(
+            filename      = source_ref.getFilename(),
+            arg_names     = parameters.getCoArgNames(),
+            kw_only_count = parameters.getKwOnlyParameterCount(),
+            line_number   = source_ref.getLineNumber(),
+            code_name     = function_name,
+            is_generator  = False,
+            is_optimized  = not context.hasLocalsDict()
+        )
+
     function_locals = []
 
+    # First, so the release of the local variables is measured too.
+    if Options.shallProfileRuntime():
+        function_locals.append(
+            "PROFILE_FUNCTION( %s );" % code_identifier.getCodeTemporaryRef()
+        )
+
     if context.hasLocalsDict():
         function_locals += CodeTemplates.function_dict_setup.split("\n")
 
@@ -2497,16 +2789,6 @@ def getFunctionCode( context, function_name, function_qualname,
         )
 
     if context.isForCreatedFunction():
-        code_identifier = context.getCodeObjectHandle(
-            filename      = source_ref.getFilename(),
-            arg_names     = parameters.getCoArgNames(),
-            kw_only_count = parameters.getKwOnlyParameterCount(),
-            line_number   = source_ref.getLineNumber(),
-            code_name     = function_name,
-            is_generator  = False,
-            is_optimized  = not context.hasLocalsDict()
-        )
-
         if context_decl:
             result += CodeTemplates.make_function_with_context_template % {
                 "function_name_obj"          : function_name_obj,
@@ -2672,9 +2954,14 @@ def getMakeDictsCode( context ):
 
 def getConstantsDeclarationCode( context ):
     constants_declarations = CodeTemplates.template_constants_declaration % {
-        "constant_declarations" : getConstantsDeclCode(
+        "constant_declarations"             : getConstantsDeclCode(
             context    = context,
             for_header = True
+        ),
+        "module_constant_init_declarations" : "\n".join(
+            "void _initModuleConstants_%s( void );" % module_code_name
+            for module_code_name in
+            context.getModuleCodeNames()
         )
     }
 
@@ -2683,18 +2970,131 @@ def getConstantsDeclarationCode( context ):
         "header_body"       : constants_declarations
     }
 
-def getConstantsDefinitionCode( context ):
-    return CodeTemplates.template_constants_reading % {
-        "constant_declarations" : getConstantsDeclCode(
-            context    = context,
-            for_header = False
-        ),
-        "constant_inits"        : getConstantsInitCode(
-            context    = context
-        ),
-        "needs_pickle"          : "true" if needsPickleInit() else "false"
+# The number of constant creation statements that go into one part, and the
+# amount that is put into one translation unit.
+_constants_part_size = 1000
+
+def _getConstantsParts( inits, parts ):
+    """ Move the statements into parts of limited size, return their calls. """
+
+    result = []
+
+    for count in range( 0, len( inits ), _constants_part_size ):
+        part_number = len( parts ) + 1
+
+        parts.append(
+            CodeTemplates.template_constants_part % {
+                "part_number"    : part_number,
+                "constant_inits" : indented(
+                    inits[ count : count + _constants_part_size ]
+                )
+            }
+        )
+
+        result.append( "_initConstantsPart%d();" % part_number )
+
+    return result
+
+def getConstantsDefinitionCodes( context, constants_blob_filename ):
+    """ Get the codes for creating the constants.
+
+        The first one is "__constants.cpp", for large amounts of constants,
+        the creation is done in parts, and these are put into more files, so
+        they can be compiled in parallel.
+    """
+
+    constant_declarations = getConstantsDeclCode(
+        context    = context,
+        for_header = False
+    )
+
+    constant_inits, module_constant_inits = getConstantsInitCode(
+        context    = context
+    )
+
+    shard_codes = []
+
+    total = len( constant_inits ) + sum(
+        len( inits )
+        for inits in
+        module_constant_inits.values()
+    )
+
+    if total > _constants_part_size:
+        parts = []
+
+        constant_inits = _getConstantsParts( constant_inits, parts )
+
+        for module_code_name in sorted( module_constant_inits ):
+            module_constant_inits[ module_code_name ] = _getConstantsParts(
+                module_constant_inits[ module_code_name ],
+                parts
+            )
+
+        constant_declarations += "\n\n" + "\n".join(
+            "void _initConstantsPart%d( void );" % ( count + 1 )
+            for count in
+            range( len( parts ) )
+        )
+
+        # Fill the translation units with parts, up to the size of a part, the
+        # small parts of modules are therefore combined.
+        shard_parts = []
+        shard_size = 0
+
+        for part in parts:
+            part_size = part.count( "\n" )
+
+            if shard_parts and shard_size + part_size > _constants_part_size:
+                shard_codes.append( shard_parts )
+
+                shard_parts = []
+                shard_size = 0
+
+            shard_parts.append( part )
+            shard_size += part_size
+
+        shard_codes.append( shard_parts )
+
+        shard_codes = [
+            CodeTemplates.template_constants_shard % {
+                "contained_constant_declarations" :
+                    getContainedConstantsDeclCode(
+                        context    = context,
+                        used_names = set(
+                            re.findall( r"\b_python_\w+", "".join( shard_parts ) )
+                        )
+                    ),
+                "constant_parts"                  : "\n".join( shard_parts )
+            }
+            for shard_parts in
+            shard_codes
+        ]
+
+    # For use in an assembler string inside a C++ string.
+    constants_blob_filename = constants_blob_filename.replace( "\\", "/" )
+    constants_blob_filename = constants_blob_filename.replace( '"', '\\\\\\"' )
+
+    constants_code = CodeTemplates.template_constants_reading % {
+        "constants_blob_name"     : Utils.basename( constants_blob_filename ),
+        "constants_blob_filename" : constants_blob_filename,
+        "constant_declarations"   : constant_declarations,
+        "constant_inits"          : indented( constant_inits ),
+        "module_constant_inits"   : "\n".join(
+            CodeTemplates.template_module_constants_init % {
+                "module_identifier" : module_code_name,
+                "constant_inits"    : indented(
+                    module_constant_inits[ module_code_name ],
+                    2
+                )
+            }
+            for module_code_name in
+            sorted( module_constant_inits )
+        )
     }
 
+    return [ constants_code ] + shard_codes
+
 def getCurrentExceptionTypeCode():
     return Identifier(
         "_exception.getType()",
@@ -2813,3 +3213,81 @@ def getFrameGuardVeryLightCode( codes ):
     return CodeTemplates.frame_guard_listcontr_template % {
         "codes"             : indented( codes, 0 ),
     }
+
+def _getSplitCodeParameters( context, provider ):
+    # The split code uses the frame guard and local variables of the function
+    # it was split off from, which are passed by reference. Module variables
+    # are global anyway.
+    parameters = [ ( "FrameGuard", "frame_guard" ) ]
+
+    if provider.isExpressionFunctionBody():
+        for variable in provider.getClosureVariables() + provider.getUserLocalVariables():
+            parameters.append(
+                (
+                    variable.getDeclarationTypeCode( in_context = False ),
+                    getVariableCode(
+                        variable = variable,
+                        context  = context
+                    )
+                )
+            )
+
+        if context.hasLocalsDict():
+            parameters.append( ( "PyObjectTemporary", "locals_dict" ) )
+
+    return parameters
+
+def getSplitStatementCodes( statement_codes, code_name, provider, limit,
+                            context ):
+    """ Split the statement codes into functions of at most "limit" lines.
+
+        Statements are not split, so a single one can be larger. The result
+        is the calls of these functions in place of the statements.
+    """
+
+    parts = [ [] ]
+
+    for codes in statement_codes:
+        if parts[-1] and len( parts[-1] ) + len( codes ) > limit:
+            parts.append( [] )
+
+        parts[-1] += codes
+
+    parameters = _getSplitCodeParameters(
+        context  = context,
+        provider = provider
+    )
+
+    split_parameters_decl = ", ".join(
+        "%s &%s" % ( type_code, name )
+        for type_code, name in
+        parameters
+    )
+
+    result = []
+
+    for count, codes in enumerate( parts ):
+        split_identifier = "%s_part_%d" % ( code_name, count + 1 )
+
+        context.addFunctionCodes(
+            code_name     = split_identifier,
+            function_decl = CodeTemplates.template_split_code_decl % {
+                "split_identifier"      : split_identifier,
+                "split_parameters_decl" : split_parameters_decl
+            },
+            function_code = CodeTemplates.template_split_code_body % {
+                "code_name"             : code_name,
+                "split_identifier"      : split_identifier,
+                "split_parameters_decl" : split_parameters_decl,
+                "codes"                 : indented( codes )
+            }
+        )
+
+        result.append(
+            CodeTemplates.template_split_code_call % {
+                "split_identifier" : split_identifier,
+                "split_parameters" : ", ".join( name for _type_code, name in parameters )
+            }
+        )
+
+    return result
@@ -0,0 +1,144 @@
+#     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+#
+#     Part of "Nuitka", an optimizing Python compiler that is compatible and
+#     integrates with CPython, but also works on its own.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+""" Report of the generated code size and its compile costs.
+
+For every module, the generated C++ code of the module and each of its
+functions is measured: lines, bytes, temporaries, and the calls of helpers by
+name, these are the upper case identifiers called, e.g. "LOOKUP_ATTRIBUTE".
+After compilation, the object file sizes and the compile times recorded for the
+compile costs are added, and the report is written in JSON format.
+"""
+
+from nuitka import Utils
+
+from ..build import CompileCosts
+
+import os, re, json
+
+_temporary_pattern = re.compile( r"\bPyObjectTemp\w*\b" )
+_helper_call_pattern = re.compile( r"\b([A-Z][A-Z0-9_]+)\s*\(" )
+
+# The files generated, in the order of writing.
+_module_reports = []
+_file_reports = []
+
+def getCodeStatistics( code ):
+    helper_calls = {}
+
+    for helper_name in _helper_call_pattern.findall( code ):
+        helper_calls[ helper_name ] = helper_calls.get( helper_name, 0 ) + 1
+
+    return {
+        "lines"        : code.count( "\n" ),
+        "bytes"        : len( code ),
+        "temporaries"  : len( _temporary_pattern.findall( code ) ),
+        "helper_calls" : helper_calls
+    }
+
+def addModuleCode( module_name, filename, source_code, context ):
+    """ Note the generated code of a module, with the one of its functions. """
+
+    report = getCodeStatistics( source_code )
+
+    report[ "module" ] = module_name
+    report[ "file" ] = filename
+    report[ "functions" ] = []
+
+    for code_name, ( _function_decl, function_code ) in sorted( context.getFunctionsCodes().items() ):
+        function_report = getCodeStatistics( function_code )
+        function_report[ "function" ] = code_name
+
+        report[ "functions" ].append( function_report )
+
+    # The largest functions are the interesting ones.
+    report[ "functions" ].sort( key = lambda entry : -entry[ "bytes" ] )
+
+    _module_reports.append( report )
+
+def addFileCode( filename, source_code ):
+    """ Note generated code that does not belong to a module. """
+
+    report = getCodeStatistics( source_code )
+    report[ "file" ] = filename
+
+    _file_reports.append( report )
+
+def _getObjectSize( filename ):
+    base_filename = os.path.splitext( filename )[0]
+
+    for suffix in ( ".o", ".os", ".obj" ):
+        if Utils.isFile( base_filename + suffix ):
+            return os.path.getsize( base_filename + suffix )
+
+    return None
+
+def _getRuntimeObjectSizes( source_dir ):
+    # The run time files are compiled in sub directories of the build
+    # directory, some nested deeper, e.g. "static/x64_ucontext_src".
+    result = {}
+
+    for dirpath, _dirnames, filenames in os.walk( source_dir ):
+        for filename in filenames:
+            if os.path.splitext( filename )[1] in ( ".o", ".os", ".obj" ):
+                result[ CompileCosts.getCostKey( filename ) ] = \
+                  os.path.getsize( os.path.join( dirpath, filename ) )
+
+    return result
+
+def writeReport( report_filename, source_dir ):
+    durations = CompileCosts.loadCosts( source_dir )[ "durations" ]
+
+    reported_keys = set()
+
+    for report in _module_reports + _file_reports:
+        cost_key = CompileCosts.getCostKey( report[ "file" ] )
+        reported_keys.add( cost_key )
+
+        report[ "object_size" ] = _getObjectSize( report[ "file" ] )
+        report[ "compile_time" ] = durations.get( cost_key )
+
+    # The run time files are not generated, but take their share too.
+    runtime_reports = []
+    object_sizes = _getRuntimeObjectSizes( source_dir )
+
+    for cost_key, duration in sorted( durations.items() ):
+        if cost_key in reported_keys:
+            continue
+
+        runtime_reports.append(
+            {
+                "file"         : cost_key,
+                "object_size"  : object_sizes.get( cost_key ),
+                "compile_time" : duration
+            }
+        )
+
+    with open( report_filename, "w" ) as report_file:
+        json.dump(
+            {
+                "modules" : sorted(
+                    _module_reports,
+                    key = lambda entry : -entry[ "bytes" ]
+                ),
+                "files"   : _file_reports,
+                "runtime" : runtime_reports
+            },
+            report_file,
+            indent    = 1,
+            sort_keys = True
+        )
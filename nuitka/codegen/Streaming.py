@@ -0,0 +1,251 @@
+#     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+#
+#     Part of "Nuitka", an optimizing Python compiler that is compatible and
+#     integrates with CPython, but also works on its own.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+""" Streaming of constants in a format of our own.
+
+The constants that cannot be created directly from C++ code are written into a
+compact byte stream, that "UNSTREAM_CONSTANT" of the run time reads back. This
+is much faster than using pickle, and needs no module to be imported for it.
+
+The stream starts with the number of values that may be referenced later on,
+then the value follows. Each value starts with a tag character, followed by its
+data. Sizes are given as unsigned LEB128 numbers. Immutable values that occur
+more than once are written only once, the repetitions refer back to them by
+number. These must be kept in sync with the C++ code.
+"""
+
+from nuitka import Constants, Utils
+
+# pylint: disable=W0622
+from ..__past__ import unicode, long
+# pylint: enable=W0622
+
+import struct, binascii
+
+_builtin_types = Constants.constant_builtin_types
+
+def _encodeSize( value ):
+    assert value >= 0
+
+    result = bytearray()
+
+    while value >= 0x80:
+        result.append( 0x80 | ( value & 0x7f ) )
+        value >>= 7
+
+    result.append( value )
+
+    return result
+
+def _encodeFloat( value ):
+    return struct.pack( ">d", value )
+
+def _getMemoKey( value ):
+    """ Get a key, that identifies an immutable value including its type.
+
+        Returns None for values that cannot be shared.
+    """
+
+    # Many cases, all returning, pylint: disable=R0911
+
+    value_type = type( value )
+
+    if value_type in ( str, unicode, bytes, int, long, bool ) or \
+       value is None or value is Ellipsis:
+        return value_type, value
+    elif value_type is float:
+        return value_type, _encodeFloat( value )
+    elif value_type is complex:
+        return value_type, _encodeFloat( value.real ), _encodeFloat( value.imag )
+    elif value_type in ( tuple, frozenset ):
+        keys = tuple( _getMemoKey( element ) for element in value )
+
+        if None in keys:
+            return None
+
+        return value_type, keys if value_type is tuple else frozenset( keys )
+    elif value_type is type:
+        return value_type, value
+    else:
+        return None
+
+
+def getDictInsertionOrder( value ):
+    """ Get the items of a dictionary in the order to add them.
+
+        With hash collisions, the order of adding the keys decides the order
+        of iteration. Use one that gives the order of the constant for its
+        copies, if one of the obvious ones does, otherwise None.
+    """
+
+    items = list( value.items() )
+
+    for candidate in ( items, items[ : : -1 ] ):
+        if list( dict( candidate ).copy() ) == list( value ):
+            return candidate
+
+    return None
+
+
+class _ConstantStreamWriter:
+    def __init__( self ):
+        self.memo = {}
+        self.stream = bytearray()
+
+    def _writeSize( self, value ):
+        self.stream.extend( _encodeSize( value ) )
+
+    def _writeData( self, tag, data ):
+        self.stream.extend( tag )
+        self._writeSize( len( data ) )
+        self.stream.extend( data )
+
+    def _writeElements( self, tag, elements ):
+        self.stream.extend( tag )
+        self._writeSize( len( elements ) )
+
+        for element in elements:
+            self.writeValue( element )
+
+    def _writeInteger( self, value, is_long ):
+        # The Python2 "int" always fits into a C "long", for Python3, only the
+        # small ones are done like this.
+        if not is_long and \
+           ( Utils.python_version < 300 or -2**31 < value < 2**31 ):
+            self.stream.extend( b"i" )
+            self._writeSize( ( value << 1 ) if value >= 0 else ( ( -value << 1 ) - 1 ) )
+
+            return False
+
+        magnitude = "%x" % abs( value )
+
+        if len( magnitude ) % 2:
+            magnitude = "0" + magnitude
+
+        # Little endian bytes of the magnitude, the sign is in the tag.
+        data = bytearray( binascii.unhexlify( magnitude.encode( "ascii" ) ) )
+        data.reverse()
+
+        if value == 0:
+            data = bytearray()
+
+        self._writeData( b"m" if value < 0 else b"l", data )
+
+        return True
+
+    def writeValue( self, value ):
+        # Many cases for the many types, pylint: disable=R0912,R0915
+
+        key = _getMemoKey( value )
+
+        if key is not None and key in self.memo:
+            self.stream.extend( b"M" )
+            self._writeSize( self.memo[ key ] )
+
+            return
+
+        value_type = type( value )
+
+        # Whether the value is remembered, must match the C++ code.
+        memoize = True
+
+        if value is None:
+            self.stream.extend( b"N" )
+            memoize = False
+        elif value is True:
+            self.stream.extend( b"T" )
+            memoize = False
+        elif value is False:
+            self.stream.extend( b"F" )
+            memoize = False
+        elif value is Ellipsis:
+            self.stream.extend( b"E" )
+            memoize = False
+        elif value_type is bytes:
+            self._writeData( b"s", value )
+        elif value_type is unicode:
+            if Utils.python_version < 300:
+                encoded = value.encode( "utf-8" )
+            else:
+                encoded = value.encode( "utf-8", "surrogatepass" )
+
+            self._writeData( b"u", encoded )
+        elif value_type is int:
+            memoize = self._writeInteger( value, False )
+        elif value_type is long:
+            memoize = self._writeInteger( value, True )
+        elif value_type is float:
+            self.stream.extend( b"f" )
+            self.stream.extend( _encodeFloat( value ) )
+        elif value_type is complex:
+            self.stream.extend( b"j" )
+            self.stream.extend( _encodeFloat( value.real ) )
+            self.stream.extend( _encodeFloat( value.imag ) )
+        elif value_type is tuple:
+            # With mutable elements, it cannot be shared, and is not remembered.
+            if key is None:
+                self._writeElements( b"a", value )
+                memoize = False
+            else:
+                self._writeElements( b"t", value )
+        elif value_type is frozenset:
+            self._writeElements( b"z", tuple( value ) )
+        elif value_type is list:
+            self._writeElements( b"L", value )
+            memoize = False
+        elif value_type is set:
+            self._writeElements( b"S", tuple( value ) )
+            memoize = False
+        elif value_type is dict:
+            self.stream.extend( b"d" )
+            self._writeSize( len( value ) )
+
+            items = getDictInsertionOrder( value ) or value.items()
+
+            for dict_key, dict_value in items:
+                self.writeValue( dict_key )
+                self.writeValue( dict_value )
+
+            memoize = False
+        elif Utils.python_version >= 300 and value_type is range:
+            # The "__reduce__" is the only way to get at the parameters of it
+            # for all versions.
+            self._writeElements( b"r", value.__reduce__()[1] )
+            memoize = False
+        elif value_type is type:
+            assert value in _builtin_types, value
+
+            self.stream.extend( b"y" )
+            self._writeSize( _builtin_types.index( value ) )
+            memoize = False
+        else:
+            assert False, ( value_type, value )
+
+        if memoize:
+            assert key is not None, value
+
+            self.memo[ key ] = len( self.memo )
+
+    def getStream( self ):
+        return bytes( _encodeSize( len( self.memo ) ) + self.stream )
+
+
+def getStreamedConstant( constant_value ):
+    writer = _ConstantStreamWriter()
+    writer.writeValue( constant_value )
+
+    return writer.getStream()
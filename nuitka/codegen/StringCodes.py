@@ -0,0 +1,96 @@
+#     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+#
+#     Part of "Nuitka", an optimizing Python compiler that is compatible and
+#     integrates with CPython, but also works on its own.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+""" Code generation for string building.
+
+The "%" operator with a constant format string and the concatenation of several
+strings with "+" are done with dedicated helpers, that avoid to parse the format
+at run time and to create the intermediate strings.
+"""
+
+from .Identifiers import Identifier
+
+# Must match "NUITKA_STRING_FORMAT_MAX" of the C++ helper.
+_max_format_conversions = 16
+
+def parseFormatString( format_string ):
+    """ Split a format string into literal pieces and conversions.
+
+        Returns a tuple of the pieces, one more than there are conversions, a
+        string of the conversion characters, and a tuple of the format from
+        each conversion on, or None if the format uses anything but plain
+        "%s", "%r", "%d", "%i" and "%%".
+    """
+
+    pieces = []
+    conversions = []
+    suffixes = []
+
+    current = []
+    pos = 0
+
+    while True:
+        next_pos = format_string.find( "%", pos )
+
+        if next_pos == -1:
+            current.append( format_string[ pos : ] )
+            break
+
+        current.append( format_string[ pos : next_pos ] )
+
+        if next_pos + 1 == len( format_string ):
+            return None
+
+        conversion = format_string[ next_pos + 1 ]
+
+        if conversion == "%":
+            current.append( "%" )
+        elif conversion in "srdi":
+            pieces.append( "".join( current ) )
+            current = []
+
+            conversions.append( "d" if conversion == "i" else conversion )
+            suffixes.append( format_string[ next_pos : ] )
+        else:
+            return None
+
+        pos = next_pos + 2
+
+    pieces.append( "".join( current ) )
+
+    if not conversions or len( conversions ) > _max_format_conversions:
+        return None
+
+    return tuple( pieces ), "".join( conversions ), tuple( suffixes )
+
+def getStringFormatCode( pieces_identifier, suffixes_identifier, conversions,
+                         values_identifier ):
+    return Identifier(
+        "STRING_FORMAT( %s, %s, \"%s\", %s )" % (
+            pieces_identifier.getCodeTemporaryRef(),
+            suffixes_identifier.getCodeTemporaryRef(),
+            conversions,
+            values_identifier.getCodeTemporaryRef()
+        ),
+        1
+    )
+
+def getStringConcatenationCode( operands_identifier ):
+    return Identifier(
+        "STRING_CONCAT( %s )" % operands_identifier.getCodeTemporaryRef(),
+        1
+    )
@@ -22,6 +22,42 @@
 template_constants_reading = """
 #include "nuitka/prelude.hpp"
 
+// The data of the constants is in one blob, "%(constants_blob_name)s", that is
+// included into the binary unchanged. With MSVC, which has no inline assembler
+// for this, the build creates a C++ file that defines it.
+#if defined(__GNUC__)
+
+#define _NUITKA_STRINGIZE( name ) #name
+#define _NUITKA_ASM_NAME( prefix, name ) _NUITKA_STRINGIZE( prefix ) #name
+#define _NUITKA_CONSTANT_BIN _NUITKA_ASM_NAME( __USER_LABEL_PREFIX__, constant_bin )
+
+#if defined(_WIN32)
+#define _NUITKA_CONSTANT_BIN_SECTION ".section .rdata,\\"dr\\"\\n"
+#define _NUITKA_CONSTANT_BIN_VISIBILITY ""
+#define _NUITKA_CONSTANT_BIN_END ".previous\\n"
+#elif defined(__APPLE__)
+#define _NUITKA_CONSTANT_BIN_SECTION ".const_data\\n"
+#define _NUITKA_CONSTANT_BIN_VISIBILITY ".private_extern " _NUITKA_CONSTANT_BIN "\\n"
+#define _NUITKA_CONSTANT_BIN_END ".text\\n"
+#else
+#define _NUITKA_CONSTANT_BIN_SECTION ".section .rodata\\n"
+#define _NUITKA_CONSTANT_BIN_VISIBILITY ".hidden " _NUITKA_CONSTANT_BIN "\\n"
+#define _NUITKA_CONSTANT_BIN_END ".previous\\n"
+#endif
+
+asm(
+    _NUITKA_CONSTANT_BIN_SECTION
+    ".globl " _NUITKA_CONSTANT_BIN "\\n"
+    _NUITKA_CONSTANT_BIN_VISIBILITY
+    ".balign 16\\n"
+    _NUITKA_CONSTANT_BIN ":\\n"
+    ".incbin \\"%(constants_blob_filename)s\\"\\n"
+    ".byte 0\\n"
+    _NUITKA_CONSTANT_BIN_END
+);
+
+#endif
+
 // Sentinel PyObject to be used for all our call iterator endings. It will become
 // a PyCObject pointing to NULL. It's address is unique, and that's enough.
 PyObject *_sentinel_value = NULL;
@@ -30,11 +66,6 @@ PyObject *_sentinel_value = NULL;
 
 static void __initConstants( void )
 {
-    if ( %(needs_pickle)s )
-    {
-        UNSTREAM_INIT();
-    }
-
 %(constant_inits)s
 }
 
@@ -53,11 +84,49 @@ void _initConstants( void )
         __initConstants();
     }
 }
+
+%(module_constant_inits)s
+"""
+
+template_module_constants_init = """\
+// The constants used only by module "%(module_identifier)s", created on its import.
+void _initModuleConstants_%(module_identifier)s( void )
+{
+    static bool init_done = false;
+
+    if ( init_done == false )
+    {
+        init_done = true;
+
+%(constant_inits)s
+    }
+}
+"""
+
+template_constants_shard = """
+#include "nuitka/prelude.hpp"
+
+#include "__constants.hpp"
+
+// The constants only used as part of other constants.
+%(contained_constant_declarations)s
+
+%(constant_parts)s
+"""
+
+template_constants_part = """\
+void _initConstantsPart%(part_number)d( void )
+{
+%(constant_inits)s
+}
 """
 
 template_constants_declaration = """\
 // Call this to initialize all of the below
 void _initConstants( void );
 
+// Call these to initialize the ones only used by one module.
+%(module_constant_init_declarations)s
+
 %(constant_declarations)s
 """
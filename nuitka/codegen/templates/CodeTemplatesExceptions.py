@@ -178,14 +178,41 @@ if ( _return_value_%(try_count)d.isKeeping() )
 }"""
 
 
-# Very special template for:
+# Very special template for lookups that tell a failure without throwing:
 # try:
-#  x = next(iter)
-# except StopIteration:
+#  x = next(iter)        or d[k], or o.attr
+# except StopIteration:  or KeyError, or AttributeError
 #  handler_code
+#
+# The lookup leaves the exception set, which the handler gets, as it would if
+# it were thrown.
+
+template_try_lookup_except_caught = """\
+PyObject *%(temp_var)s = %(lookup_identifier)s;
+
+if ( %(temp_var)s == NULL )
+{
+    PythonException _exception;
+    _exception.setTraceback( %(tb_making)s );
+
+    frame_guard.preserveExistingException();
+
+#if PYTHON_VERSION >= 300
+    ExceptionRestorer%(guard_class)s restorer( &frame_guard );
+#endif
+    _exception.toExceptionHandler();
+
+%(handler_code)s
+}
+else
+{
+%(assignment_code)s
+}"""
 
-template_try_next_except_stop_iteration = """\
-PyObject *%(temp_var)s = ITERATOR_NEXT( %(source_identifier)s );
+# Same, for "next" with handlers that abort, i.e. for loops, which do not make
+# the "StopIteration" the current exception, so none is created.
+template_try_lookup_except_not_found_aborting = """\
+PyObject *%(temp_var)s = %(lookup_identifier)s;
 
 if ( %(temp_var)s == NULL )
 {
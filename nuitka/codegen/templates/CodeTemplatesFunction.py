@@ -27,6 +27,47 @@ template_function_direct_declaration = """\
 %(file_scope)s PyObject *impl_%(function_identifier)s( %(direct_call_arg_spec)s );
 """
 
+template_function_direct_call_declaration = """\
+static PyObject *%(call_helper_identifier)s( %(call_helper_arg_spec)s );
+"""
+
+template_function_direct_call_helper = """
+// Call helper for a compiled function that is known at compile time. If the called
+// object is still that compiled function, the argument parsing is avoided, otherwise
+// this is a normal call.
+static PyObject *%(call_helper_identifier)s( %(call_helper_arg_spec)s )
+{
+    if ( Nuitka_Function_Check( called ) && ((Nuitka_FunctionObject *)called)->m_code == (void *)%(parse_function_identifier)s )
+    {
+        NUITKA_MAY_BE_UNUSED Nuitka_FunctionObject *self = (Nuitka_FunctionObject *)called;
+
+        if (unlikely( Py_EnterRecursiveCall( (char *)" while calling a Python object" ) ))
+        {
+            throw PythonException();
+        }
+
+        PyObject *result = %(impl_function_identifier)s( %(impl_function_args)s );
+
+        Py_LeaveRecursiveCall();
+
+        if (unlikely( result == NULL ))
+        {
+            throw PythonException();
+        }
+
+        return result;
+    }
+    else
+    {
+        return CALL_FUNCTION(
+            called,
+            %(fallback_positional_args)s,
+            %(fallback_named_args)s
+        );
+    }
+}
+"""
+
 function_context_body_template = """
 // This structure is for attachment as self of %(function_identifier)s.
 // It is allocated at the time the function object is created.
@@ -165,6 +206,8 @@ catch ( PythonException &_exception )
     {
         _exception.addTraceback( frame_guard.getFrame0() );
     }
+
+    TRACE_EXCEPTION( frame_guard, _exception );
 %(frame_locals)s
     if ( frame_guard.getFrame0() == frame_%(frame_identifier)s )
     {
@@ -207,6 +250,8 @@ catch ( PythonException &_exception )
         _exception.addTraceback( frame_guard.getFrame0() );
     }
 
+    TRACE_EXCEPTION( frame_guard, _exception );
+
 #if 0
 // TODO: Recognize the need for it
     Py_XDECREF( frame_guard.getFrame0()->f_locals );
@@ -222,6 +267,21 @@ template_frame_locals_update = """\
 Py_XDECREF( frame_guard.getFrame0()->f_locals );
 frame_guard.getFrame0()->f_locals = %(locals_identifier)s;"""
 
+template_split_code_decl = """\
+NUITKA_COLD static void impl_%(split_identifier)s( %(split_parameters_decl)s );
+"""
+
+template_split_code_body = """\
+// Part of the code of "%(code_name)s", split off for the C++ compiler.
+static void impl_%(split_identifier)s( %(split_parameters_decl)s )
+{
+%(codes)s
+}
+"""
+
+template_split_code_call = """\
+impl_%(split_identifier)s( %(split_parameters)s );"""
+
 # Bad to read, but the context declaration should be on one line.
 # pylint: disable=C0301
 
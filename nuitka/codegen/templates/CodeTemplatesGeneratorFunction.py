@@ -207,6 +207,8 @@ catch ( PythonException &_exception )
     {
         _exception.addTraceback( generator->m_frame );
     }
+
+    TRACE_EXCEPTION( frame_guard, _exception );
     _exception.toPython();
 
     // TODO: Moving this code is not allowed yet.
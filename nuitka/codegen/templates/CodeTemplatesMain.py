@@ -47,6 +47,8 @@ main_program = """\
 
 int main( int argc, char *argv[] )
 {
+    STARTUP_TRACE_PHASE( "main" );
+
 #ifdef _NUITKA_PORTABLE
     _initPortableEnvironment( argv[0] );
 #endif
@@ -83,6 +85,12 @@ int main( int argc, char *argv[] )
 #endif
     Py_Initialize();
 
+#ifdef _NUITKA_PORTABLE_SINGLE_FILE
+    registerPayloadImporter();
+#endif
+
+    STARTUP_TRACE_PHASE( "Py_Initialize" );
+
     setCommandLineParameters( argc, argv );
 
     // Initialize the constant values used.
@@ -90,6 +98,8 @@ int main( int argc, char *argv[] )
     _initConstants();
     _initBuiltinOriginalValues();
 
+    STARTUP_TRACE_PHASE( "constants" );
+
     // Initialize the compiled types of Nuitka.
     PyType_Ready( &Nuitka_Generator_Type );
     PyType_Ready( &Nuitka_Function_Type );
@@ -98,6 +108,8 @@ int main( int argc, char *argv[] )
 
     enhancePythonTypes();
 
+    STARTUP_TRACE_PHASE( "types" );
+
     // Set the sys.executable path to the original Python executable on Linux
     // or to python.exe on Windows.
     PySys_SetObject(
@@ -109,6 +121,10 @@ int main( int argc, char *argv[] )
 
     patchBuiltinModule();
 
+    PROFILE_INIT();
+
+    STARTUP_TRACE_PHASE( "patching" );
+
     // Execute the "__main__" module init function.
     MOD_INIT_NAME( __main__ )();
 
@@ -315,10 +331,19 @@ MOD_INIT_DECL( %(module_identifier)s )
     // In case of a stand alone extension module, need to call initialization the init here
     // because that's how we are going to get called here.
 
+    STARTUP_TRACE_PHASE( "module" );
+
+#ifdef _NUITKA_SHARED_RUNTIME
+    // The shared run time has constants of its own.
+    _initRuntimeConstants();
+#endif
+
     // Initialize the constant values used.
     _initBuiltinModule();
     _initConstants();
 
+    STARTUP_TRACE_PHASE( "constants" );
+
     // Initialize the compiled types of Nuitka.
     PyType_Ready( &Nuitka_Generator_Type );
     PyType_Ready( &Nuitka_Function_Type );
@@ -328,8 +353,17 @@ MOD_INIT_DECL( %(module_identifier)s )
     patchInspectModule();
 
     patchBuiltinModule();
+
+    PROFILE_INIT();
+
+    STARTUP_TRACE_PHASE( "types and patching" );
 #endif
 
+    STARTUP_TRACE_MODULE( "%(module_name)s" );
+
+    // Create the constants only this module uses, on its first import only.
+    _initModuleConstants_%(module_identifier)s();
+
 #if _MODULE_UNFREEZER
     registerMetaPathBasedUnfreezer( _frozen_modules );
 #endif
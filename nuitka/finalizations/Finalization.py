@@ -24,6 +24,7 @@ many times.
 """
 from .FinalizeMarkups import FinalizeMarkups
 from .FinalizeClosureTaking import FinalizeClosureTaking
+from .FinalizeDirectCalls import FinalizeDirectCalls
 
 # Bug of pylint, it's there but it reports it wrongly, pylint: disable=E0611
 from nuitka.tree import Operations
@@ -31,3 +32,7 @@ from nuitka.tree import Operations
 def prepareCodeGeneration( tree ):
     Operations.visitScopes( tree, visitor = FinalizeMarkups() )
     Operations.visitFunctions( tree, visitor = FinalizeClosureTaking() )
+
+    direct_calls = FinalizeDirectCalls()
+    Operations.visitScopes( tree, visitor = direct_calls )
+    direct_calls.markDirectCalls()
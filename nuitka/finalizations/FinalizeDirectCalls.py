@@ -0,0 +1,150 @@
+#     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+#
+#     Part of "Nuitka", an optimizing Python compiler that is compatible and
+#     integrates with CPython, but also works on its own.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+""" Finalize the direct calls
+
+Find calls to variables that are only ever assigned once, and that from a function
+creation, e.g. a module level "def" without decorators or a local function that is not
+reassigned. These calls are marked with the function body, so code generation can map
+keyword arguments to positions and defaults at compile time, and call the implementation
+of the function directly.
+
+The code generation still checks at run time, that the called value is the expected
+compiled function, as module variables may be changed from the outside, and falls back
+to a normal call otherwise.
+
+"""
+
+from .FinalizeBase import FinalizationVisitorBase
+
+from nuitka.nodes.ParameterSpecs import TooManyArguments, matchCall
+
+def _getRealVariable( variable ):
+    while variable.isReference():
+        variable = variable.getReferenced()
+
+    return variable
+
+def _isDirectCallableFunction( function_body ):
+    if not function_body.needsCreation() or function_body.needsDirectCall():
+        return False
+
+    if function_body.isClassDictCreation():
+        return False
+
+    parameters = function_body.getParameters()
+
+    if parameters.getKwOnlyParameterCount():
+        return False
+
+    for variable in parameters.getTopLevelVariables():
+        if variable.isNestedParameterVariable():
+            return False
+
+    return True
+
+def _matchDirectCall( function_body, positional, pairs ):
+    """ Match call arguments to the parameters of a function body.
+
+    Returns the dictionary of "matchCall" with indexes of positional arguments
+    and keyword names as values, or "None" if the call is not possible without
+    an error, which is then left to the normal call.
+    """
+
+    parameters = function_body.getParameters()
+
+    try:
+        return matchCall(
+            func_name     = function_body.getFunctionName(),
+            args          = parameters.getArgumentNames(),
+            star_list_arg = parameters.getStarListArgumentName(),
+            star_dict_arg = parameters.getStarDictArgumentName(),
+            num_defaults  = parameters.getDefaultCount(),
+            positional    = tuple( range( len( positional ) ) ),
+            pairs         = [
+                ( key, key )
+                for key, _value in
+                pairs
+            ],
+            improved      = True
+        )
+    except TooManyArguments:
+        return None
+
+
+class FinalizeDirectCalls( FinalizationVisitorBase ):
+    def __init__( self ):
+        # Assignment sources per variable, and call candidates per variable.
+        self.assignments = {}
+        self.calls = []
+
+    def onEnterNode( self, node ):
+        if node.isStatementAssignmentVariable():
+            variable = _getRealVariable(
+                node.getTargetVariableRef().getVariable()
+            )
+
+            self.assignments.setdefault( variable, [] ).append(
+                node.getAssignSource()
+            )
+
+        if node.isExpressionCall():
+            called = node.getCalled()
+
+            if called.isExpressionVariableRef():
+                self.calls.append( node )
+
+    def markDirectCalls( self ):
+        for call_node in self.calls:
+            variable = _getRealVariable( call_node.getCalled().getVariable() )
+
+            sources = self.assignments.get( variable, () )
+
+            if len( sources ) != 1:
+                continue
+
+            source = sources[0]
+
+            if not source.isExpressionFunctionCreation():
+                continue
+
+            function_body = source.getFunctionRef().getFunctionBody()
+
+            if function_body.getParentModule() is not call_node.getParentModule():
+                continue
+
+            if not _isDirectCallableFunction( function_body ):
+                continue
+
+            decomposed = call_node.getArgumentsDecomposed()
+
+            if decomposed is None:
+                continue
+
+            positional, pairs = decomposed
+
+            matched_args = _matchDirectCall( function_body, positional, pairs )
+
+            if matched_args is None:
+                continue
+
+            call_node.markAsDirectCall(
+                function_body = function_body,
+                positional    = positional,
+                pairs         = pairs,
+                matched_args  = matched_args
+            )
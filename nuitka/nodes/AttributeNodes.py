@@ -75,6 +75,24 @@ class ExpressionAttributeLookup( ExpressionChildrenHavingBase ):
             constraint_collection = constraint_collection
         )
 
+    def computeExpressionCall( self, call_node, constraint_collection ):
+        lookup_source = self.getLookupSource()
+
+        # The "join" of strings consumes all values of a generator expression
+        # argument, so it can be fused into a list contraction instead.
+        if self.getAttributeName() == "join" and \
+           lookup_source.isExpressionConstantRef() and \
+           lookup_source.isStringConstant():
+            from nuitka.optimizations.OptimizeBuiltinCalls import computeJoinCall
+
+            return computeJoinCall( call_node )
+
+        return ExpressionChildrenHavingBase.computeExpressionCall(
+            self,
+            call_node             = call_node,
+            constraint_collection = constraint_collection
+        )
+
     def isKnownToBeIterable( self, count ):
         # TODO: Could be known.
         return None
@@ -49,6 +49,10 @@ class ExpressionCall( ExpressionChildrenHavingBase ):
             source_ref = source_ref
         )
 
+        # Indicator if the called value is expected to be a known compiled
+        # function, that can be called without argument parsing.
+        self.direct_call = None
+
     getCalled = ExpressionChildrenHavingBase.childGetter( "called" )
     getCallArgs = ExpressionChildrenHavingBase.childGetter( "args" )
     getCallKw = ExpressionChildrenHavingBase.childGetter( "kw" )
@@ -97,6 +101,41 @@ class ExpressionCall( ExpressionChildrenHavingBase ):
 
         return args.extractSideEffects() + kw.extractSideEffects()
 
+    def getArgumentsDecomposed( self ):
+        """ Positional argument and keyword pair nodes, if statically known.
+
+        Returns "None" if the arguments are not simple enough, e.g. a variable
+        is used as argument tuple, or keywords are not constant strings.
+        """
+
+        args = self.getCallArgs()
+        kw = self.getCallKw()
+
+        if not args.isExpressionMakeTuple() and \
+           not ( args.isExpressionConstantRef() and type( args.getConstant() ) is tuple ):
+            return None
+
+        if not kw.isExpressionMakeDict() and \
+           not ( kw.isExpressionConstantRef() and kw.isMapping() ):
+            return None
+
+        if not kw.isMappingWithConstantStringKeys():
+            return None
+
+        pairs = kw.getMappingStringKeyPairs()
+
+        for key, _value in pairs:
+            if type( key ) is not str:
+                return None
+
+        return args.getIterationValues(), pairs
+
+    def markAsDirectCall( self, function_body, positional, pairs, matched_args ):
+        self.direct_call = ( function_body, positional, pairs, matched_args )
+
+    def getDirectCall( self ):
+        return self.direct_call
+
 
 class ExpressionCallNoKeywords( ExpressionCall ):
     kind = "EXPRESSION_CALL_NO_KEYWORDS"
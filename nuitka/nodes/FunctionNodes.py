@@ -166,6 +166,9 @@ class ExpressionFunctionBody( ClosureTakerMixin, ChildrenHavingMixin,
     def isClassDictCreation( self ):
         return self.is_class
 
+    def isGeneratorExpression( self ):
+        return self.is_genexpr
+
     def getFunctionName( self ):
         if self.is_lambda:
             return "<lambda>"
@@ -74,6 +74,9 @@ class MarkGeneratorIndicator:
     def markAsGenerator( self ):
         self.is_generator = True
 
+    def unmarkAsGenerator( self ):
+        self.is_generator = False
+
     def isGenerator( self ):
         return self.is_generator
 
@@ -140,6 +140,37 @@ class StatementTryFinally( StatementChildrenHavingBase ):
             return self, None, None
 
 
+_exception_independent_kinds = frozenset(
+    (
+        "STATEMENTS_SEQUENCE",
+        "STATEMENT_ASSIGNMENT_VARIABLE",
+        "STATEMENT_RETURN",
+        "STATEMENT_BREAK_LOOP",
+        "STATEMENT_CONTINUE_LOOP",
+        "EXPRESSION_CONSTANT_REF",
+        "EXPRESSION_VARIABLE_REF",
+        "EXPRESSION_TEMP_VARIABLE_REF",
+        "EXPRESSION_TARGET_VARIABLE_REF",
+        "EXPRESSION_TARGET_TEMP_VARIABLE_REF",
+        "EXPRESSION_MAKE_TUPLE",
+        "EXPRESSION_MAKE_LIST",
+        "EXPRESSION_MAKE_SET",
+        "EXPRESSION_MAKE_DICT",
+        "EXPRESSION_KEY_VALUE_PAIR",
+    )
+)
+
+def _isExceptionIndependent( node ):
+    if node.kind not in _exception_independent_kinds:
+        return False
+
+    for child in node.getVisitableNodes():
+        if not _isExceptionIndependent( child ):
+            return False
+
+    return True
+
+
 class StatementExceptHandler( StatementChildrenHavingBase ):
     kind = "STATEMENT_EXCEPT_HANDLER"
 
@@ -196,37 +227,95 @@ class StatementTryExcept( StatementChildrenHavingBase ):
 
         return True
 
-    def isStatementTryFinallyOptimized( self ):
-        tried_block = self.getBlockTry()
+    def getExceptionFreeLookup( self ):
+        """ Get the lookup of the tried block, if it can be done without raising.
 
-        tried_statements = tried_block.getStatements()
+            For "next(it)" catching "StopIteration", "d[k]" catching "KeyError",
+            and "o.attr" catching "AttributeError", there is a way to tell that
+            the lookup failed without throwing an exception, and the handler can
+            be run instead. The tried block must be a single assignment of one
+            of these, and the handler must not depend on the exception.
 
-        if len( tried_statements ) == 1:
-            tried_statement = tried_statements[0]
+            The handled exception stays visible after the handler though, e.g.
+            with "sys.exc_info()", so it must still be made the current one,
+            except for "next" with a handler that aborts, which is what for
+            loops are re-formulated to, and which do not set it.
 
-            if tried_statement.isStatementAssignmentVariable():
-                source = tried_statement.getAssignSource()
+            Returns a tuple of the lookup expression, and if the exception must
+            be made the current one, or None.
+        """
 
-                if source.isExpressionBuiltinNext1():
-                    if not source.getValue().mayRaiseException( BaseException ):
-                        # Note: Now we know the source lookup is the only thing that may
-                        # raise.
+        tried_statements = self.getBlockTry().getStatements()
 
-                        handlers = self.getExceptionHandlers()
+        if len( tried_statements ) != 1:
+            return None
 
-                        if len( handlers ) == 1:
-                            catched_types = handlers[0].getExceptionTypes()
+        tried_statement = tried_statements[0]
 
-                            if len( catched_types ) == 1:
-                                catched_type = catched_types[0]
+        if not tried_statement.isStatementAssignmentVariable():
+            return None
 
-                                if catched_type.isExpressionBuiltinExceptionRef():
-                                    if catched_type.getExceptionName() == "StopIteration":
-                                        if handlers[0].getExceptionBranch().isStatementAborting():
-                                            return True
+        source = tried_statement.getAssignSource()
 
-        return False
+        if source.isExpressionBuiltinNext1():
+            exception_name = "StopIteration"
+            operands = ( source.getValue(), )
+        elif source.isExpressionSubscriptLookup():
+            exception_name = "KeyError"
+            operands = ( source.getLookupSource(), source.getSubscript() )
+        elif source.isExpressionAttributeLookup():
+            exception_name = "AttributeError"
+            operands = ( source.getLookupSource(), )
+        else:
+            return None
+
+        # Note: Then we know the lookup is the only thing that may raise the
+        # caught exception.
+        for operand in operands:
+            if operand.mayRaiseException( BaseException ) and \
+               not operand.isExpressionVariableRef():
+                return None
+
+        handlers = self.getExceptionHandlers()
+
+        if len( handlers ) != 1:
+            return None
+
+        catched_types = handlers[0].getExceptionTypes()
+
+        if len( catched_types ) != 1:
+            return None
+
+        catched_type = catched_types[0]
+
+        if not catched_type.isExpressionBuiltinExceptionRef() or \
+           catched_type.getExceptionName() != exception_name:
+            return None
+
+        exception_branch = handlers[0].getExceptionBranch()
+
+        # For loops, the handler of "next" was always done like this, their
+        # iterators are made by the re-formulation and cannot raise.
+        if exception_name == "StopIteration" and \
+           exception_branch is not None and \
+           exception_branch.isStatementAborting() and \
+           not source.getValue().mayRaiseException( BaseException ):
+            return source, False
+
+        # Temporary variables are declared with their first assignment, which
+        # must then not be conditional.
+        if tried_statement.getTargetVariableRef().getVariable().isTempVariableReference():
+            return None
+
+        if exception_branch is None:
+            return source, True
+
+        # Code that might look at the exception, e.g. with "sys.exc_info()", is
+        # not allowed in the handler.
+        if not _isExceptionIndependent( exception_branch ):
+            return None
 
+        return source, True
 
     def computeStatement( self, constraint_collection ):
         # The tried block can be processed normally.
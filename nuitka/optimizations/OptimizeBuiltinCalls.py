@@ -303,7 +303,34 @@ def len_extractor( node ):
         builtin_spec  = BuiltinOptimization.builtin_len_spec
     )
 
+def _fuseGeneratorExpressionArg( node, consumer ):
+    # Only a call with a generator expression as the sole argument can be fused.
+    args = node.getCallArgs()
+    kw = node.getCallKw()
+
+    if not kw.isExpressionConstantRef() or kw.getConstant() != {}:
+        return None
+
+    if not args.isExpressionMakeTuple() or len( args.getElements() ) != 1:
+        return None
+
+    from nuitka.tree.ReformulationContractionExpressions import fuseGeneratorExpression
+
+    return fuseGeneratorExpression(
+        generator_call = args.getElements()[0],
+        consumer       = consumer,
+        source_ref     = node.getSourceReference()
+    )
+
 def tuple_extractor( node ):
+    fused = _fuseGeneratorExpressionArg( node, "list" )
+
+    if fused is not None:
+        return ExpressionBuiltinTuple(
+            value      = fused,
+            source_ref = node.getSourceReference()
+        )
+
     return BuiltinOptimization.extractBuiltinArgs(
         node          = node,
         builtin_class = ExpressionBuiltinTuple,
@@ -311,12 +338,35 @@ def tuple_extractor( node ):
     )
 
 def list_extractor( node ):
+    fused = _fuseGeneratorExpressionArg( node, "list" )
+
+    if fused is not None:
+        return fused
+
     return BuiltinOptimization.extractBuiltinArgs(
         node          = node,
         builtin_class = ExpressionBuiltinList,
         builtin_spec  = BuiltinOptimization.builtin_list_spec
     )
 
+def set_extractor( node ):
+    return _fuseGeneratorExpressionArg( node, "set" )
+
+def sum_extractor( node ):
+    return _fuseGeneratorExpressionArg( node, "sum" )
+
+def any_extractor( node ):
+    return _fuseGeneratorExpressionArg( node, "any" )
+
+def all_extractor( node ):
+    return _fuseGeneratorExpressionArg( node, "all" )
+
+def min_extractor( node ):
+    return _fuseGeneratorExpressionArg( node, "min" )
+
+def max_extractor( node ):
+    return _fuseGeneratorExpressionArg( node, "max" )
+
 def float_extractor( node ):
     return BuiltinOptimization.extractBuiltinArgs(
         node          = node,
@@ -563,6 +613,7 @@ _dispatch_dict = {
     "range"      : range_extractor,
     "tuple"      : tuple_extractor,
     "list"       : list_extractor,
+    "set"        : set_extractor,
     "dict"       : dict_extractor,
     "float"      : float_extractor,
     "str"        : str_extractor,
@@ -574,7 +625,12 @@ _dispatch_dict = {
     "hasattr"    : hasattr_extractor,
     "getattr"    : getattr_extractor,
     "setattr"    : setattr_extractor,
-    "isinstance" : isinstance_extractor
+    "isinstance" : isinstance_extractor,
+    "sum"        : sum_extractor,
+    "any"        : any_extractor,
+    "all"        : all_extractor,
+    "min"        : min_extractor,
+    "max"        : max_extractor
 }
 
 if python_version < 300:
@@ -595,6 +651,12 @@ def check():
 
 check()
 
+def computeJoinCall( call_node ):
+    if _fuseGeneratorExpressionArg( call_node, "list" ) is None:
+        return call_node, None, None
+
+    return call_node, "new_expression", "Fused generator expression into string join call."
+
 def computeBuiltinCall( call_node, called ):
     builtin_name = called.getBuiltinName()
 
@@ -624,6 +686,11 @@ def computeBuiltinCall( call_node, called ):
             message = "Replaced call to builtin %s with exception raising call." % (
                 inspect_node.kind,
             )
+        elif inspect_node.isExpressionFunctionCall():
+            tags = "new_expression"
+            message = "Fused generator expression into call to builtin %s." % (
+                builtin_name,
+            )
         elif inspect_node.isExpressionOperationUnary():
             tags = "new_expression"
             message = "Replaced call to builtin %s with unary operation %s." % (
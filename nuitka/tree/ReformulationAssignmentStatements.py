@@ -545,6 +545,26 @@ def _buildInplaceAssignVariableNode( result, variable_ref, tmp_variable1, tmp_va
         )
     )
 
+def _buildInplaceAddVariableNode( variable_ref, expression, source_ref ):
+    assert variable_ref.isExpressionTargetVariableRef(), variable_ref
+
+    # For additions, the variable must remain the only owner of the value while
+    # the operation is done, so that strings can be extended in place for it,
+    # as CPython does. Therefore assign the result directly to the variable.
+    return StatementAssignmentVariable(
+        variable_ref = variable_ref,
+        source       = ExpressionOperationBinaryInplace(
+            operator   = "Add",
+            left       = ExpressionVariableRef(
+                variable_name = variable_ref.getVariableName(),
+                source_ref    = source_ref
+            ),
+            right      = expression,
+            source_ref = source_ref
+        ),
+        source_ref   = source_ref
+    )
+
 def _buildInplaceAssignAttributeNode( result, lookup_source, attribute_name, tmp_variable1,
                                       tmp_variable2, operator, expression, source_ref ):
     return (
@@ -763,12 +783,19 @@ def buildInplaceAssignNode( provider, node, source_ref ):
 
     expression = buildNode( provider, node.value, source_ref )
 
+    kind, detail = decodeAssignTarget( provider, node.target, source_ref )
+
+    if kind == "Name" and operator == "Add":
+        return _buildInplaceAddVariableNode(
+            variable_ref = detail,
+            expression   = expression,
+            source_ref   = source_ref
+        )
+
     result = StatementTempBlock(
         source_ref = source_ref
     )
 
-    kind, detail = decodeAssignTarget( provider, node.target, source_ref )
-
     if kind == "Name":
         variable_ref = detail
 
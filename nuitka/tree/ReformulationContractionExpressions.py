@@ -44,6 +44,14 @@ from nuitka.nodes.LoopNodes import (
     StatementLoop
 )
 from nuitka.nodes.ConditionalNodes import StatementConditional
+from nuitka.nodes.OperatorNodes import (
+    ExpressionOperationBinary,
+    ExpressionOperationNOT
+)
+from nuitka.nodes.NodeMakingHelpers import (
+    makeRaiseExceptionReplacementExpression,
+    makeComparisonNode
+)
 from nuitka.nodes.BuiltinIteratorNodes import (
     ExpressionBuiltinNext1,
     ExpressionBuiltinIter1
@@ -54,6 +62,7 @@ from nuitka.nodes.ContainerOperationNodes import (
     ExpressionSetOperationAdd
 )
 from nuitka.nodes.ReturnNodes import StatementReturn
+from nuitka.nodes.ExceptionNodes import StatementRaiseException
 from nuitka.nodes.YieldNodes import ExpressionYield
 
 make_contraction_parameters = ParameterSpec(
@@ -76,6 +85,8 @@ from .Helpers import (
     getKind
 )
 
+from .Operations import VisitorNoopMixin, visitTree
+
 def buildListContractionNode( provider, node, source_ref ):
     # List contractions are dealt with by general code.
 
@@ -416,3 +427,319 @@ def _buildContractionNode( provider, node, name, emit_class, start_value, assign
         ),
         source_ref = source_ref
     )
+
+
+class _YieldFinder( VisitorNoopMixin ):
+    def __init__( self ):
+        self.yields = []
+
+    def onEnterNode( self, node ):
+        if node.isExpressionYield():
+            self.yields.append( node )
+
+_fusable_consumers = ( "sum", "any", "all", "min", "max", "list", "set" )
+
+def fuseGeneratorExpression( generator_call, consumer, source_ref ):
+    """ Fuse a generator expression with a builtin consuming all of its values.
+
+    The generator expression function body is changed into a normal function that
+    runs the loop and does what the consumer would do with the values, much like
+    a list contraction. For "any" and "all" the loop is exited early. No generator
+    object is created then.
+
+    Returns the call of the changed function, or "None" if the generator expression
+    cannot be fused.
+    """
+
+    # Many cases, one per consumer, pylint: disable=R0912,R0914
+
+    assert consumer in _fusable_consumers, consumer
+
+    if not generator_call.isExpressionFunctionCall():
+        return None
+
+    function_body = generator_call.getFunction().getFunctionRef().getFunctionBody()
+
+    if not function_body.isGeneratorExpression() or \
+       not function_body.isGenerator():
+        return None
+
+    old_frame = function_body.getBody()
+
+    if old_frame is None or not old_frame.isStatementsFrame():
+        return None
+
+    finder = _YieldFinder()
+    visitTree( function_body, finder )
+
+    # Only the yield of the contraction value itself is expected, anything else,
+    # e.g. a yield expression as part of the value, we leave alone.
+    if len( finder.yields ) != 1:
+        return None
+
+    yield_node = finder.yields[0]
+    yield_statement = yield_node.getParent()
+
+    if not yield_statement.isStatementExpressionOnly() or \
+       not yield_statement.getParent().isStatementsSequence():
+        return None
+
+    value_expression = yield_node.getExpression()
+
+    temp_block = StatementTempBlock(
+        source_ref = source_ref
+    )
+
+    def makeTempRef( variable ):
+        return ExpressionTempVariableRef(
+            variable   = variable.makeReference( temp_block ),
+            source_ref = source_ref
+        )
+
+    def makeTempAssignment( variable, source ):
+        return StatementAssignmentVariable(
+            variable_ref = ExpressionTargetTempVariableRef(
+                variable   = variable.makeReference( temp_block ),
+                source_ref = source_ref
+            ),
+            source       = source,
+            source_ref   = source_ref
+        )
+
+    def makeConstant( constant ):
+        return ExpressionConstantRef(
+            constant   = constant,
+            source_ref = source_ref
+        )
+
+    def makeReturn( expression ):
+        return StatementReturn(
+            expression = expression,
+            source_ref = source_ref
+        )
+
+    # The value is computed before the consumer does its part, which uses it
+    # from a temporary variable.
+    value_variable = temp_block.getTempVariable( "value" )
+    value = makeTempRef( value_variable )
+
+    if consumer in ( "list", "set", "sum" ):
+        result_variable = temp_block.getTempVariable( "result" )
+
+        if consumer == "sum":
+            start_value = 0
+
+            emit_statement = makeTempAssignment(
+                variable = result_variable,
+                source   = ExpressionOperationBinary(
+                    operator   = "Add",
+                    left       = makeTempRef( result_variable ),
+                    right      = value,
+                    source_ref = source_ref
+                )
+            )
+        else:
+            if consumer == "list":
+                start_value = []
+                emit_class = ExpressionListOperationAppend
+            else:
+                start_value = set()
+                emit_class = ExpressionSetOperationAdd
+
+            emit_statement = StatementExpressionOnly(
+                expression = emit_class(
+                    makeTempRef( result_variable ),
+                    value,
+                    source_ref = source_ref
+                ),
+                source_ref = source_ref
+            )
+
+        init_statements = [
+            makeTempAssignment(
+                variable = result_variable,
+                source   = makeConstant( start_value )
+            )
+        ]
+
+        final_statements = [
+            makeReturn( makeTempRef( result_variable ) )
+        ]
+    elif consumer in ( "any", "all" ):
+        if consumer == "any":
+            condition = value
+        else:
+            condition = ExpressionOperationNOT(
+                operand    = value,
+                source_ref = source_ref
+            )
+
+        emit_statement = StatementConditional(
+            condition  = condition,
+            yes_branch = makeStatementsSequenceFromStatement(
+                statement = makeReturn( makeConstant( consumer == "any" ) )
+            ),
+            no_branch  = None,
+            source_ref = source_ref
+        )
+
+        init_statements = []
+
+        final_statements = [
+            makeReturn( makeConstant( consumer == "all" ) )
+        ]
+    else:
+        # The first value is taken, and replaced by later ones only if these compare
+        # as smaller or larger, which is what the builtins do too.
+        result_variable = temp_block.getTempVariable( "result" )
+        first_variable = temp_block.getTempVariable( "first" )
+
+        emit_statement = StatementConditional(
+            condition  = makeTempRef( first_variable ),
+            yes_branch = StatementsSequence(
+                statements = (
+                    makeTempAssignment(
+                        variable = result_variable,
+                        source   = makeTempRef( value_variable )
+                    ),
+                    makeTempAssignment(
+                        variable = first_variable,
+                        source   = makeConstant( False )
+                    )
+                ),
+                source_ref = source_ref
+            ),
+            no_branch  = makeStatementsSequenceFromStatement(
+                statement = StatementConditional(
+                    condition  = makeComparisonNode(
+                        left       = makeTempRef( value_variable ),
+                        right      = makeTempRef( result_variable ),
+                        comparator = "Lt" if consumer == "min" else "Gt",
+                        source_ref = source_ref
+                    ),
+                    yes_branch = makeStatementsSequenceFromStatement(
+                        statement = makeTempAssignment(
+                            variable = result_variable,
+                            source   = makeTempRef( value_variable )
+                        )
+                    ),
+                    no_branch  = None,
+                    source_ref = source_ref
+                )
+            ),
+            source_ref = source_ref
+        )
+
+        # Temporary variables are declared with their first assignment, so the
+        # result must get one outside of the loop.
+        init_statements = [
+            makeTempAssignment(
+                variable = first_variable,
+                source   = makeConstant( True )
+            ),
+            makeTempAssignment(
+                variable = result_variable,
+                source   = makeConstant( None )
+            )
+        ]
+
+        final_statements = [
+            StatementConditional(
+                condition  = makeTempRef( first_variable ),
+                yes_branch = makeStatementsSequenceFromStatement(
+                    statement = StatementExpressionOnly(
+                        expression = makeRaiseExceptionReplacementExpression(
+                            expression      = generator_call,
+                            exception_type  = "ValueError",
+                            exception_value = "%s() arg is an empty sequence" % consumer
+                        ),
+                        source_ref = source_ref
+                    )
+                ),
+                no_branch  = None,
+                source_ref = source_ref
+            ),
+            makeReturn( makeTempRef( result_variable ) )
+        ]
+
+    # A "StopIteration" raised while computing a value ends a generator, and the
+    # consumer uses what it got so far, so the fused loop must do the same. But
+    # one raised by the consumer itself, e.g. by an "__add__" for "sum", is not
+    # caught by the generator, and must propagate. The handler can only cover
+    # the whole loop, so a flag tells it which one it is.
+    emitting_variable = temp_block.getTempVariable( "emitting" )
+
+    yield_statement.replaceWith(
+        StatementsSequence(
+            statements = (
+                makeTempAssignment(
+                    variable = value_variable,
+                    source   = value_expression
+                ),
+                makeTempAssignment(
+                    variable = emitting_variable,
+                    source   = makeConstant( True )
+                ),
+                emit_statement,
+                makeTempAssignment(
+                    variable = emitting_variable,
+                    source   = makeConstant( False )
+                )
+            ),
+            source_ref = source_ref
+        )
+    )
+
+    init_statements.append(
+        makeTempAssignment(
+            variable = emitting_variable,
+            source   = makeConstant( False )
+        )
+    )
+
+    temp_block.setBody(
+        StatementsSequence(
+            statements = init_statements + [
+                makeTryExceptSingleHandlerNode(
+                    tried          = StatementsSequence(
+                        statements = old_frame.getStatements(),
+                        source_ref = source_ref
+                    ),
+                    exception_name = "StopIteration",
+                    handler_body   = makeStatementsSequenceFromStatement(
+                        statement = StatementConditional(
+                            condition  = makeTempRef( emitting_variable ),
+                            yes_branch = makeStatementsSequenceFromStatement(
+                                statement = StatementRaiseException(
+                                    exception_type  = None,
+                                    exception_value = None,
+                                    exception_trace = None,
+                                    exception_cause = None,
+                                    source_ref      = source_ref
+                                )
+                            ),
+                            no_branch  = None,
+                            source_ref = source_ref
+                        )
+                    ),
+                    source_ref     = source_ref
+                )
+            ] + final_statements,
+            source_ref = source_ref
+        )
+    )
+
+    function_body.unmarkAsGenerator()
+
+    function_body.setBody(
+        StatementsFrame(
+            statements    = [ temp_block ],
+            guard_mode    = "full",
+            arg_names     = old_frame.getArgNames(),
+            kw_only_count = old_frame.getKwOnlyParameterCount(),
+            code_name     = old_frame.getCodeObjectName(),
+            source_ref    = old_frame.getSourceReference()
+        )
+    )
+
+    return generator_call
@@ -63,3 +63,24 @@ def defaultKeepsIdentity( arg = "str_value" ):
    print arg is "str_value"
 
 defaultKeepsIdentity()
+
+print "Constants that need streaming:"
+print 2**40, -2**40, 2**100, -2**100, 7L, -3L, 0L, -2**63, 2**63 - 1
+print 1+2j, repr( u"caf\xe9" ), repr( u"\ud800x" ), repr( u"\U0001F600" )
+print frozenset( [ 1, "a", ( 1, 2 ), 2.5, u"x" ] ), frozenset()
+print set( [ 1, 2, 2**70, -1.5 ] ), set()
+print sorted( frozenset( [ ( 1, 1.0, 1L, True ), ( 0.0, -0.0 ), ( Ellipsis, None ) ] ) )
+print [ type( value ) for value in ( 1, 1.0, 1L, True ) ]
+
+print "Dictionary displays with colliding keys:"
+def collidingDict():
+    return { "a": 1, "b": 2, "c": 3, "aa": 4, "bb": 5, 8: 1, -1: 2, -2: 3, 0.5: [ 1 ] }
+
+print collidingDict()
+print [ { "a": 1, "b": 2, "c": 3, "aa": 4, "bb": 5, 8: 1, -1: 2, -2: 3, 0.5: [ 1 ] }, { "a": [] } ]
+
+print "Constants with Ellipsis:"
+def ellipsisConstants():
+    return ( 1, Ellipsis ), [ Ellipsis, ( Ellipsis, "a" ) ], { Ellipsis : ( Ellipsis, ) }
+
+print ellipsisConstants(), ellipsisConstants()[0] is ellipsisConstants()[0]
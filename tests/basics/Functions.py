@@ -536,6 +536,26 @@ d = { "other" : 7, "c" : 3 }
 
 print "Dual star args consuming function", posDoubleStarArgsFunction( 1,  *l, **d )
 
+def knownCalledFunction( a, b = 2, *l, **d ):
+    return a, b, l, sorted( d.items() )
+
+def callKnownFunction():
+    return knownCalledFunction( 1 ), knownCalledFunction( b = 3, a = 4 ), knownCalledFunction( 1, 2, 3, c = 5 )
+
+print "Known function called with keywords and defaults", callKnownFunction()
+
+knownCalledFunction.func_defaults = ( "changed", )
+
+print "Known function called with changed defaults", callKnownFunction()
+
+def replacedKnownFunction( *args, **kw ):
+    return "replaced", args, sorted( kw.items() )
+
+sys_module = __import__( "sys" )
+sys_module.modules[ __name__ ].knownCalledFunction = replacedKnownFunction
+
+print "Known function replaced from the outside", callKnownFunction()
+
 import inspect, sys
 
 for value in sorted( dir() ):
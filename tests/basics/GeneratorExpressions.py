@@ -216,3 +216,48 @@ def strangeLambdaGeneratorExpression():
     print list(x)
 
 strangeLambdaGeneratorExpression()
+
+def consumedGeneratorExpressions():
+    items = range( 10 )
+
+    print "Consumed by sum", sum( x * 2 for x in items ), sum( x for x in () )
+    print "Consumed by any", any( x > 5 for x in items ), any( x > 50 for x in items )
+    print "Consumed by all", all( x < 50 for x in items ), all( x < 5 for x in items )
+    print "Consumed by min/max", min( x % 3 for x in items ), max( -x for x in items )
+    print "Consumed by list/tuple/set", list( x for x in items if x > 7 ), tuple( x for x in items if x < 2 ), set( x % 2 for x in items )
+    print "Consumed by join", "-".join( str( x ) for x in items )
+
+    seen = []
+
+    def check( x ):
+        seen.append( x )
+        return x > 2
+
+    print "Consumed by any with early exit", any( check( x ) for x in items ), seen
+
+    try:
+        min( x for x in () )
+    except ValueError as e:
+        print "Consumed by min without values", repr( e )
+
+    it = iter( ( 1, 2, 3 ) )
+    print "Consumed while StopIteration is raised", sum( next( it ) for x in items )
+
+    class StopAdding:
+        def __radd__( self, other ):
+            raise StopIteration
+
+        def __lt__( self, other ):
+            raise StopIteration
+
+    try:
+        print sum( StopAdding() for x in range( 3 ) )
+    except StopIteration:
+        print "Consumed while the consumer raises StopIteration for sum"
+
+    try:
+        print min( StopAdding() for x in range( 3 ) )
+    except StopIteration:
+        print "Consumed while the consumer raises StopIteration for min"
+
+consumedGeneratorExpressions()
@@ -53,3 +53,39 @@ print "List sclice inplace [y:]", h
 h[:] += (5,5,5)
 
 print "List sclice inplace [:]", h
+
+def stringInplace():
+    s = ""
+
+    for i in range( 10 ):
+        s += str( i )
+
+    print "String inplace in a loop:", s
+
+    u = u""
+
+    for i in range( 10 ):
+        u += unicode( i )
+
+    print "Unicode inplace in a loop:", repr( u )
+
+    s += s
+    print "String inplace of itself:", s
+
+    s += u"!"
+    print "String inplace with unicode:", repr( s )
+
+    def closureUser():
+        return t
+
+    t = "closure"
+    t += " variable"
+
+    print "String inplace of shared variable:", t, closureUser()
+
+    try:
+        w += "never"
+    except UnboundLocalError as e:
+        print "String inplace of unassigned variable:", e
+
+stringInplace()
@@ -91,3 +91,82 @@ n = None
 print l[n:n]
 print l[3:n]
 print l[n:3]
+
+print "String formatting with constant format strings:"
+
+class StrLike:
+    def __str__( self ):
+        print "__str__ called"
+        return "str-like"
+
+    def __repr__( self ):
+        return "<repr>"
+
+class UnicodeStrLike:
+    def __str__( self ):
+        print "__str__ returning unicode called"
+        return u"unicode-like"
+
+def formatting( host, port, value ):
+    print "%s:%d" % ( host, port )
+    print "%s and %r and %i%%" % ( value, value, port )
+    print repr( "%s=%s" % ( host, u"unicode" ) )
+    print repr( "%s-%s" % ( value, UnicodeStrLike() ) )
+    print "%d and %d" % ( 2**70, 1.5 )
+    print "%s%s" % ( True, None )
+
+    try:
+        print "%s %d" % ( host, "not a number" )
+    except TypeError as e:
+        print "TypeError", e
+
+formatting( "localhost", 80, StrLike() )
+
+print "String concatenation chains:"
+
+class AddLogger:
+    def __add__( self, other ):
+        print "__add__", other
+        return self
+
+    def __radd__( self, other ):
+        print "__radd__", other
+        return "radd"
+
+    def __repr__( self ):
+        return "<AddLogger>"
+
+def concatenation( a, b, c ):
+    print a + "/" + b + "/" + c
+    x = AddLogger()
+    print a + "/" + x + "/" + c
+    print x + "/" + b + "/" + c
+    print repr( a + "/" + u"unicode" + c )
+
+    try:
+        print a + "/" + 3 + c
+    except TypeError as e:
+        print "TypeError", e
+
+concatenation( "a", "b", "c" )
+
+class GlobalChanger:
+    def __add__( self, other ):
+        global changed_by_add
+        changed_by_add = "changed"
+
+        return "added"
+
+changed_by_add = "unchanged"
+
+def concatenationWithGlobals( a ):
+    print GlobalChanger() + "/" + changed_by_add
+
+    try:
+        print a + 3 + "/" + undefined_global
+    except TypeError as e:
+        print "TypeError", e
+    except NameError as e:
+        print "NameError", e
+
+concatenationWithGlobals( "a" )
@@ -94,3 +94,141 @@ def tryScope5():
         pass
 
 tryScope5()
+
+print "*" * 20
+
+class AttributeProvider( object ):
+    attr = 5
+
+    @property
+    def bad( self ):
+        raise ValueError( "bad property" )
+
+class MissingDict( dict ):
+    def __missing__( self, key ):
+        return "missing " + key
+
+def tryLookups( d, key, obj, it ):
+    try:
+        value = d[ key ]
+    except KeyError:
+        value = None
+
+    try:
+        attr = obj.attr
+    except AttributeError:
+        attr = 0
+
+    try:
+        item = next( it )
+    except StopIteration:
+        item = -1
+
+    return value, attr, item
+
+print "Lookups found", tryLookups( { 1 : 2 }, 1, AttributeProvider(), iter( [ 1 ] ) )
+print "Lookups not found", tryLookups( { 1 : 2 }, 3, object(), iter( [] ) )
+print "Lookups with __missing__", tryLookups( MissingDict(), "x", AttributeProvider(), iter( [] ) )
+
+for args in ( ( {}, [], AttributeProvider(), iter( [] ) ),
+              ( [ 1, 2 ], 5, AttributeProvider(), iter( [] ) ),
+              ( {}, 1, 1, 5 ) ):
+    try:
+        tryLookups( *args )
+    except Exception as e:
+        print "Lookups raised other exception", repr( e )
+
+def tryBadProperty( obj ):
+    try:
+        value = obj.bad
+    except AttributeError:
+        value = None
+
+    return value
+
+try:
+    tryBadProperty( AttributeProvider() )
+except ValueError as e:
+    print "Property raised", repr( e )
+
+def tryLookupExceptionUsed( d, key ):
+    import sys
+
+    try:
+        value = d[ key ]
+    except KeyError:
+        print "Handler sees", sys.exc_info()[0]
+        value = 1
+
+    return value
+
+print tryLookupExceptionUsed( {}, 2 )
+
+def tryLookupContinue( d, keys ):
+    result = []
+
+    for key in keys:
+        try:
+            value = d[ key ]
+        except KeyError:
+            continue
+
+        result.append( value )
+
+    return result
+
+print "Found only", tryLookupContinue( { 1 : 1, 3 : 3 }, range( 5 ) )
+
+def tryLookupsExceptionVisibleAfter( d, obj, it ):
+    import sys
+
+    try:
+        value = d[ "a" ]
+    except KeyError:
+        value = 1
+
+    print "After handled KeyError", sys.exc_info()[0], repr( sys.exc_info()[1] ), value
+
+    try:
+        value = d[ ( 1, 2 ) ]
+    except KeyError:
+        value = 2
+
+    print "After handled KeyError for tuple", repr( sys.exc_info()[1] ), value
+
+    try:
+        value = obj.missing
+    except AttributeError:
+        value = 3
+
+    print "After handled AttributeError", sys.exc_info()[0], value
+
+    try:
+        value = next( it )
+    except StopIteration:
+        value = 4
+
+    print "After handled StopIteration", sys.exc_info()[0], value
+
+    try:
+        value = d[ "b" ]
+    except KeyError:
+        pass
+
+    try:
+        raise
+    except KeyError as e:
+        print "Re-raised after handler", repr( e )
+
+tryLookupsExceptionVisibleAfter( {}, object(), iter( () ) )
+
+import sys
+
+d = {}
+
+try:
+    v = d[ "a" ]
+except KeyError:
+    v = 1
+
+print "After handled KeyError on module level", sys.exc_info()[0], v
@@ -24,46 +24,21 @@ import os, sys, subprocess, tempfile, shutil
 # Go its own directory, to have it easy with path knowledge.
 os.chdir( os.path.dirname( os.path.abspath( __file__ ) ) )
 
-search_mode = len( sys.argv ) > 1 and sys.argv[1] == "search"
+sys.path.insert( 0, ".." )
 
-start_at = sys.argv[2] if len( sys.argv ) > 2 else None
+from test_common import parseArgs, getPythonVersion, runTests
 
-if start_at:
-    active = False
-else:
-    active = True
+options = parseArgs()
 
-if "PYTHON" not in os.environ:
-    os.environ[ "PYTHON" ] = sys.executable
+python_version = getPythonVersion()
+
+os.environ[ "PYTHONPATH" ] = os.getcwd()
 
 if "PYTHONIOENCODING" not in os.environ:
     os.environ[ "PYTHONIOENCODING" ] = "utf-8"
 
-def check_output(*popenargs, **kwargs):
-    from subprocess import Popen, PIPE, CalledProcessError
-
-    if 'stdout' in kwargs:
-        raise ValueError('stdout argument not allowed, it will be overridden.')
-    process = Popen(stdout=PIPE, *popenargs, **kwargs)
-    output, unused_err = process.communicate()
-    retcode = process.poll()
-    if retcode:
-        cmd = kwargs.get("args")
-        if cmd is None:
-            cmd = popenargs[0]
-        raise CalledProcessError(retcode, cmd, output=output)
-    return output
-
-version_output = check_output(
-    [ os.environ[ "PYTHON" ], "--version" ],
-    stderr = subprocess.STDOUT
-)
-
-python_version = version_output.split()[1]
-
-os.environ[ "PYTHONPATH" ] = os.getcwd()
-
-print( "Using concrete python", python_version )
+cases = []
+converted = []
 
 for filename in sorted( os.listdir( "." ) ):
     if not filename.endswith( ".py" ) or filename.startswith( "run_" ):
@@ -83,77 +58,71 @@ for filename in sorted( os.listdir( "." ) ):
 
     path = filename
 
-    if not active and start_at in ( filename, path ):
-        active = True
-
     extra_flags = [ "expect_success", "remove_output" ]
 
-    if active:
-        if filename in ( "Referencing.py", "Referencing32.py" ):
-            debug_python = os.environ[ "PYTHON" ]
-            if not debug_python.endswith( "-dbg" ):
-                debug_python += "-dbg"
+    case = {
+        "name"    : filename,
+        "sources" : [ filename ]
+    }
 
-            if os.name == "nt" or "--windows-target" in os.environ.get( "NUITKA_EXTRA_OPTIONS", "" ):
-                print( "Skip reference count test, CPython debug not on Windows." )
-                continue
+    cases.append( case )
 
-            if not os.path.exists( os.path.join( "/usr/bin", debug_python ) ):
-                print( "Skip reference count test, CPython debug version not found." )
-                continue
+    if filename in ( "Referencing.py", "Referencing32.py" ):
+        debug_python = os.environ[ "PYTHON" ]
+        if not debug_python.endswith( "-dbg" ):
+            debug_python += "-dbg"
 
-            extra_flags.append( "ignore_stderr" )
-            extra_flags.append( "python_debug" )
+        if os.name == "nt" or "--windows-target" in os.environ.get( "NUITKA_EXTRA_OPTIONS", "" ):
+            case[ "skip" ] = "Skip reference count test, CPython debug not on Windows."
+            continue
 
-        if filename == "OrderChecks.py":
-            extra_flags.append( "ignore_stderr" )
+        if not os.path.exists( os.path.join( "/usr/bin", debug_python ) ):
+            case[ "skip" ] = "Skip reference count test, CPython debug version not found."
+            continue
 
-        assert type( python_version ) is bytes
+        extra_flags.append( "ignore_stderr" )
+        extra_flags.append( "python_debug" )
 
-        if python_version.startswith( b"3.3" ) and filename in ( "ParameterErrors.py", "ParameterErrors32.py" ):
-            print( "Skip parameter errors test", filename, "not yet compatible." )
-            continue
+    if filename == "OrderChecks.py":
+        extra_flags.append( "ignore_stderr" )
 
-        # Apply 2to3 conversion if necessary.
-        if python_version.startswith( b"3" ) and not filename.endswith( "32.py" ):
-            new_path = os.path.join( tempfile.gettempdir(), filename )
-            shutil.copy( path, new_path )
-
-            path = new_path
-
-            # On Windows, we cannot rely on 2to3 to be in the path.
-            if os.name == "nt":
-               command = sys.executable + " " + os.path.join( os.path.dirname( sys.executable ), "Tools/Scripts/2to3.py" )
-            else:
-               command = "2to3"
-
-            result = subprocess.call(
-                command + " -w -n --no-diffs " + path,
-                stderr = open( os.devnull, "w" ),
-                shell  = True
-            )
-
-        command = "%s %s %s silent %s" % (
-            sys.executable,
-            os.path.join( "..", "..", "bin", "compare_with_cpython" ),
-            path,
-            " ".join( extra_flags )
-        )
+    assert type( python_version ) is bytes
+
+    if python_version.startswith( b"3.3" ) and filename in ( "ParameterErrors.py", "ParameterErrors32.py" ):
+        case[ "skip" ] = "Skip parameter errors test %s not yet compatible." % filename
+        continue
+
+    # Apply 2to3 conversion if necessary. This is done before running the
+    # tests, one at a time, the parallel part is the compilation.
+    if python_version.startswith( b"3" ) and not filename.endswith( "32.py" ):
+        new_path = os.path.join( tempfile.gettempdir(), filename )
+        shutil.copy( path, new_path )
+
+        path = new_path
+
+        # On Windows, we cannot rely on 2to3 to be in the path.
+        if os.name == "nt":
+           command = sys.executable + " " + os.path.join( os.path.dirname( sys.executable ), "Tools/Scripts/2to3.py" )
+        else:
+           command = "2to3"
 
         result = subprocess.call(
-            command,
-            shell = True
+            command + " -w -n --no-diffs " + path,
+            stderr = open( os.devnull, "w" ),
+            shell  = True
         )
 
-        if result == 2:
-            sys.stderr.write( "Interruped, with CTRL-C\n" )
-            sys.exit( 2 )
+        converted.append( new_path )
 
-        if result != 0 and search_mode:
-            print("Error exit!", result)
-            sys.exit( result )
+    case[ "command" ] = "%s %s %s silent %s" % (
+        sys.executable,
+        os.path.join( "..", "..", "bin", "compare_with_cpython" ),
+        path,
+        " ".join( extra_flags )
+    )
 
-        if python_version.startswith( b"3" ) and not filename.endswith( "32.py" ):
-            os.unlink( new_path )
-    else:
-        print("Skipping", filename)
+try:
+    runTests( "basics", cases, options )
+finally:
+    for new_path in converted:
+        os.unlink( new_path )
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+#     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+#
+#     Python tests originally created or extracted from other peoples work. The
+#     parts were too small to be protected.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+
+""" Measure the memory that forked processes copy from the parent.
+
+A program with many constants is compiled with and without the option
+"--immortal-constants". It forks worker processes, which run a garbage
+collection and use the constants, as a pre-forking server would. Each of
+them then reports the "Private_Dirty" memory of its "/proc/self/smaps", i.e.
+the pages it does not share with the parent anymore. This is Linux only.
+
+Usage: run_fork_memory.py [constant_count] [workers]
+
+Set NUITKA_BINARY to use another Nuitka.
+"""
+
+from __future__ import print_function
+
+import os, sys, subprocess, tempfile, shutil
+
+constant_count = int( sys.argv[1] ) if len( sys.argv ) > 1 else 2000
+workers = int( sys.argv[2] ) if len( sys.argv ) > 2 else 4
+
+nuitka_binary = os.environ.get(
+    "NUITKA_BINARY",
+    os.path.join(
+        os.path.dirname( os.path.abspath( __file__ ) ),
+        "..", "..", "..", "bin", "nuitka"
+    )
+)
+
+python_binary = os.environ.get( "PYTHON", sys.executable )
+
+constant_source = """\
+def function%(number)d():
+    return ( "constant string %(number)d", %(number)d, ( %(number)d.5, "%(number)d" ), ( "a", "b", %(number)d ) )
+"""
+
+program_source = """\
+import os, gc
+
+%(functions)s
+
+functions = [ value for name, value in sorted( globals().items() ) if name.startswith( "function" ) ]
+
+def privateDirty():
+    result = 0
+
+    for line in open( "/proc/self/smaps" ):
+        if line.startswith( "Private_Dirty:" ):
+            result += int( line.split()[1] )
+
+    return result
+
+def work( functions ):
+    for function in functions:
+        function()
+
+# Let the parent use the constants once before forking, but like a server
+# would, without collecting garbage, only the workers will do that.
+work( functions )
+
+children = []
+
+for _count in range( %(workers)d ):
+    read_fd, write_fd = os.pipe()
+
+    pid = os.fork()
+
+    if pid == 0:
+        os.close( read_fd )
+
+        before = privateDirty()
+        # A worker typically uses only part of the code.
+        gc.collect()
+        work( functions[ : len( functions ) // 10 ] )
+        after = privateDirty()
+
+        os.write( write_fd, ( "%%d\\n" %% ( after - before ) ).encode( "ascii" ) )
+        os._exit( 0 )
+
+    os.close( write_fd )
+    children.append( ( pid, read_fd ) )
+
+total = 0
+
+for pid, read_fd in children:
+    total += int( os.read( read_fd, 100 ) )
+    os.waitpid( pid, 0 )
+
+print( total // len( children ) )
+"""
+
+def writeFile( filename, contents ):
+    with open( filename, "w" ) as output_file:
+        output_file.write( contents )
+
+def compileProgram( filename, output_dir, options ):
+    os.mkdir( output_dir )
+
+    command = "%s %s --exe --output-dir=%s %s %s" % (
+        python_binary,
+        nuitka_binary,
+        output_dir,
+        options,
+        filename
+    )
+
+    if os.system( command ) != 0:
+        sys.exit( "Error, failed to compile '%s'." % filename )
+
+    return os.path.join(
+        output_dir,
+        os.path.basename( filename )[:-3] + ".exe"
+    )
+
+def runProgram( command ):
+    return int( subprocess.check_output( command ).split()[-1] )
+
+def main():
+    if not os.path.exists( "/proc/self/smaps" ):
+        sys.exit( "Error, this needs Linux and /proc/self/smaps." )
+
+    tempdir = tempfile.mkdtemp( prefix = "nuitka-fork-" )
+
+    try:
+        filename = os.path.join( tempdir, "forking.py" )
+
+        writeFile(
+            filename,
+            program_source % {
+                "functions" : "\n".join(
+                    constant_source % { "number" : number }
+                    for number in
+                    range( constant_count )
+                ),
+                "workers"   : workers
+            }
+        )
+
+        results = [
+            (
+                "CPython",
+                runProgram( [ python_binary, filename ] )
+            ),
+            (
+                "Nuitka",
+                runProgram(
+                    [ compileProgram( filename, os.path.join( tempdir, "normal" ), "" ) ]
+                )
+            ),
+            (
+                "Nuitka immortal",
+                runProgram(
+                    [
+                        compileProgram(
+                            filename,
+                            os.path.join( tempdir, "immortal" ),
+                            "--immortal-constants"
+                        )
+                    ]
+                )
+            )
+        ]
+
+        print( "Private dirty memory per worker after fork, %d workers:" % workers )
+
+        for name, private_dirty in results:
+            print( "%-20s %8d kB" % ( name, private_dirty ) )
+    finally:
+        shutil.rmtree( tempdir )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,456 @@
+#!/usr/bin/env python
+#     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+#
+#     Python tests originally created or extracted from other peoples work. The
+#     parts were too small to be protected.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+
+""" Compare the speed of compiled benchmark programs with CPython.
+
+The benchmark programs are compiled with one or more sets of Nuitka options,
+and then run with CPython and as executables, first some runs for warmup that
+are not counted, then the measured ones. For each benchmark and option set,
+the speedup over CPython is reported, with a 95% confidence interval.
+
+The results can be written as JSON, and a previous such file can be given as
+a baseline. If the speedup of a benchmark became worse than the baseline by
+more than the threshold, even at the upper end of its confidence interval, the
+exit code is 1. Comparing speedups instead of times makes baselines from other
+machines more meaningful.
+
+The pybench tests are run by its driver, compiled with "--recurse-all", and
+measured by the totals it reports, so its calibration is not counted.
+
+Set NUITKA_BINARY to use another Nuitka, and NUITKA_EXTRA_OPTIONS to compile
+all option sets with more options.
+"""
+
+from __future__ import print_function
+
+import os, sys, subprocess, tempfile, shutil, time, json, math, re
+
+from optparse import OptionParser
+
+nuitka_binary = os.environ.get(
+    "NUITKA_BINARY",
+    os.path.join(
+        os.path.dirname( os.path.abspath( __file__ ) ),
+        "..", "..", "bin", "nuitka"
+    )
+)
+
+python_binary = os.environ.get( "PYTHON", sys.executable )
+
+benchmarks_dir = os.path.dirname( os.path.abspath( __file__ ) )
+
+# Standalone benchmark programs, relative to this directory. The pybench
+# modules are run by its driver instead, and the "startup" and "fork" ones are
+# scripts measuring other things.
+benchmark_dirs = ( ".", "micro", "comparisons" )
+
+pybench_name = os.path.join( "pybench", "pybench.py" )
+
+# Two sided 95% quantiles of the t distribution, for the degrees of freedom.
+t_quantiles = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042
+)
+
+def parseArgs():
+    parser = OptionParser(
+        usage = "%prog [options] [benchmark ...]"
+    )
+
+    parser.add_option(
+        "--config",
+        action  = "append",
+        dest    = "configs",
+        metavar = "NAME=OPTIONS",
+        default = [],
+        help    = """\
+An option set to compile with, e.g. "lto=--lto" or "clang=--clang". Can be
+given multiple times. Defaults to "default=", i.e. no extra options."""
+    )
+
+    parser.add_option(
+        "--warmup",
+        action  = "store",
+        type    = "int",
+        dest    = "warmup",
+        default = 1,
+        help    = """\
+Runs before measuring, e.g. to fill caches. Defaults to 1."""
+    )
+
+    parser.add_option(
+        "--repeat",
+        action  = "store",
+        type    = "int",
+        dest    = "repeat",
+        default = 5,
+        help    = """\
+Measured runs of each program. Defaults to 5."""
+    )
+
+    parser.add_option(
+        "--pybench-tests",
+        action  = "store",
+        dest    = "pybench_tests",
+        default = "",
+        help    = """\
+Regular expression for the names of the pybench tests to run, e.g. "Calls".
+Defaults to all of them."""
+    )
+
+    parser.add_option(
+        "--pybench-rounds",
+        action  = "store",
+        type    = "int",
+        dest    = "pybench_rounds",
+        default = 3,
+        help    = """\
+Rounds of the pybench tests in each run. Defaults to 3."""
+    )
+
+    parser.add_option(
+        "--json",
+        action  = "store",
+        dest    = "json_filename",
+        default = None,
+        help    = """\
+Write the results in JSON format to this file."""
+    )
+
+    parser.add_option(
+        "--baseline",
+        action  = "store",
+        dest    = "baseline_filename",
+        default = None,
+        help    = """\
+Results of an earlier run, written with "--json", to compare with."""
+    )
+
+    parser.add_option(
+        "--threshold",
+        action  = "store",
+        type    = "float",
+        dest    = "threshold",
+        default = 5.0,
+        help    = """\
+Percentage by which a speedup may be worse than the baseline. Defaults to 5."""
+    )
+
+    options, positional_args = parser.parse_args()
+
+    if options.repeat < 2:
+        parser.error( "Need at least 2 measured runs for a confidence interval." )
+
+    configs = []
+
+    for config in options.configs or [ "default=" ]:
+        if "=" not in config:
+            parser.error( "Option set '%s' needs to be NAME=OPTIONS." % config )
+
+        configs.append( tuple( config.split( "=", 1 ) ) )
+
+    return options, configs, positional_args
+
+def getBenchmarks( selection ):
+    result = []
+
+    for benchmark_dir in benchmark_dirs:
+        for filename in sorted( os.listdir( os.path.join( benchmarks_dir, benchmark_dir ) ) ):
+            if not filename.endswith( ".py" ) or filename.startswith( "run_" ):
+                continue
+
+            name = os.path.normpath( os.path.join( benchmark_dir, filename ) )
+
+            if selection and name not in selection and filename not in selection:
+                continue
+
+            result.append( name )
+
+    if not selection or "pybench" in selection or pybench_name in selection:
+        result.append( pybench_name )
+
+    return result
+
+def getBenchmarkArguments( name, options ):
+    if name == pybench_name:
+        result = [ "-n", str( options.pybench_rounds ) ]
+
+        if options.pybench_tests:
+            result += [ "-t", options.pybench_tests ]
+
+        return result
+    else:
+        return []
+
+def getPybenchTotal( output ):
+    """ The total of the minimum times of the tests run, in seconds. """
+
+    match = re.search( r"^Totals:\s+([\d.]+)ms", output, re.MULTILINE )
+
+    if match is None:
+        sys.exit( "Error, pybench reported no totals." )
+
+    return float( match.group( 1 ) ) / 1000
+
+def getStatistics( timings ):
+    """ Mean and half width of the 95% confidence interval of the mean. """
+
+    count = len( timings )
+    mean = sum( timings ) / count
+
+    variance = sum( ( timing - mean ) ** 2 for timing in timings ) / ( count - 1 )
+
+    t_quantile = t_quantiles[ count - 2 ] if count - 2 < len( t_quantiles ) else 1.960
+
+    return mean, t_quantile * math.sqrt( variance / count )
+
+def getSpeedup( python_stats, nuitka_stats ):
+    """ Ratio of the means, with the relative errors added in quadrature. """
+
+    python_mean, python_error = python_stats
+    nuitka_mean, nuitka_error = nuitka_stats
+
+    speedup = python_mean / nuitka_mean
+
+    relative_error = math.sqrt(
+        ( python_error / python_mean ) ** 2 + ( nuitka_error / nuitka_mean ) ** 2
+    )
+
+    return speedup, speedup * relative_error
+
+def compileBenchmark( name, config_name, config_options, tempdir ):
+    output_dir = os.path.join( tempdir, config_name, os.path.dirname( name ) )
+
+    if not os.path.exists( output_dir ):
+        os.makedirs( output_dir )
+
+    # The pybench driver imports the tests, these must be included.
+    if name == pybench_name:
+        config_options += " --recurse-all"
+
+    command = "%s %s --exe --remove-output --output-dir=%s %s %s %s" % (
+        python_binary,
+        nuitka_binary,
+        output_dir,
+        config_options,
+        os.environ.get( "NUITKA_EXTRA_OPTIONS", "" ),
+        os.path.join( benchmarks_dir, name )
+    )
+
+    start = time.time()
+    result = os.system( command )
+
+    if result != 0:
+        sys.exit( "Error, failed to compile '%s' with '%s'." % ( name, config_name ) )
+
+    return (
+        os.path.join( output_dir, os.path.basename( name )[:-3] + ".exe" ),
+        time.time() - start
+    )
+
+def measure( command, cwd, warmup, repeat, get_timing ):
+    """ Run the command, timed by the wall clock, or by its output if
+        "get_timing" is given.
+    """
+
+    timings = []
+
+    with open( os.devnull, "w" ) as devnull:
+        for count in range( warmup + repeat ):
+            start = time.time()
+
+            if get_timing is None:
+                subprocess.check_call( command, cwd = cwd, stdout = devnull )
+                timing = time.time() - start
+            else:
+                output = subprocess.check_output( command, cwd = cwd, stderr = devnull )
+                timing = get_timing( output.decode( "utf-8", "replace" ) )
+
+            if count >= warmup:
+                timings.append( timing )
+
+    return timings
+
+def getCompilerVersion():
+    compiler = os.environ.get( "CXX", "g++" )
+
+    try:
+        output = subprocess.Popen(
+            [ compiler, "--version" ],
+            stdout = subprocess.PIPE,
+            stderr = subprocess.STDOUT
+        ).communicate()[0]
+    except OSError:
+        return None
+
+    return output.decode( "utf-8", "replace" ).split( "\n" )[0]
+
+def checkBaseline( results, baseline_filename, threshold ):
+    with open( baseline_filename ) as baseline_file:
+        baseline = json.load( baseline_file )
+
+    regressions = []
+
+    for name, result in sorted( results.items() ):
+        if name not in baseline[ "benchmarks" ]:
+            continue
+
+        for config_name, config_result in sorted( result[ "configs" ].items() ):
+            baseline_result = baseline[ "benchmarks" ][ name ][ "configs" ].get( config_name )
+
+            if baseline_result is None:
+                continue
+
+            limit = baseline_result[ "speedup" ] * ( 1 - threshold / 100.0 )
+            upper = config_result[ "speedup" ] + config_result[ "speedup_error" ]
+
+            if upper < limit:
+                regressions.append(
+                    "%s with '%s': %.2fx, was %.2fx" % (
+                        name,
+                        config_name,
+                        config_result[ "speedup" ],
+                        baseline_result[ "speedup" ]
+                    )
+                )
+
+    return regressions
+
+def main():
+    options, configs, selection = parseArgs()
+
+    benchmarks = getBenchmarks( selection )
+
+    if not benchmarks:
+        sys.exit( "Error, no benchmarks selected." )
+
+    tempdir = tempfile.mkdtemp( prefix = "nuitka-benchmarks-" )
+
+    results = {}
+
+    try:
+        for name in benchmarks:
+            filename = os.path.join( benchmarks_dir, name )
+            cwd = os.path.dirname( filename )
+
+            arguments = getBenchmarkArguments( name, options )
+            get_timing = getPybenchTotal if name == pybench_name else None
+
+            print( "Benchmark", " ".join( [ name ] + arguments ), "..." )
+            sys.stdout.flush()
+
+            python_timings = measure(
+                [ python_binary, filename ] + arguments,
+                cwd,
+                options.warmup,
+                options.repeat,
+                get_timing
+            )
+            python_stats = getStatistics( python_timings )
+
+            result = {
+                "arguments"      : arguments,
+                "python_timings" : python_timings,
+                "python_mean"    : python_stats[0],
+                "python_error"   : python_stats[1],
+                "configs"        : {}
+            }
+
+            for config_name, config_options in configs:
+                binary, compile_time = compileBenchmark(
+                    name,
+                    config_name,
+                    config_options,
+                    tempdir
+                )
+
+                nuitka_timings = measure(
+                    [ binary ] + arguments,
+                    cwd,
+                    options.warmup,
+                    options.repeat,
+                    get_timing
+                )
+                nuitka_stats = getStatistics( nuitka_timings )
+                speedup, speedup_error = getSpeedup( python_stats, nuitka_stats )
+
+                result[ "configs" ][ config_name ] = {
+                    "options"       : config_options,
+                    "compile_time"  : compile_time,
+                    "timings"       : nuitka_timings,
+                    "mean"          : nuitka_stats[0],
+                    "error"         : nuitka_stats[1],
+                    "speedup"       : speedup,
+                    "speedup_error" : speedup_error
+                }
+
+            results[ name ] = result
+    finally:
+        shutil.rmtree( tempdir )
+
+    print(
+        "%-40s %-10s %12s %12s %16s" % (
+            "Benchmark", "Options", "CPython", "Nuitka", "Speedup"
+        )
+    )
+
+    for name, result in sorted( results.items() ):
+        for config_name, config_result in sorted( result[ "configs" ].items() ):
+            print(
+                "%-40s %-10s %10.3f s %10.3f s %7.2fx +- %.2f" % (
+                    name,
+                    config_name,
+                    result[ "python_mean" ],
+                    config_result[ "mean" ],
+                    config_result[ "speedup" ],
+                    config_result[ "speedup_error" ]
+                )
+            )
+
+    if options.json_filename:
+        with open( options.json_filename, "w" ) as json_file:
+            json.dump(
+                {
+                    "python"     : python_binary,
+                    "compiler"   : getCompilerVersion(),
+                    "warmup"     : options.warmup,
+                    "repeat"     : options.repeat,
+                    "benchmarks" : results
+                },
+                json_file,
+                indent    = 1,
+                sort_keys = True
+            )
+
+    if options.baseline_filename:
+        regressions = checkBaseline(
+            results,
+            options.baseline_filename,
+            options.threshold
+        )
+
+        for regression in regressions:
+            print( "Regression:", regression )
+
+        if regressions:
+            sys.exit( 1 )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+#     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+#
+#     Python tests originally created or extracted from other peoples work. The
+#     parts were too small to be protected.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+
+""" Compare the startup time of compiled programs with CPython.
+
+Two programs are created in a temporary directory, a "hello world" one, and
+one that imports a graph of many small modules. Both are compiled with all
+modules included, and then run many times, with CPython and as executables.
+The median wall clock times are reported.
+
+Usage: run_startup.py [module_count] [runs]
+
+Set NUITKA_BINARY to use another Nuitka, and NUITKA_EXTRA_OPTIONS to compile
+with more options, e.g. "--startup-trace".
+"""
+
+from __future__ import print_function
+
+import os, sys, subprocess, tempfile, shutil, time
+
+module_count = int( sys.argv[1] ) if len( sys.argv ) > 1 else 50
+runs = int( sys.argv[2] ) if len( sys.argv ) > 2 else 50
+
+nuitka_binary = os.environ.get(
+    "NUITKA_BINARY",
+    os.path.join(
+        os.path.dirname( os.path.abspath( __file__ ) ),
+        "..", "..", "..", "bin", "nuitka"
+    )
+)
+
+python_binary = os.environ.get( "PYTHON", sys.executable )
+
+hello_source = """\
+print( "Hello world" )
+"""
+
+# Each module of the graph imports the next two, and has some functions and
+# a class, so creating it is not entirely trivial.
+graph_module_source = """\
+%(imports)s
+
+def function%(number)d( a, b = 1 ):
+    return a + b
+
+def generator%(number)d( values ):
+    for value in values:
+        yield value * %(number)d
+
+class Class%(number)d:
+    value = %(number)d
+
+    def method( self, arg ):
+        return self.value + arg
+
+constants%(number)d = ( "module%(number)d", %(number)d, %(number)d.5 )
+"""
+
+graph_main_source = """\
+import module0
+
+print( "Imported", len( __import__( "sys" ).modules ), "modules" )
+"""
+
+def writeFile( filename, contents ):
+    with open( filename, "w" ) as output_file:
+        output_file.write( contents )
+
+def createPrograms( tempdir ):
+    writeFile( os.path.join( tempdir, "hello.py" ), hello_source )
+
+    graph_dir = os.path.join( tempdir, "graph" )
+    os.mkdir( graph_dir )
+
+    for number in range( module_count ):
+        imports = [
+            "import module%d" % other
+            for other in
+            ( 2 * number + 1, 2 * number + 2 )
+            if other < module_count
+        ]
+
+        writeFile(
+            os.path.join( graph_dir, "module%d.py" % number ),
+            graph_module_source % {
+                "number"  : number,
+                "imports" : "\n".join( imports )
+            }
+        )
+
+    writeFile( os.path.join( graph_dir, "graph.py" ), graph_main_source )
+
+    return [
+        ( "hello world", os.path.join( tempdir, "hello.py" ) ),
+        ( "%d modules" % module_count, os.path.join( graph_dir, "graph.py" ) )
+    ]
+
+def compileProgram( filename ):
+    command = "%s %s --exe --recurse-all --output-dir=%s %s %s" % (
+        python_binary,
+        nuitka_binary,
+        os.path.dirname( filename ),
+        os.environ.get( "NUITKA_EXTRA_OPTIONS", "" ),
+        filename
+    )
+
+    result = os.system( command )
+
+    if result != 0:
+        sys.exit( "Error, failed to compile '%s'." % filename )
+
+    return filename[:-3] + ".exe"
+
+def measure( command, cwd ):
+    timings = []
+
+    with open( os.devnull, "w" ) as devnull:
+        for _count in range( runs ):
+            start = time.time()
+            subprocess.check_call( command, cwd = cwd, stdout = devnull )
+            timings.append( time.time() - start )
+
+    timings.sort()
+
+    return timings[ len( timings ) // 2 ] * 1000
+
+def main():
+    tempdir = tempfile.mkdtemp( prefix = "nuitka-startup-" )
+
+    try:
+        results = []
+
+        for name, filename in createPrograms( tempdir ):
+            binary = compileProgram( filename )
+            cwd = os.path.dirname( filename )
+
+            results.append(
+                (
+                    name,
+                    measure( [ python_binary, filename ], cwd ),
+                    measure( [ binary ], cwd )
+                )
+            )
+
+        print( "%-20s %12s %12s %8s" % ( "Program", "CPython", "Nuitka", "Ratio" ) )
+
+        for name, python_time, nuitka_time in results:
+            print(
+                "%-20s %9.2f ms %9.2f ms %7.2fx" % (
+                    name,
+                    python_time,
+                    nuitka_time,
+                    python_time / nuitka_time
+                )
+            )
+    finally:
+        shutil.rmtree( tempdir )
+
+if __name__ == "__main__":
+    main()
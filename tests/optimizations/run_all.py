@@ -21,7 +21,6 @@
 
 from __future__ import print_function
 
-
 import os, sys, subprocess, tempfile, shutil
 
 try:
@@ -32,153 +31,134 @@ except ImportError:
 # Go its own directory, to have it easy with path knowledge.
 os.chdir( os.path.dirname( os.path.abspath( __file__ ) ) )
 
-search_mode = len( sys.argv ) > 1 and sys.argv[1] == "search"
-
-start_at = sys.argv[2] if len( sys.argv ) > 2 else None
+sys.path.insert( 0, ".." )
 
-if start_at:
-    active = False
-else:
-    active = True
+from test_common import parseArgs, getPythonVersion, runTests
 
-if "PYTHON" not in os.environ:
-    os.environ[ "PYTHON" ] = sys.executable
+options = parseArgs()
 
-def check_output(*popenargs, **kwargs):
-    from subprocess import Popen, PIPE, CalledProcessError
+python_version = getPythonVersion()
 
-    if 'stdout' in kwargs:
-        raise ValueError('stdout argument not allowed, it will be overridden.')
-    process = Popen(stdout=PIPE, *popenargs, **kwargs)
-    output, unused_err = process.communicate()
-    retcode = process.poll()
-    if retcode:
-        cmd = kwargs.get("args")
-        if cmd is None:
-            cmd = popenargs[0]
-        raise CalledProcessError(retcode, cmd, output=output)
-    return output
+os.environ[ "PYTHONPATH" ] = os.getcwd()
 
-version_output = check_output(
-    [ os.environ[ "PYTHON" ], "--version" ],
-    stderr = subprocess.STDOUT
-)
+def getKind( node ):
+    result = node.attrib[ "kind" ]
 
-python_version = version_output.split()[1]
+    result = result.replace( "Statements", "" )
+    result = result.replace( "Statement", "" )
+    result = result.replace( "Expression", "" )
 
-os.environ[ "PYTHONPATH" ] = os.getcwd()
+    return result
 
-print( "Using concrete python", python_version )
+def getRole( node, role ):
+    for child in node:
+        if child.tag == "role" and child.attrib[ "name" ] == role:
+            return child
+    else:
+        return None
 
 def checkSequence( statements ):
-    for statement in module_statements:
+    """ Check that only prints of constants remain, return error or None. """
+
+    for statement in statements:
         kind = getKind( statement )
 
         if kind == "Print":
             print_args = getRole( statement, "values" )
 
             if len( print_args ) != 1:
-                sys.exit( "Error, print with more than one argument." )
+                return "Error, print with more than one argument."
 
             print_arg = print_args[0]
 
             if getKind( print_arg ) != "ConstantRef":
-                sys.exit( "Error, print of non-constant %s." % getKind( print_arg ) )
+                return "Error, print of non-constant %s." % getKind( print_arg )
         else:
-            sys.exit( "Error, non-print statement of unknown kind '%s'." % kind )
-
-
-for filename in sorted( os.listdir( "." ) ):
-    if not filename.endswith( ".py" ) or filename.startswith( "run_" ):
-        continue
-
-    # Skip tests that require Python 2.7 at least.
-    if filename.endswith( "27.py" ) and python_version.startswith( b"2.6" ):
-        continue
-
-    path = filename
-
-    if not active and start_at in ( filename, path ):
-        active = True
-
-
-    extra_flags = [ "expect_success" ]
-
-    if active:
-        # Apply 2to3 conversion if necessary.
-        assert type( python_version ) is bytes
-
-        if python_version.startswith( b"3" ):
-            new_path = os.path.join( tempfile.gettempdir(), filename )
-            shutil.copy( path, new_path )
+            return "Error, non-print statement of unknown kind '%s'." % kind
 
-            path = new_path
-
-            # On Windows, we cannot rely on 2to3 to be in the path.
-            if os.name == "nt":
-               command = sys.executable + " " + os.path.join( os.path.dirname( sys.executable ), "Tools/Scripts/2to3.py" )
-            else:
-               command = "2to3"
-
-            result = subprocess.call(
-                command + " -w -n --no-diffs " + path,
-                stderr = open( "/dev/null", "w" ),
-                shell  = True
-            )
-
-
-        print( "Consider", path, end = " " )
+    return None
 
+def makeCheck( path ):
+    def checkFile():
         command = "%s %s --dump-xml %s" % (
             os.environ[ "PYTHON" ],
             os.path.join( "..", "..", "bin", "nuitka" ),
             path
         )
 
-        result = subprocess.check_output(
+        process = subprocess.Popen(
             command,
-            shell = True
+            stdout = subprocess.PIPE,
+            shell  = True
         )
 
-        root = lxml.etree.fromstring( result )
+        output = process.communicate()[0]
+
+        if process.returncode != 0:
+            return process.returncode, "Consider %s failed.\n" % path
+
+        root = lxml.etree.fromstring( output )
         module_body  = root[0]
         module_statements_sequence = module_body[ 0 ]
 
         assert len( module_statements_sequence ) == 1
-        module_statements = iter( module_statements_sequence ).next()
+        module_statements = next( iter( module_statements_sequence ) )
 
-        def getKind( node ):
-            result = node.attrib[ "kind" ]
+        error = checkSequence( module_statements )
 
-            result = result.replace( "Statements", "" )
-            result = result.replace( "Statement", "" )
-            result = result.replace( "Expression", "" )
+        if error is not None:
+            return 1, "Consider %s %s\n" % ( path, error )
 
-            return result
+        return 0, "Consider %s OK.\n" % path
 
-        def getRole( node, role ):
-            for child in node:
-                if child.tag == "role" and child.attrib[ "name" ] == role:
-                    return child
-            else:
-                return None
+    return checkFile
 
-        checkSequence( module_statements )
+cases = []
+converted = []
 
+for filename in sorted( os.listdir( "." ) ):
+    if not filename.endswith( ".py" ) or filename.startswith( "run_" ):
+        continue
 
-        # TODO: Detect the exception from above
-        if False and result == 2:
-            sys.stderr.write( "Interruped, with CTRL-C\n" )
-            sys.exit( 2 )
+    # Skip tests that require Python 2.7 at least.
+    if filename.endswith( "27.py" ) and python_version.startswith( b"2.6" ):
+        continue
 
+    path = filename
 
-        # TODO: Detect error case
-        if False and result != 0 and search_mode:
-            print( "Error exit!", result )
-            sys.exit( result )
+    # Apply 2to3 conversion if necessary.
+    assert type( python_version ) is bytes
 
+    if python_version.startswith( b"3" ):
+        new_path = os.path.join( tempfile.gettempdir(), filename )
+        shutil.copy( path, new_path )
 
-        print( "OK." )
+        path = new_path
 
-    else:
-        print("Skipping", filename)
+        # On Windows, we cannot rely on 2to3 to be in the path.
+        if os.name == "nt":
+           command = sys.executable + " " + os.path.join( os.path.dirname( sys.executable ), "Tools/Scripts/2to3.py" )
+        else:
+           command = "2to3"
+
+        result = subprocess.call(
+            command + " -w -n --no-diffs " + path,
+            stderr = open( os.devnull, "w" ),
+            shell  = True
+        )
+
+        converted.append( new_path )
+
+    cases.append(
+        {
+            "name"     : filename,
+            "function" : makeCheck( path ),
+            "sources"  : [ filename ]
+        }
+    )
+
+try:
+    runTests( "optimizations", cases, options )
+finally:
+    for new_path in converted:
+        os.unlink( new_path )
@@ -19,111 +19,78 @@
 
 from __future__ import print_function
 
-import os, sys, subprocess, tempfile, shutil
+import os, sys
 
 # Go its own directory, to have it easy with path knowledge.
 os.chdir( os.path.dirname( os.path.abspath( __file__ ) ) )
 
-search_mode = len( sys.argv ) > 1 and sys.argv[1] == "search"
+sys.path.insert( 0, ".." )
 
-start_at = sys.argv[2] if len( sys.argv ) > 2 else None
+from test_common import parseArgs, getPythonVersion, runTests
 
-if start_at:
-    active = False
-else:
-    active = True
+options = parseArgs()
 
-if "PYTHON" not in os.environ:
-    os.environ[ "PYTHON" ] = sys.executable
-
-def check_output(*popenargs, **kwargs):
-    from subprocess import Popen, PIPE, CalledProcessError
-
-    if 'stdout' in kwargs:
-        raise ValueError('stdout argument not allowed, it will be overridden.')
-    process = Popen(stdout=PIPE, *popenargs, **kwargs)
-    output, unused_err = process.communicate()
-    retcode = process.poll()
-    if retcode:
-        cmd = kwargs.get("args")
-        if cmd is None:
-            cmd = popenargs[0]
-        raise CalledProcessError(retcode, cmd, output=output)
-    return output
-
-version_output = check_output(
-    [ os.environ[ "PYTHON" ], "--version" ],
-    stderr = subprocess.STDOUT
-)
-
-python_version = version_output.split()[1]
+python_version = getPythonVersion()
 
 os.environ[ "PYTHONPATH" ] = os.getcwd()
 
-print( "Using concrete python", python_version )
+cases = []
 
 for filename in sorted( os.listdir( "." ) ):
     if not os.path.isdir( filename ) or filename.endswith( ".build" ):
         continue
 
-    path = os.path.relpath( filename )
-
-    if not active and start_at in ( filename, path ):
-        active = True
-
-    if active:
-        expected_errors = [
-            "module_exits", "main_raises", "main_raises2"
-        ]
+    expected_errors = [
+        "module_exits", "main_raises", "main_raises2"
+    ]
 
-        # Allowed after Python3, packages need no more "__init__.py"
+    # Allowed after Python3, packages need no more "__init__.py"
 
-        if python_version < "3.3":
-            expected_errors.append( "package_missing_init" )
+    if python_version < "3.3":
+        expected_errors.append( "package_missing_init" )
 
-        if filename not in expected_errors:
-            extra_flags = [ "expect_success" ]
-        else:
-            extra_flags = [ "expect_failure" ]
+    if filename not in expected_errors:
+        extra_flags = [ "expect_success" ]
+    else:
+        extra_flags = [ "expect_failure" ]
 
-        if filename in ( "package_missing_init", "dash_import", "reimport_main" ):
-            extra_flags.append( "ignore_stderr" )
+    if filename in ( "package_missing_init", "dash_import", "reimport_main" ):
+        extra_flags.append( "ignore_stderr" )
 
-        extra_flags.append( "remove_output" )
+    extra_flags.append( "remove_output" )
 
-        if filename == "plugin_import":
-            os.environ[ "NUITKA_EXTRA_OPTIONS" ] = "--recurse-all --recurse-directory=%s/some_package" % filename
-        else:
-            os.environ[ "NUITKA_EXTRA_OPTIONS" ] = "--recurse-all"
+    if filename == "plugin_import":
+        extra_options = "--recurse-all --recurse-directory=%s/some_package" % filename
+    else:
+        extra_options = "--recurse-all"
 
-        print( "Consider output of recursively compiled program:", path )
-        sys.stdout.flush()
+    # Several programs have the same name for the main file, so they must not
+    # share the output directory when run in parallel.
+    extra_options += " --output-dir=%s" % filename
 
-        for filename_main in os.listdir( filename ):
-            if filename_main.endswith( "Main.py" ):
-                break
+    for filename_main in os.listdir( filename ):
+        if filename_main.endswith( "Main.py" ):
+            break
 
-            if filename_main.endswith( "Main" ):
-                break
-        else:
-            sys.exit( "Error, no file ends with 'Main.py' or 'Main' in %s, incomplete test case" % filename )
+        if filename_main.endswith( "Main" ):
+            break
+    else:
+        sys.exit( "Error, no file ends with 'Main.py' or 'Main' in %s, incomplete test case" % filename )
 
-        result = subprocess.call(
-            "%s %s %s silent %s" % (
+    cases.append(
+        {
+            "name"    : filename,
+            "command" : "%s %s %s silent %s" % (
                 sys.executable,
                 os.path.join( "..", "..", "bin", "compare_with_cpython" ),
                 os.path.join( filename, filename_main ),
                 " ".join( extra_flags )
             ),
-            shell = True
-        )
-
-        if result == 2:
-            sys.stderr.write( "Interruped, with CTRL-C\n" )
-            sys.exit( 2 )
-
-        if result != 0 and search_mode:
-            print( "Error exit!", result )
-            sys.exit( result )
-    else:
-        print( "Skipping", filename )
+            "sources" : [ filename ],
+            "env"     : {
+                "NUITKA_EXTRA_OPTIONS" : extra_options
+            }
+        }
+    )
+
+runTests( "programs", cases, options )
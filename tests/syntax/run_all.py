@@ -19,48 +19,22 @@
 
 from __future__ import print_function
 
-import os, sys, subprocess, tempfile, shutil
+import os, sys
 
 # Go its own directory, to have it easy with path knowledge.
 os.chdir( os.path.dirname( os.path.abspath( __file__ ) ) )
 
-search_mode = len( sys.argv ) > 1 and sys.argv[1] == "search"
+sys.path.insert( 0, ".." )
 
-start_at = sys.argv[2] if len( sys.argv ) > 2 else None
+from test_common import parseArgs, getPythonVersion, runTests
 
-if start_at:
-    active = False
-else:
-    active = True
+options = parseArgs()
 
-if "PYTHON" not in os.environ:
-    os.environ[ "PYTHON" ] = sys.executable
-
-def check_output(*popenargs, **kwargs):
-    from subprocess import Popen, PIPE, CalledProcessError
-
-    if 'stdout' in kwargs:
-        raise ValueError('stdout argument not allowed, it will be overridden.')
-    process = Popen(stdout=PIPE, *popenargs, **kwargs)
-    output, unused_err = process.communicate()
-    retcode = process.poll()
-    if retcode:
-        cmd = kwargs.get("args")
-        if cmd is None:
-            cmd = popenargs[0]
-        raise CalledProcessError(retcode, cmd, output=output)
-    return output
-
-version_output = check_output(
-    [ os.environ[ "PYTHON" ], "--version" ],
-    stderr = subprocess.STDOUT
-)
-
-python_version = version_output.split()[1]
+python_version = getPythonVersion()
 
 os.environ[ "PYTHONPATH" ] = os.getcwd()
 
-print( "Using concrete python", python_version )
+cases = []
 
 for filename in sorted( os.listdir( "." ) ):
     if not filename.endswith( ".py" ) or filename == "run_all.py":
@@ -68,32 +42,23 @@ for filename in sorted( os.listdir( "." ) ):
 
     path = filename
 
-    if not active and start_at in ( filename, path ):
-        active = True
-
     # Some syntax errors are for Python3 only.
     if filename == "Importing2.py" and python_version < "3":
         extra_flags = [ "remove_output" ]
     else:
         extra_flags = [ "expect_failure",  "remove_output" ]
 
-    if active:
-        result = subprocess.call(
-            "%s %s %s silent %s" % (
+    cases.append(
+        {
+            "name"    : filename,
+            "command" : "%s %s %s silent %s" % (
                 sys.executable,
                 os.path.join( "..", "..", "bin", "compare_with_cpython" ),
                 path,
                 " ".join( extra_flags )
             ),
-            shell = True
-        )
-
-        if result == 2:
-            sys.stderr.write( "Interruped, with CTRL-C\n" )
-            sys.exit( 2 )
+            "sources" : [ filename ]
+        }
+    )
 
-        if result != 0 and search_mode:
-            print( "Error exit!", result )
-            sys.exit( result )
-    else:
-        print( "Skipping", filename )
+runTests( "syntax", cases, options )
@@ -0,0 +1,373 @@
+#     Copyright 2013, Kay Hayen, mailto:kay.hayen@gmail.com
+#
+#     Python tests originally created or extracted from other peoples work. The
+#     parts were too small to be protected.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+#
+""" Common parts of the "run_all.py" scripts of the test suites.
+
+The suites make a list of test cases, and this runs them in parallel, each one
+with its output captured and printed once it is complete, so the outputs of
+tests do not mix. Test cases that passed before, with the same test sources,
+Nuitka sources, options, and Python, are not run again, unless no cache is
+asked for. A summary in JSON format can be written for tools to read.
+
+A test case is a dictionary with these keys:
+
+    "name"      - the name to report, and for "start_at" to match
+    "command"   - the command to run, as a string for the shell, or
+    "function"  - a function to call instead, returning exit code and output
+    "sources"   - files or directories the result depends on
+    "env"       - optional, environment variables to set for it
+    "skip"      - optional, the reason to not run it
+"""
+
+from __future__ import print_function
+
+import os, sys, subprocess, tempfile, hashlib, json, time
+
+from optparse import OptionParser
+
+def check_output( *popenargs, **kwargs ):
+    from subprocess import Popen, PIPE, CalledProcessError
+
+    if "stdout" in kwargs:
+        raise ValueError( "stdout argument not allowed, it will be overridden." )
+
+    process = Popen( stdout = PIPE, *popenargs, **kwargs )
+    output, _unused_err = process.communicate()
+    retcode = process.poll()
+
+    if retcode:
+        cmd = kwargs.get( "args" )
+
+        if cmd is None:
+            cmd = popenargs[0]
+
+        raise CalledProcessError( retcode, cmd, output = output )
+
+    return output
+
+def getPythonVersion():
+    """ The version of the Python to compare with, as given by its binary. """
+
+    if "PYTHON" not in os.environ:
+        os.environ[ "PYTHON" ] = sys.executable
+
+    version_output = check_output(
+        [ os.environ[ "PYTHON" ], "--version" ],
+        stderr = subprocess.STDOUT
+    )
+
+    return version_output.split()[1]
+
+def parseArgs():
+    """ Options of the "run_all.py" scripts.
+
+        The old positional arguments "search" and the name of the test to
+        start at still work.
+    """
+
+    parser = OptionParser(
+        usage = "%prog [options] [search [start_at]]"
+    )
+
+    parser.add_option(
+        "-j", "--jobs",
+        action  = "store",
+        type    = "int",
+        dest    = "jobs",
+        metavar = "N",
+        default = _getCoreCount(),
+        help    = """\
+Number of tests to run at the same time. Defaults to the CPU count."""
+    )
+
+    parser.add_option(
+        "--no-cache",
+        action  = "store_false",
+        dest    = "use_cache",
+        default = True,
+        help    = """\
+Run all tests, also the ones that passed before with the same sources."""
+    )
+
+    parser.add_option(
+        "--cache-file",
+        action  = "store",
+        dest    = "cache_file",
+        default = None,
+        help    = """\
+File to remember passed tests in. Defaults to one per suite in the temporary
+directory."""
+    )
+
+    parser.add_option(
+        "--json",
+        action  = "store",
+        dest    = "json_filename",
+        default = None,
+        help    = """\
+Write a summary of the results in JSON format to this file."""
+    )
+
+    options, positional_args = parser.parse_args()
+
+    options.search_mode = len( positional_args ) > 0 and positional_args[0] == "search"
+    options.start_at = positional_args[1] if len( positional_args ) > 1 else None
+
+    return options
+
+def _getCoreCount():
+    try:
+        import multiprocessing
+
+        return multiprocessing.cpu_count()
+    except ( ImportError, NotImplementedError ):
+        return 1
+
+def _updateHashFromPath( key, path ):
+    if os.path.isdir( path ):
+        for dirpath, dirnames, filenames in os.walk( path ):
+            dirnames[:] = sorted(
+                dirname
+                for dirname in dirnames
+                if not dirname.endswith( ".build" ) and dirname != "__pycache__"
+            )
+
+            for filename in sorted( filenames ):
+                if filename.endswith( ( ".pyc", ".pyo", ".exe", ".so" ) ):
+                    continue
+
+                filename = os.path.join( dirpath, filename )
+
+                key.update( os.path.relpath( filename, path ).encode( "utf-8" ) )
+                _updateHashFromPath( key, filename )
+    elif os.path.exists( path ):
+        with open( path, "rb" ) as source_file:
+            key.update( source_file.read() )
+
+_nuitka_hash = None
+
+def getNuitkaHash():
+    """ Hash of the Nuitka sources, so changes not yet committed count too. """
+
+    global _nuitka_hash # singleton, pylint: disable=W0603
+
+    if _nuitka_hash is None:
+        key = hashlib.md5()
+
+        base_dir = os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), ".." )
+
+        for name in ( "nuitka", "bin" ):
+            _updateHashFromPath( key, os.path.join( base_dir, name ) )
+
+        _nuitka_hash = key.hexdigest()
+
+    return _nuitka_hash
+
+def _getCacheKey( case, python_version ):
+    key = hashlib.md5()
+
+    key.update( getNuitkaHash().encode( "utf-8" ) )
+    key.update( repr( python_version ).encode( "utf-8" ) )
+    key.update( repr( case.get( "command" ) ).encode( "utf-8" ) )
+
+    env = dict( os.environ )
+    env.update( case.get( "env", {} ) )
+
+    for name in ( "PYTHON", "NUITKA", "NUITKA_EXTRA_OPTIONS", "CXX", "CCFLAGS" ):
+        key.update( repr( env.get( name ) ).encode( "utf-8" ) )
+
+    for source in case[ "sources" ]:
+        key.update( source.encode( "utf-8" ) )
+        _updateHashFromPath( key, source )
+
+    return key.hexdigest()
+
+def _loadCache( cache_filename ):
+    try:
+        with open( cache_filename ) as cache_file:
+            return json.load( cache_file )
+    except ( IOError, OSError, ValueError ):
+        return {}
+
+def _saveCache( cache_filename, cache ):
+    with open( cache_filename, "w" ) as cache_file:
+        json.dump( cache, cache_file, indent = 1, sort_keys = True )
+
+def _runCase( case ):
+    start = time.time()
+
+    if "function" in case:
+        result, output = case[ "function" ]()
+    else:
+        env = dict( os.environ )
+        env.update( case.get( "env", {} ) )
+
+        process = subprocess.Popen(
+            case[ "command" ],
+            stdout = subprocess.PIPE,
+            stderr = subprocess.STDOUT,
+            shell  = True,
+            env    = env
+        )
+
+        output = process.communicate()[0]
+        result = process.returncode
+
+        if type( output ) is not str:
+            output = output.decode( "utf-8", "replace" )
+
+    return result, output, time.time() - start
+
+def runTests( suite, cases, options ):
+    """ Run the test cases, and report the results. Exits on failure. """
+
+    # Many details to report, pylint: disable=R0912,R0914,R0915
+
+    python_version = getPythonVersion()
+
+    print( "Using concrete python", python_version, "with", options.jobs, "jobs" )
+    sys.stdout.flush()
+
+    cache_filename = options.cache_file or os.path.join(
+        tempfile.gettempdir(),
+        "nuitka-test-cache-%s.json" % suite
+    )
+
+    cache = _loadCache( cache_filename )
+
+    results = []
+    pending = []
+
+    active = options.start_at is None
+
+    for case in cases:
+        if not active and options.start_at == case[ "name" ]:
+            active = True
+
+        if not active:
+            print( "Skipping", case[ "name" ] )
+            results.append( { "name" : case[ "name" ], "status" : "skipped" } )
+        elif case.get( "skip" ):
+            print( case[ "skip" ] )
+            results.append( { "name" : case[ "name" ], "status" : "skipped" } )
+        else:
+            case[ "key" ] = _getCacheKey( case, python_version )
+
+            if options.use_cache and cache.get( case[ "name" ] ) == case[ "key" ]:
+                print( "Cached pass of", case[ "name" ] )
+                results.append( { "name" : case[ "name" ], "status" : "cached" } )
+            else:
+                pending.append( case )
+
+    sys.stdout.flush()
+
+    from multiprocessing.pool import ThreadPool
+
+    pool = ThreadPool( max( 1, options.jobs ) )
+
+    start = time.time()
+    interrupted = False
+    failed = False
+
+    try:
+        # One at a time, so they are started in the order given, and the
+        # results come in as they complete.
+        running = pool.imap_unordered(
+            lambda case : ( case, _runCase( case ) ),
+            pending,
+            1
+        )
+
+        for case, ( result, output, duration ) in running:
+            sys.stdout.write( output )
+            print( "%s took %.1fs" % ( case[ "name" ], duration ) )
+            sys.stdout.flush()
+
+            entry = {
+                "name"      : case[ "name" ],
+                "status"    : "passed" if result == 0 else "failed",
+                "duration"  : round( duration, 3 ),
+                "exit_code" : result
+            }
+
+            if result == 0:
+                cache[ case[ "name" ] ] = case[ "key" ]
+            else:
+                cache.pop( case[ "name" ], None )
+                entry[ "output" ] = output
+                failed = True
+
+            results.append( entry )
+
+            if result == 2:
+                sys.stderr.write( "Interruped, with CTRL-C\n" )
+                interrupted = True
+                break
+
+            if result != 0 and options.search_mode:
+                print( "Error exit!", result )
+                break
+    except KeyboardInterrupt:
+        sys.stderr.write( "Interruped, with CTRL-C\n" )
+        interrupted = True
+
+    pool.terminate()
+
+    _saveCache( cache_filename, cache )
+
+    counts = {}
+
+    for entry in results:
+        counts[ entry[ "status" ] ] = counts.get( entry[ "status" ], 0 ) + 1
+
+    wall_clock = time.time() - start
+
+    print(
+        "Suite %s: %s, in %.1fs." % (
+            suite,
+            ", ".join(
+                "%d %s" % ( count, status )
+                for status, count in
+                sorted( counts.items() )
+            ) or "nothing to do",
+            wall_clock
+        )
+    )
+
+    if options.json_filename:
+        with open( options.json_filename, "w" ) as json_file:
+            json.dump(
+                {
+                    "suite"          : suite,
+                    "python_version" : python_version.decode( "ascii" )
+                                         if type( python_version ) is bytes
+                                       else python_version,
+                    "nuitka_hash"    : getNuitkaHash(),
+                    "jobs"           : options.jobs,
+                    "wall_clock"     : round( wall_clock, 3 ),
+                    "counts"         : counts,
+                    "tests"          : results
+                },
+                json_file,
+                indent = 1
+            )
+
+    if interrupted:
+        sys.exit( 2 )
+
+    if failed:
+        sys.exit( 1 )